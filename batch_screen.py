@@ -0,0 +1,212 @@
+# Headless batch screening: runs a directory of resume PDFs through the
+# same extraction and Gemini parsing pipeline as the app and writes one
+# JSON line per resume.
+#
+#   python batch_screen.py resumes/ -o parsed.jsonl
+#   python batch_screen.py resumes/ -o parsed.jsonl --matches matches.jsonl
+#   GEMINI_BACKEND=fake python batch_screen.py resumes/ --recursive
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+from gemini_client import get_gemini_client
+from job_store import get_job_store
+from match_matrix import DEFAULT_TOP_K, match_resumes_to_jobs
+from pdf_extract import PDF_EXTRACT_WORKERS, extract_text_from_pdf, get_pdf_executor
+from resume_cache import get_resume_cache, resume_cache_key
+from resume_parser import CACHE_PARSER, RESUME_SCHEMA, parse_resume_with_gemini
+from resume_text_prep import prepare_resume_text
+
+DEFAULT_RETRIES = 2
+# Seconds before the first retry of a failed parse, doubled on each retry
+RETRY_BACKOFF_SECONDS = 2.0
+
+
+# Function to read and extract one resume; runs in a worker process.
+# Returns (pdf_bytes, text, seconds).
+def _extract(path):
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    # The batch already spreads files over the pool, don't split pages too
+    text = extract_text_from_pdf(pdf_bytes, parallel=False)
+    return pdf_bytes, text, time.perf_counter() - started
+
+
+# Function to parse one resume's text, asking again with backoff while
+# Gemini fails. Returns (parsed_data or None, errors, attempts).
+def _parse(text, retries):
+    errors = []
+    prepared = prepare_resume_text(text)
+    for attempt in range(1, retries + 2):
+        parsed_data = parse_resume_with_gemini(prepared.text, on_error=errors.append)
+        # Failed parses come back as None
+        if parsed_data is not None:
+            return parsed_data, errors, attempt
+        if attempt <= retries:
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+    return None, errors, retries + 1
+
+
+def find_pdfs(directory, recursive=False):
+    pattern = os.path.join(directory, "**", "*.pdf") if recursive else os.path.join(directory, "*.pdf")
+    return sorted(path for path in glob.glob(pattern, recursive=recursive) if os.path.isfile(path))
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Runs extraction in a process pool and parsing on a thread pool sized to
+# the Gemini in-flight limit, so parses start as soon as each file is read.
+class BatchScreener:
+    def __init__(self, parse_workers=None, retries=DEFAULT_RETRIES, cache=None, extract_executor=None):
+        self.parse_workers = parse_workers or get_gemini_client().max_in_flight
+        self.retries = retries
+        self.cache = cache
+        self.extract_executor = extract_executor
+        self.timings = {"extract": [], "parse": []}
+        self.counts = {"ok": 0, "cached": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def _record(self, stage, seconds):
+        with self._lock:
+            self.timings[stage].append(seconds)
+
+    def _parse_one(self, path, pdf_bytes, text):
+        key = resume_cache_key(pdf_bytes, RESUME_SCHEMA, CACHE_PARSER)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            return {"file": path, "status": "ok", "cached": True, "parsed_data": cached["parsed_data"],
+                    "errors": [], "attempts": 0}
+        started = time.perf_counter()
+        parsed_data, errors, attempts = _parse(text, self.retries)
+        self._record("parse", time.perf_counter() - started)
+        if parsed_data is None:
+            return {"file": path, "status": "failed", "cached": False, "parsed_data": None,
+                    "errors": errors, "attempts": attempts}
+        if self.cache is not None:
+            self.cache.put(key, {"parsed_data": parsed_data})
+        return {"file": path, "status": "ok", "cached": False, "parsed_data": parsed_data,
+                "errors": errors, "attempts": attempts}
+
+    # Yields one result dict per file, in completion order
+    def run(self, paths):
+        extract_executor = self.extract_executor or get_pdf_executor()
+        with ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="batch-parse") as parse_executor:
+            pending = {extract_executor.submit(_extract, path): ("extract", path) for path in paths}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.counts["failed"] += 1
+                        yield {"file": path, "status": "failed", "cached": False, "parsed_data": None,
+                               "errors": [f"Error processing resume: {str(e)}"], "attempts": 0}
+                        continue
+                    if stage == "extract":
+                        pdf_bytes, text, seconds = result
+                        self._record("extract", seconds)
+                        pending[parse_executor.submit(self._parse_one, path, pdf_bytes, text)] = ("parse", path)
+                    else:
+                        if result["status"] == "failed":
+                            self.counts["failed"] += 1
+                        else:
+                            self.counts["ok"] += 1
+                            self.counts["cached"] += result["cached"]
+                        yield result
+
+    def summary(self, wall_seconds):
+        done = self.counts["ok"] + self.counts["failed"]
+        lines = [
+            f"{done} resumes in {wall_seconds:.1f}s ({done / max(wall_seconds, 1e-9) * 60:.1f}/min): "
+            f"{self.counts['ok']} parsed ({self.counts['cached']} from cache), {self.counts['failed']} failed",
+        ]
+        for stage, values in self.timings.items():
+            if values:
+                lines.append(
+                    f"  {stage:<8} n={len(values):<5} total={sum(values):.2f}s mean={sum(values) / len(values):.3f}s "
+                    f"p50={_percentile(values, 0.5):.3f}s p95={_percentile(values, 0.95):.3f}s max={max(values):.3f}s")
+        return "\n".join(lines)
+
+
+# Function to match parsed resumes against every stored job posting and
+# write each resume's best jobs as JSON lines
+def write_matches(results, path, k=DEFAULT_TOP_K):
+    job_store = get_job_store()
+    if job_store is None:
+        print("Job store is disabled (JOB_STORE_PATH is empty), no matches written", file=sys.stderr)
+        return
+    jobs = job_store.get_jobs(job_store.job_ids())
+    started = time.perf_counter()
+    matches = match_resumes_to_jobs([result["parsed_data"] for result in results], jobs, k)
+    with open(path, "w", encoding="utf-8") as f:
+        for row, result in enumerate(results):
+            top_jobs = [
+                {"job_id": jobs[job]["job_id"], "job_title": jobs[job].get("job_title"),
+                 "employer_name": jobs[job].get("employer_name"), "match_percentage": int(score)}
+                for job, score in zip(matches.top_jobs[row], matches.top_job_scores[row]) if score > 0
+            ]
+            f.write(json.dumps({"file": result["file"], "top_jobs": top_jobs}) + "\n")
+    print(f"Matched {len(results)} resumes against {len(jobs)} stored jobs in "
+          f"{time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a directory of resume PDFs into JSONL.")
+    parser.add_argument("directory", help="directory containing resume PDFs")
+    parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("--recursive", action="store_true", help="include PDFs in subdirectories")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="concurrent Gemini parses (default: GEMINI_MAX_IN_FLIGHT)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="retries per failed parse")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the resume parse cache")
+    parser.add_argument("--matches", help="also write the best stored job postings for each resume to this JSONL file")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="jobs per resume in --matches")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    paths = find_pdfs(args.directory, args.recursive)
+    if not paths:
+        print(f"No PDFs found in {args.directory}", file=sys.stderr)
+        return 1
+
+    screener = BatchScreener(
+        parse_workers=args.parse_workers,
+        retries=args.retries,
+        cache=None if args.no_cache else get_resume_cache(),
+    )
+    print(f"Screening {len(paths)} resumes ({PDF_EXTRACT_WORKERS} extract processes, "
+          f"{screener.parse_workers} parse workers)", file=sys.stderr)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    parsed = []
+    try:
+        for result in screener.run(paths):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            if result["status"] == "ok":
+                parsed.append(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(screener.summary(time.perf_counter() - started), file=sys.stderr)
+    if args.matches:
+        write_matches(parsed, args.matches, args.top_k)
+    return 0 if not screener.counts["failed"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
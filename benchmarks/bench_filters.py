@@ -0,0 +1,123 @@
+# Benchmark: sidebar filtering with JobColumns vs the original per-job loop.
+#
+#   python benchmarks/bench_filters.py --jobs 5000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_filters import FilterState, IncrementalFilter, JobColumns
+
+EMPLOYMENT_TYPES = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN", None]
+COMPANY_TYPES = ["Public", "Private", "Nonprofit", "Government", "Startup", "Other", None]
+
+
+def make_jobs(count, rng, now):
+    jobs = []
+    for i in range(count):
+        job = {
+            "job_id": str(i),
+            "job_is_remote": rng.random() < 0.3,
+            "job_employment_type": rng.choice(EMPLOYMENT_TYPES),
+            "employer_company_type": rng.choice(COMPANY_TYPES),
+            "job_posted_at_timestamp": now - rng.randint(0, 60 * 24 * 60 * 60),
+        }
+        if rng.random() < 0.6:
+            low = rng.randint(20, 200) * 1000
+            job["job_min_salary"] = low
+            job["job_max_salary"] = low + rng.randint(0, 2000) * 1000
+        jobs.append(job)
+    return jobs
+
+
+# The per-job filter loop from the apps before JobColumns
+def legacy_apply_filters(jobs, filters, now):
+    filtered_jobs = []
+    for job in jobs:
+        if filters.remote_only and not job.get('job_is_remote', False):
+            continue
+        if filters.employment_types and job.get('job_employment_type') not in filters.employment_types:
+            continue
+        if filters.date_posted_days > 0:
+            days_ago = (now - job.get('job_posted_at_timestamp', 0)) / (60 * 60 * 24)
+            if days_ago > filters.date_posted_days:
+                continue
+        if job.get('job_min_salary') is not None and job.get('job_min_salary') < filters.min_salary:
+            continue
+        if job.get('job_max_salary') is not None and job.get('job_max_salary') > filters.max_salary:
+            continue
+        if filters.company_types and job.get('employer_company_type') not in filters.company_types:
+            continue
+        filtered_jobs.append(job)
+    return filtered_jobs
+
+
+def random_filters(rng):
+    return FilterState(
+        remote_only=rng.random() < 0.5,
+        employment_types=tuple(rng.sample(EMPLOYMENT_TYPES[:-1], rng.randint(0, 3))),
+        date_posted_days=rng.choice([0, 1, 7, 30]),
+        min_salary=rng.choice([0, 50000, 100000]),
+        max_salary=rng.choice([1000000, 300000]),
+        company_types=tuple(rng.sample(COMPANY_TYPES[:-1], rng.randint(0, 3))),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=50, help="filter combinations to time")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = int(time.time())
+    jobs = make_jobs(args.jobs, rng, now)
+    filter_sets = [random_filters(rng) for _ in range(args.rounds)]
+
+    start = time.perf_counter()
+    columns = JobColumns(jobs)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [legacy_apply_filters(jobs, filters, now) for filters in filter_sets]
+    legacy = (time.perf_counter() - start) / args.rounds
+
+    start = time.perf_counter()
+    masks = [columns.mask(filters, now) for filters in filter_sets]
+    vectorized = (time.perf_counter() - start) / args.rounds
+
+    start = time.perf_counter()
+    actual = [columns.select(mask) for mask in masks]
+    select = (time.perf_counter() - start) / args.rounds
+
+    assert actual == expected, "JobColumns disagrees with the per-job loop"
+
+    # Sidebar interaction: each step nudges a single control
+    steps = [filter_sets[0]]
+    for filters in filter_sets[1:]:
+        field = rng.choice(FilterState._fields)
+        steps.append(steps[-1]._replace(**{field: getattr(filters, field)}))
+    incremental = IncrementalFilter(columns)
+    start = time.perf_counter()
+    incremental_results = [incremental.apply(filters, now) for filters in steps]
+    incremental_time = (time.perf_counter() - start) / len(steps)
+    start = time.perf_counter()
+    full_results = [columns.apply(filters, now) for filters in steps]
+    full_time = (time.perf_counter() - start) / len(steps)
+    assert incremental_results == full_results, "IncrementalFilter disagrees with JobColumns"
+
+    print(f"jobs={args.jobs} filter combinations={args.rounds} (results identical)")
+    print(f"column build:     {build * 1000:8.3f} ms (once per result set)")
+    print(f"per-job loop:     {legacy * 1000:8.3f} ms per filter change")
+    print(f"vectorized mask:  {vectorized * 1000:8.3f} ms per filter change")
+    print(f"select jobs:      {select * 1000:8.3f} ms per filter change")
+    print(f"one-control changes, full mask + select:   {full_time * 1000:8.3f} ms")
+    print(f"one-control changes, IncrementalFilter:    {incremental_time * 1000:8.3f} ms  {incremental.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Benchmark: local heuristic resume parser latency and field agreement
+# against reference parses in benchmarks/fixtures/resumes (NAME.txt with
+# its parse in NAME.json). The bundled references are hand-labelled in
+# Gemini's output shape; --record replaces them with live Gemini parses.
+#
+#   python benchmarks/bench_local_parser.py --repeat 200
+#   python benchmarks/bench_local_parser.py --record
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from local_resume_parser import MIN_CONFIDENCE, parse_resume_locally
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "resumes")
+
+
+def norm(value):
+    return re.sub(r"[\s\-–—]+", " ", str(value if value is not None else "")).strip().lower()
+
+
+def overlap(expected, actual):
+    expected, actual = {norm(item) for item in expected}, {norm(item) for item in actual}
+    if not expected and not actual:
+        return 1.0
+    return len(expected & actual) / len(expected | actual)
+
+
+# Function to score how well a parse agrees with the reference, per field
+def agreement(expected, actual):
+    scores = {}
+    for key in ("name", "email", "phone", "location"):
+        scores[key] = float(norm(expected["basic_info"].get(key)) == norm(actual["basic_info"].get(key)))
+    for key in ("skills", "technical_skills", "soft_skills", "certifications"):
+        scores[key] = overlap(expected.get(key) or [], actual.get(key) or [])
+    scores["experience"] = overlap(
+        [f"{e.get('job_title')}|{e.get('company')}" for e in expected.get("experience") or []],
+        [f"{e.get('job_title')}|{e.get('company')}" for e in actual.get("experience") or []])
+    scores["education"] = overlap(
+        [e.get("degree") for e in expected.get("education") or []],
+        [e.get("degree") for e in actual.get("education") or []])
+    expected_years, actual_years = expected.get("years_of_experience"), actual.get("years_of_experience")
+    scores["years_of_experience"] = float(
+        expected_years == actual_years
+        or (expected_years is not None and actual_years is not None and abs(expected_years - actual_years) <= 1))
+    return scores
+
+
+def record(paths):
+    from dotenv import load_dotenv
+
+    from resume_parser import parse_resume_with_gemini
+
+    load_dotenv()
+    for path in paths:
+        parsed = parse_resume_with_gemini(open(path).read(), on_error=print)
+        if parsed is None:
+            continue
+        with open(path[:-4] + ".json", "w") as f:
+            json.dump(parsed, f, indent=2)
+        print(f"recorded {os.path.basename(path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--record", action="store_true", help="re-record reference parses with Gemini")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, "*.txt")))
+    if args.record:
+        record(paths)
+        return
+
+    totals = {}
+    print(f"{'resume':<20} {'confidence':>10} {'fast path':>9} {'parse ms':>9} {'agreement':>9}")
+    for path in paths:
+        text = open(path).read()
+        expected = json.load(open(path[:-4] + ".json"))
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            parsed, confidence = parse_resume_locally(text)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        scores = agreement(expected, parsed)
+        for key, score in scores.items():
+            totals.setdefault(key, []).append(score)
+        name = os.path.basename(path)[:-4]
+        print(f"{name:<20} {confidence:>10.2f} {'yes' if confidence >= MIN_CONFIDENCE else 'no':>9} "
+              f"{elapsed * 1000:>9.3f} {sum(scores.values()) / len(scores):>9.2f}")
+
+    print("\nper-field agreement with the reference parses:")
+    for key, scores in totals.items():
+        print(f"  {key:<20} {sum(scores) / len(scores):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmark: scoring many resumes against many job postings with the
+# match matrix engine, checked against SkillMatcher.score on a sample.
+#
+#   python benchmarks/bench_match_matrix.py --resumes 1000 --jobs 50000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_skill_matcher import SKILLS, make_descriptions
+from match_matrix import build_vocabulary, job_skill_rows, match_matrix, resume_skill_rows, sparse
+from skill_matcher import SkillMatcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=150, help="filler words per description")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--check", type=int, default=20, help="resumes checked against SkillMatcher")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resume_skills = [rng.sample(SKILLS, rng.randint(5, 25)) for _ in range(args.resumes)]
+    jobs = [{"job_description": desc} for desc in make_descriptions(args.jobs, args.words, rng)]
+
+    start = time.perf_counter()
+    vocabulary = build_vocabulary(resume_skills)
+    resume_rows = resume_skill_rows(resume_skills, vocabulary)
+    job_rows = job_skill_rows(jobs, vocabulary)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = match_matrix(resume_rows, job_rows, k=args.top_k)
+    match_time = time.perf_counter() - start
+
+    # Every reported score must equal SkillMatcher's, and no job left out
+    # of a resume's top k may score higher than its k-th job
+    mismatches = 0
+    for i in rng.sample(range(args.resumes), min(args.check, args.resumes)):
+        matcher = SkillMatcher(resume_skills[i])
+        expected = [matcher.score(job["job_description"])[0] for job in jobs]
+        for job, score in zip(result.top_jobs[i], result.top_job_scores[i]):
+            mismatches += expected[job] != score
+        mismatches += sorted(expected, reverse=True)[:args.top_k] != list(result.top_job_scores[i])
+
+    print(f"{args.resumes} resumes x {args.jobs} jobs, {len(vocabulary)} skills "
+          f"({'scipy.sparse' if sparse is not None else 'numpy'} product)")
+    print(f"job x skill matrix:  {build_time:.2f}s ({job_rows.indices.size} nonzeros)")
+    print(f"match + top-{args.top_k}:      {match_time:.2f}s "
+          f"({args.resumes * args.jobs / match_time / 1e6:.0f}M pairs/s)")
+    print(f"checked {min(args.check, args.resumes)} resumes against SkillMatcher: {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmark: streaming / page-parallel PDF extraction vs the original
+# `text +=` loop, over synthetic PDFs of 1-200 pages.
+#
+#   python benchmarks/bench_pdf_extract.py --pages 1 10 50 200
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+
+from pdf_extract import extract_text_from_pdf, get_pdf_executor
+from synthetic_pdf import make_pdf
+
+
+# The extraction loop from the apps before pdf_extract
+def legacy_extract_text_from_pdf(pdf_file):
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+    for page_num in range(len(pdf_reader.pages)):
+        text += pdf_reader.pages[page_num].extract_text()
+    return text
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Start the worker processes up front so spawn cost isn't timed
+    executor = get_pdf_executor()
+    list(executor.map(abs, range(executor._max_workers)))
+
+    limits = dict(max_pages=10 ** 6, max_chars=10 ** 9, max_bytes=10 ** 10)
+    print(f"{'pages':>6} {'KB':>7} {'legacy ms':>10} {'stream ms':>10} {'parallel ms':>12} "
+          f"{'legacy peak KB':>15} {'stream peak KB':>15}")
+    for pages in args.pages:
+        pdf_bytes = make_pdf(pages)
+        legacy, expected = timed(lambda: legacy_extract_text_from_pdf(io.BytesIO(pdf_bytes)), args.repeat)
+        stream, streamed = timed(lambda: extract_text_from_pdf(pdf_bytes, parallel=False, **limits), args.repeat)
+        parallel, paralleled = timed(lambda: extract_text_from_pdf(pdf_bytes, parallel=True, **limits), args.repeat)
+        assert streamed == paralleled, "parallel extraction disagrees with streaming"
+        assert streamed.replace("\n", "") == expected.replace("\n", ""), "streaming disagrees with the legacy loop"
+        legacy_peak = peak_memory(lambda: legacy_extract_text_from_pdf(io.BytesIO(pdf_bytes)))
+        stream_peak = peak_memory(lambda: extract_text_from_pdf(pdf_bytes, parallel=False, **limits))
+        print(f"{pages:>6} {len(pdf_bytes) // 1024:>7} {legacy * 1000:>10.1f} {stream * 1000:>10.1f} "
+              f"{parallel * 1000:>12.1f} {legacy_peak // 1024:>15} {stream_peak // 1024:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Benchmark: frontend delta messages and bytes per rerun for the parsed
+# resume, stats and job card sections of main.py, comparing the original
+# one-st.markdown-per-fragment rendering with the html_cards/job_cards
+# templates. Bytes are measured on real Streamlit ForwardMsg protos when
+# streamlit is installed, otherwise on the markdown bodies.
+#
+#   python benchmarks/bench_render.py --jobs 10
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_cards import (basic_info_card_html, education_card_html, experience_cards_html,
+                        metric_row_html, skills_card_html)
+from job_cards import render_job_card_html
+
+try:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+except ImportError:
+    ForwardMsg = None
+
+SAMPLE_RESUME = {
+    "basic_info": {"name": "Jordan Lee", "email": "jordan.lee@example.com", "phone": "+1 555 0100", "location": "Austin, TX"},
+    "professional_summary": "Backend engineer with eight years of experience building data platforms and APIs.",
+    "skills": ["Software Design", "Code Review", "Mentoring", "System Design", "Testing", "Documentation"],
+    "technical_skills": ["Python", "Go", "SQL", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes",
+                         "AWS", "Terraform", "FastAPI", "Django", "Airflow", "Spark", "Git", "Linux"],
+    "soft_skills": ["Communication", "Leadership", "Teamwork", "Problem Solving", "Ownership"],
+    "experience": [
+        {"job_title": "Senior Backend Engineer", "company": "Acme Data", "duration": "2021 - Present",
+         "description": "Led the ingestion platform team and cut pipeline latency by 60%."},
+        {"job_title": "Backend Engineer", "company": "Initech", "duration": "2018 - 2021",
+         "description": "Built payment APIs in Go and Python serving 2k requests per second."},
+        {"job_title": "Software Engineer", "company": "Globex", "duration": "2016 - 2018",
+         "description": "Maintained Django services and the internal reporting stack."},
+    ],
+    "education": [
+        {"degree": "B.S. Computer Science", "institution": "University of Texas", "year": "2016"},
+        {"degree": "AWS Solutions Architect", "institution": "Amazon Web Services", "year": "2020"},
+    ],
+    "certifications": ["AWS Solutions Architect - Associate", "CKA"],
+    "years_of_experience": 8,
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def markdown(self, body):
+        self.messages += 1
+        if ForwardMsg is None:
+            self.bytes += len(body.encode("utf-8"))
+            return
+        msg = ForwardMsg()
+        msg.delta.new_element.markdown.body = body
+        msg.delta.new_element.markdown.allow_html = True
+        self.bytes += msg.ByteSize()
+
+    # st.columns(n) sends one horizontal block plus one block per column
+    def columns(self, n):
+        for _ in range(n + 1):
+            self.block()
+
+    def block(self):
+        self.messages += 1
+        if ForwardMsg is None:
+            return
+        msg = ForwardMsg()
+        msg.delta.add_block.allow_empty = True
+        self.bytes += msg.ByteSize()
+
+
+# --- Rendering as main.py did it before the templates (one call per fragment)
+
+def legacy_resume(st, parsed_data):
+    basic_info = parsed_data.get("basic_info", {})
+    st.markdown('<div class="card">')
+    st.columns(2)
+    st.markdown(f"**Name:** {basic_info.get('name', 'Not found')}")
+    st.markdown(f"**Email:** {basic_info.get('email', 'Not found')}")
+    st.markdown(f"**Phone:** {basic_info.get('phone', 'Not found')}")
+    st.markdown(f"**Location:** {basic_info.get('location', 'Not found')}")
+    if parsed_data.get("professional_summary"):
+        st.markdown("<hr style='margin: 1rem 0'>")
+        st.markdown("**Professional Summary:**")
+        st.markdown(parsed_data.get("professional_summary", ""))
+    st.markdown('</div>')
+    for exp in parsed_data.get("experience", []):
+        st.markdown('<div class="card">')
+        st.markdown(f"<div style='color: #1E3A8A; font-weight: 600; font-size: 1.1rem;'>{exp.get('job_title', 'Role')}</div>")
+        st.markdown(f"<div style='color: #64748B; font-weight: 500;'>{exp.get('company', 'Company')}</div>")
+        st.markdown(f"<div style='color: #94A3B8; font-size: 0.9rem; margin-bottom: 0.75rem;'>{exp.get('duration', 'Duration not specified')}</div>")
+        st.markdown(exp.get('description', 'No description available'))
+        st.markdown('</div>')
+    st.columns(2)
+    st.markdown('<div class="card">')
+    st.markdown("<strong>Skills</strong>")
+    for label, key in (("Technical", "technical_skills"), ("Soft", "soft_skills"), ("General", "skills")):
+        st.markdown(f"<div style='margin-top: 1rem;'>**{label} Skills:**</div>")
+        for skill in parsed_data.get(key, []):
+            st.markdown(f"<span class='skill-tag'>{skill}</span>")
+    st.markdown(f"<div style='margin-top: 1rem;'>**Years of Experience:** {parsed_data.get('years_of_experience', 'Not specified')}</div>")
+    st.markdown('</div>')
+    st.markdown('<div class="card">')
+    st.markdown("<strong>Education</strong>")
+    for edu in parsed_data.get("education", []):
+        st.markdown("<div style='margin-bottom: 1rem;'>")
+        st.markdown(f"<div style='font-weight: 600;'>{edu.get('degree', 'Degree')}</div>")
+        st.markdown(f"<div>{edu.get('institution', 'Institution')}</div>")
+        st.markdown(f"<div style='color: #94A3B8; font-size: 0.9rem;'>{edu.get('year', 'Year not specified')}</div>")
+        st.markdown("</div>")
+    if parsed_data.get("certifications"):
+        st.markdown("<hr style='margin: 1rem 0'>")
+        st.markdown("<strong>Certifications</strong>")
+        for cert in parsed_data.get("certifications", []):
+            st.markdown(f"• {cert}")
+    st.markdown('</div>')
+
+
+def legacy_stats(st, skill_count, job_count):
+    st.markdown('<div class="card">')
+    st.columns(2)
+    for value, label in ((skill_count, "Skills"), (job_count, "Jobs")):
+        st.markdown('<div class="metric-card">')
+        st.markdown(f'<div class="metric-value">{value}</div>')
+        st.markdown(f'<div class="metric-label">{label}</div>')
+        st.markdown('</div>')
+    st.markdown('</div>')
+
+
+def legacy_job_cards(st, jobs):
+    for job in jobs:
+        st.markdown('<div class="card job-card">')
+        st.columns(2)
+        st.markdown("<div style='display: flex; align-items: center;'>")
+        st.markdown(f"<div class='job-title'>{job.get('job_title')}</div>")
+        st.markdown(f"<div class='match-medium'>{job['match_percentage']}% Match</div>")
+        st.markdown("</div>")
+        st.markdown(f"<div class='job-company'>{job.get('employer_name')}</div>")
+
+
+# --- Rendering with the templates (one call per component)
+
+def template_resume(st, parsed_data):
+    st.markdown(basic_info_card_html(parsed_data))
+    st.markdown(experience_cards_html(parsed_data.get("experience", [])))
+    st.columns(2)
+    st.markdown(skills_card_html(parsed_data))
+    st.markdown(education_card_html(parsed_data))
+
+
+def template_stats(st, skill_count, job_count):
+    st.markdown(metric_row_html([(skill_count, "Skills"), (job_count, "Jobs")]))
+
+
+def template_job_cards(st, jobs):
+    for job in jobs:
+        st.markdown(render_job_card_html(job, job['match_percentage']))
+
+
+def measure(render, *args):
+    recorder = Recorder()
+    render(recorder, *args)
+    return recorder.messages, recorder.bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10, help="job cards on the visible page")
+    args = parser.parse_args()
+
+    jobs = [{"job_id": str(i), "job_title": f"Backend Engineer {i}", "employer_name": f"Company {i}",
+             "match_percentage": 55} for i in range(args.jobs)]
+    skill_count = len(SAMPLE_RESUME["skills"]) + len(SAMPLE_RESUME["technical_skills"])
+    sections = [
+        ("parsed resume", legacy_resume, template_resume, (SAMPLE_RESUME,)),
+        ("stats", legacy_stats, template_stats, (skill_count, len(jobs))),
+        (f"job cards x{args.jobs}", legacy_job_cards, template_job_cards, (jobs,)),
+    ]
+
+    unit = "ForwardMsg bytes" if ForwardMsg is not None else "markdown bytes"
+    print(f"{'section':<18}{'before msgs':>12}{'after msgs':>12}{'before ' + unit:>26}{'after ' + unit:>26}")
+    totals = [0, 0, 0, 0]
+    for name, legacy, template, render_args in sections:
+        before = measure(legacy, *render_args)
+        after = measure(template, *render_args)
+        totals = [totals[0] + before[0], totals[1] + after[0], totals[2] + before[1], totals[3] + after[1]]
+        print(f"{name:<18}{before[0]:>12}{after[0]:>12}{before[1]:>26}{after[1]:>26}")
+    print(f"{'total per rerun':<18}{totals[0]:>12}{totals[1]:>12}{totals[2]:>26}{totals[3]:>26}")
+
+
+if __name__ == "__main__":
+    main()
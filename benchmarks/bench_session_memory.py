@@ -0,0 +1,85 @@
+# Benchmark: memory held per session for one search's results, as raw
+# JSearch postings (mutated with match scores, plus the resume text) vs
+# JobRecords shared between sessions through the PostingStore, with their
+# descriptions in the DescriptionStore.
+#
+#   python benchmarks/bench_session_memory.py --jobs 1000 --sessions 20
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_skill_matcher import make_descriptions
+from job_records import compact_jobs, get_description_store, get_posting_store
+from replay import load_resume_fixtures, scaled_jobs
+from sizeof import deep_sizeof
+
+
+# Session state as the apps kept it before JobRecords: each session held
+# its own decoded postings, with the match results written into them
+def raw_session(postings, resume_text):
+    jobs = json.loads(postings)
+    for job in jobs:
+        job["match_percentage"], job["matched_skills"] = 40, ["Python", "SQL", "Docker"]
+        job["semantic_score"], job["match_score"] = 35, 37.5
+    return {"job_results": jobs, "resume_text": resume_text}
+
+
+def compact_session(postings):
+    return {"job_results": compact_jobs(json.loads(postings))}
+
+
+# Function to build `sessions` sessions with make_session and return
+# (bytes held by one session alone, bytes allocated in total). Objects
+# also reachable from another session are shared and not counted.
+def measure(make_session, sessions):
+    gc.collect()
+    tracemalloc.start()
+    built = [make_session() for _ in range(sessions)]
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    shared = set()
+    deep_sizeof(built[1], shared)
+    return deep_sizeof(built[0], shared), allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-session memory of raw postings and JobRecords.")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=20, help="sessions holding the same search results")
+    parser.add_argument("--words", type=int, default=600, help="words per job description")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if args.sessions < 2:
+        parser.error("--sessions must be at least 2")
+
+    rng = random.Random(args.seed)
+    jobs = scaled_jobs(args.jobs, seed=args.seed)
+    for job, description in zip(jobs, make_descriptions(args.jobs, args.words, rng)):
+        job["job_description"] = description
+        job["job_highlights"] = {"Qualifications": description.split(". ")[:5]}
+    # Every session decodes its own copy, as the app does per search
+    postings = json.dumps(jobs)
+    resume_text = next(iter(load_resume_fixtures().values()))[0]
+
+    raw_bytes, raw_total = measure(lambda: raw_session(postings, resume_text), args.sessions)
+    compact_bytes, compact_total = measure(lambda: compact_session(postings), args.sessions)
+    store = get_posting_store().stats()
+    descriptions = get_description_store().stats()
+
+    print(f"{args.jobs} jobs (~{args.words}-word descriptions), {args.sessions} sessions with the same results")
+    print(f"raw postings:  {raw_bytes / 1024:8.0f} KB per session, {raw_total / 2 ** 20:7.1f} MB allocated in total")
+    print(f"job records:   {compact_bytes / 1024:8.0f} KB per session, {compact_total / 2 ** 20:7.1f} MB allocated in total "
+          f"(shared postings: {store['live']}, {store['bytes'] / 2 ** 20:.1f} MB, "
+          f"descriptions: {descriptions['descriptions']}, {descriptions['bytes'] / 2 ** 20:.1f} MB)")
+    print(f"per session:   {raw_bytes / max(compact_bytes, 1):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
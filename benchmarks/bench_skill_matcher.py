@@ -0,0 +1,102 @@
+# Benchmark: skill match scoring with the compiled SkillMatcher vs the
+# original per-skill substring loop, over synthetic job descriptions.
+#
+#   python benchmarks/bench_skill_matcher.py --jobs 3000 --skills 40
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Rust", "SQL",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "Azure", "GCP",
+    "Terraform", "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spark",
+    "Hadoop", "Kafka", "Airflow", "Pandas", "NumPy", "TensorFlow", "PyTorch", "Machine Learning",
+    "Deep Learning", "NLP", "Computer Vision", "CI/CD", "Git", "Linux", "REST APIs", "GraphQL",
+    "Communication", "Leadership", "Teamwork", "Problem Solving", "Agile", "Scrum",
+]
+
+FILLER = (
+    "we are looking for a motivated engineer to join our growing team and help build "
+    "reliable scalable services for customers around the world with a strong focus on "
+    "quality ownership collaboration and continuous improvement in a fast paced environment"
+).split()
+
+
+def make_descriptions(count, length, rng):
+    descriptions = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(length)]
+        for _ in range(rng.randint(3, 12)):
+            words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+        descriptions.append(" ".join(words).capitalize() + ".")
+    return descriptions
+
+
+# The scoring loop from the results section before SkillMatcher
+def legacy_score(all_skills, descriptions):
+    results = []
+    for desc in descriptions:
+        desc = desc.lower()
+        matched_skills = [skill for skill in all_skills if skill.lower() in desc]
+        results.append((int((len(matched_skills) / max(1, len(all_skills))) * 100), matched_skills))
+    return results
+
+
+def matcher_score(matcher, descriptions):
+    return [matcher.score(desc) for desc in descriptions]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--skills", type=int, default=40)
+    parser.add_argument("--words", type=int, default=400, help="filler words per description")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    descriptions = make_descriptions(args.jobs, args.words, rng)
+    all_skills = set(rng.sample(SKILLS, min(args.skills, len(SKILLS))))
+
+    compile_start = time.perf_counter()
+    matcher = SkillMatcher(sorted(all_skills))
+    compile_time = time.perf_counter() - compile_start
+
+    legacy = best_of(lambda: legacy_score(all_skills, descriptions), args.repeat)
+    compiled = best_of(lambda: matcher_score(matcher, descriptions), args.repeat)
+
+    # Streamlit reruns score the same jobs again; score_job memoizes by job_id
+    jobs = [{"job_id": str(i), "job_description": desc} for i, desc in enumerate(descriptions)]
+    first_run = best_of(lambda: [matcher.score_job(job) for job in jobs], 1)
+    rerun = best_of(lambda: [matcher.score_job(job) for job in jobs], args.repeat)
+
+    # Substring matching over-counts short skills ("C", "Go", "Java" in "JavaScript")
+    legacy_total = sum(len(m) for _, m in legacy_score(all_skills, descriptions))
+    compiled_total = sum(len(m) for _, m in matcher_score(matcher, descriptions))
+
+    print(f"jobs={args.jobs} skills={len(all_skills)} avg_chars={sum(map(len, descriptions)) // len(descriptions)}")
+    print(f"compile:          {compile_time * 1000:8.2f} ms (once per resume)")
+    print(f"substring loop:   {legacy * 1000:8.2f} ms  ({legacy / args.jobs * 1e6:6.1f} us/job)  matches={legacy_total}")
+    print(f"SkillMatcher:     {compiled * 1000:8.2f} ms  ({compiled / args.jobs * 1e6:6.1f} us/job)  matches={compiled_total}")
+    print(f"score_job first:  {first_run * 1000:8.2f} ms")
+    print(f"score_job rerun:  {rerun * 1000:8.2f} ms  ({rerun / args.jobs * 1e6:6.1f} us/job)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+# Load test: drives the Streamlit app headlessly with many concurrent
+# simulated users, each going upload -> search -> filter -> sort -> next
+# page, against the replayed JSearch and Gemini responses (see replay.py).
+# Every session runs in this one process, as they would in `streamlit run`.
+#
+#   python benchmarks/load_test.py --users 20
+#   python benchmarks/load_test.py --users 50 --iterations 3 --jsearch-delay 0.3 --gemini-delay 2
+#   python benchmarks/load_test.py --users 20 --output load.json
+import argparse
+import gc
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+# Stand-ins and a throwaway job store must be configured before the app
+# modules create their singletons
+_state_dir = tempfile.mkdtemp(prefix="aijobfinder-load-")
+os.environ.setdefault("RESUME_CACHE_DIR", "")
+os.environ.setdefault("GEMINI_BACKEND", "fake")
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_state_dir, "jobs.sqlite3"))
+os.environ.setdefault("JOB_INDEX_DIR", os.path.join(_state_dir, "job_index"))
+os.environ.setdefault("JOB_VECTOR_DIR", os.path.join(_state_dir, "job_vectors"))
+
+from unittest.mock import MagicMock
+
+import streamlit as st
+from streamlit import config
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+from gemini_client import FakeGeminiModel, set_gemini_backend
+from replay import ReplayJSearchServer, recorded_gemini_responder
+from sizeof import deep_sizeof
+from synthetic_pdf import make_pdf
+
+QUERIES = (("python developer", "New York"), ("data scientist", "Remote"),
+           ("backend engineer", "San Francisco"), ("machine learning engineer", "Austin"))
+# Session state key holding the simulated upload of each session
+UPLOAD_KEY = "_load_test_upload"
+RESUME_POLL_SECONDS = 0.5
+DEFAULT_RESUME_TIMEOUT = 120.0
+
+
+# Stands in for the browser upload: AppTest can't drive st.file_uploader,
+# so the patched widget hands back whatever the session's user "uploaded"
+class _Upload:
+    def __init__(self, name, data):
+        self.name = name
+        self.size = len(data)
+        self._data = data
+
+    def getvalue(self):
+        return self._data
+
+
+def _file_uploader(label, *args, **kwargs):
+    return st.session_state.get(UPLOAD_KEY)
+
+
+# AppTest installs a mock runtime and turns on its test mode before each
+# run and undoes both after, which pulls them out from under sessions still
+# running on other threads. Keep both in place for the whole test instead,
+# and compile the script once for every session as `streamlit run` does
+# (AppTest compiles on every run, and concurrent compiles can fail).
+def _keep_test_runtime():
+    script_cache = ScriptCache()
+    get_bytecode = ScriptCache.get_bytecode
+    ScriptCache.get_bytecode = lambda self, script_path: get_bytecode(script_cache, script_path)
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.exists = classmethod(lambda cls: True)
+    Runtime.instance = classmethod(lambda cls: cls._instance or runtime)
+    config.set_option("global.appTest", True)
+    # With a runtime around, driving sessions from plain threads warns on
+    # every widget interaction
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS is the best available elsewhere (bytes on macOS, KiB on Linux)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Function to estimate each session's own memory from its session state.
+# Objects reachable from more than one session (shared job records,
+# interned strings) aren't counted towards any of them.
+def session_sizes(session_states):
+    states = [{key: value for key, value in session_state.filtered_state.items() if key != UPLOAD_KEY}
+              for session_state in session_states]
+    reachable = Counter()
+    for state in states:
+        seen = set()
+        deep_sizeof(state, seen)
+        reachable.update(seen)
+    shared = {obj_id for obj_id, count in reachable.items() if count > 1}
+    return [deep_sizeof(state, set(shared)) for state in states]
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoadTest:
+    def __init__(self, app, users, iterations, pages, resume_timeout=DEFAULT_RESUME_TIMEOUT):
+        self.app = app
+        self.users = users
+        self.iterations = iterations
+        self.pages = pages
+        self.resume_timeout = resume_timeout
+        self.latencies = defaultdict(list)
+        self.errors = []
+        self.sessions = []
+        self.workflows = 0
+        self._lock = threading.Lock()
+
+    def _rerun(self, at, action, user):
+        started = time.perf_counter()
+        at.run()
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self.latencies[action].append(seconds)
+            self.errors.extend(f"user {user} {action}: {e.value}" for e in at.exception)
+        return at
+
+    def _workflow(self, at, user, iteration):
+        # Upload a resume of the user's own and rerun as the page would
+        # poll until the background parse lands
+        at.session_state[UPLOAD_KEY] = _Upload(f"resume-{user}.pdf", make_pdf(2, seed=user * 1000 + iteration))
+        self._rerun(at, "upload", user)
+        deadline = time.monotonic() + self.resume_timeout
+        while not at.session_state.resume_parsed:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"resume not parsed within {self.resume_timeout:.0f}s")
+            time.sleep(RESUME_POLL_SECONDS)
+            self._rerun(at, "resume_poll", user)
+
+        query, location = QUERIES[(user + iteration) % len(QUERIES)]
+        at.text_input[0].input(query)
+        at.text_input[1].input(location)
+        next(number for number in at.number_input if number.label == "Result pages").set_value(self.pages)
+        next(button for button in at.button if button.label == "Search Jobs").click()
+        self._rerun(at, "search", user)
+
+        at.checkbox(key="filter_remote_only").check()
+        self._rerun(at, "filter", user)
+        at.checkbox(key="filter_remote_only").uncheck()
+        at.multiselect(key="filter_employment_types").select("FULLTIME")
+        self._rerun(at, "filter", user)
+
+        sort = [checkbox for checkbox in at.checkbox if checkbox.label.startswith("Sort")]
+        if sort:
+            sort[0].uncheck()
+            self._rerun(at, "sort", user)
+            sort[0].check()
+            self._rerun(at, "sort", user)
+
+        next_page = [button for button in at.button if button.key == "results_next"]
+        if next_page and not next_page[0].disabled:
+            next_page[0].click()
+            self._rerun(at, "next_page", user)
+
+        # Start over with a fresh upload next time round
+        at.session_state.resume_parsed = False
+
+    def _user(self, user, start_barrier):
+        start_barrier.wait()
+        try:
+            at = AppTest.from_file(self.app, default_timeout=self.resume_timeout)
+            self._rerun(at, "page_load", user)
+            for iteration in range(self.iterations):
+                self._workflow(at, user, iteration)
+                with self._lock:
+                    self.workflows += 1
+            # Kept alive until the memory is measured
+            with self._lock:
+                self.sessions.append(at)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"user {user}: {type(e).__name__}: {e}")
+
+    def run(self):
+        # Load the app once first so imports and process-wide singletons
+        # don't count towards the sessions' memory
+        AppTest.from_file(self.app, default_timeout=self.resume_timeout).run()
+        gc.collect()
+        rss_before = _rss_bytes()
+        start_barrier = threading.Barrier(self.users)
+        threads = [threading.Thread(target=self._user, args=(user, start_barrier), name=f"load-user-{user}")
+                   for user in range(self.users)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        gc.collect()
+        rss_after = _rss_bytes()
+        sizes = session_sizes([at.session_state for at in self.sessions])
+        return self.report(wall, rss_before, rss_after, sizes)
+
+    def report(self, wall, rss_before, rss_after, sizes):
+        reruns = sum(len(values) for values in self.latencies.values())
+        actions = {}
+        for action, values in self.latencies.items():
+            ordered = sorted(values)
+            actions[action] = {"count": len(ordered), "mean_ms": sum(ordered) / len(ordered) * 1000,
+                               "p50_ms": _percentile(ordered, 0.5) * 1000, "p95_ms": _percentile(ordered, 0.95) * 1000,
+                               "p99_ms": _percentile(ordered, 0.99) * 1000, "max_ms": ordered[-1] * 1000}
+        return {
+            "app": self.app,
+            "users": self.users,
+            "iterations": self.iterations,
+            "pages": self.pages,
+            "seconds": wall,
+            "workflows": self.workflows,
+            "workflows_per_minute": self.workflows / wall * 60,
+            "reruns": reruns,
+            "reruns_per_second": reruns / wall,
+            "actions": actions,
+            "errors": self.errors,
+            "memory": {
+                "rss_before_mb": rss_before / 2 ** 20,
+                "rss_after_mb": rss_after / 2 ** 20,
+                "rss_per_session_kb": (rss_after - rss_before) / max(self.users, 1) / 1024,
+                "session_state_kb_mean": sum(sizes) / max(len(sizes), 1) / 1024,
+                "session_state_kb_max": max(sizes, default=0) / 1024,
+            },
+        }
+
+
+def print_report(report, out=sys.stderr):
+    print(f"{report['users']} users x {report['iterations']} workflows of {report['app']} in {report['seconds']:.1f}s: "
+          f"{report['workflows_per_minute']:.1f} workflows/min, {report['reruns_per_second']:.1f} reruns/s", file=out)
+    print(f"{'action':<12} {'count':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}", file=out)
+    for action, stats in report["actions"].items():
+        print(f"{action:<12} {stats['count']:>6} {stats['mean_ms']:9.1f} {stats['p50_ms']:9.1f} "
+              f"{stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}", file=out)
+    memory = report["memory"]
+    print(f"RSS {memory['rss_before_mb']:.1f} -> {memory['rss_after_mb']:.1f} MB "
+          f"({memory['rss_per_session_kb']:.0f} KB per session), session state "
+          f"{memory['session_state_kb_mean']:.0f} KB mean / {memory['session_state_kb_max']:.0f} KB max", file=out)
+    if report["errors"]:
+        print(f"{len(report['errors'])} errors, first: {report['errors'][0]}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the app against local stand-in APIs.")
+    parser.add_argument("--app", default=os.path.join(ROOT, "main.py"), help="Streamlit script to drive")
+    parser.add_argument("--users", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=1, help="workflows per session")
+    parser.add_argument("--pages", type=int, default=3, help="result pages per search")
+    parser.add_argument("--jsearch-delay", type=float, default=0.0, help="seconds the JSearch stand-in takes per page")
+    parser.add_argument("--gemini-delay", type=float, default=0.0, help="seconds the Gemini stand-in takes per parse")
+    parser.add_argument("--resume-timeout", type=float, default=DEFAULT_RESUME_TIMEOUT)
+    parser.add_argument("--output", help="also write the report as JSON here")
+    args = parser.parse_args()
+
+    server = ReplayJSearchServer(delay=args.jsearch_delay).start()
+    os.environ["JSEARCH_BASE_URL"] = server.url
+    set_gemini_backend(FakeGeminiModel(recorded_gemini_responder(), latency=args.gemini_delay))
+    st.file_uploader = _file_uploader
+    _keep_test_runtime()
+    try:
+        report = LoadTest(args.app, args.users, args.iterations, args.pages, args.resume_timeout).run()
+    finally:
+        server.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
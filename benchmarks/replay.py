@@ -0,0 +1,126 @@
+# Local stand-ins for JSearch and Gemini that replay recorded responses,
+# so benchmarks and load tests never touch the network.
+#
+# JSearch responses live in benchmarks/fixtures/jsearch/*.json and Gemini
+# resume parses in benchmarks/fixtures/resumes/*.json; the bundled ones
+# are hand-made in the shape of the real APIs' responses.
+import copy
+import glob
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_search_fixtures():
+    responses = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "jsearch", "*.json"))):
+        with open(path) as f:
+            responses.append(json.load(f))
+    return responses
+
+
+def load_resume_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "resumes", "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f:
+            parsed = json.load(f)
+        with open(os.path.splitext(path)[0] + ".txt") as f:
+            fixtures[name] = (f.read(), parsed)
+    return fixtures
+
+
+# Function to make `count` distinct postings by varying the recorded ones:
+# unique ids, shuffled remote / type / salary / posting date
+def scaled_jobs(count, seed=0, now=None):
+    rng = random.Random(seed)
+    now = int(time.time()) if now is None else now
+    recorded = [job for response in load_search_fixtures() for job in response["data"]]
+    jobs = []
+    for i in range(count):
+        job = dict(recorded[i % len(recorded)])
+        job["job_id"] = f"{job['job_id']}-{i}"
+        job["job_is_remote"] = rng.random() < 0.3
+        job["job_employment_type"] = rng.choice(["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN"])
+        job["job_posted_at_timestamp"] = now - rng.randint(0, 60) * 86400
+        if rng.random() < 0.7:
+            low = rng.randrange(40000, 200000, 5000)
+            job["job_min_salary"], job["job_max_salary"] = low, low + rng.randrange(0, 60000, 5000)
+        else:
+            job["job_min_salary"] = job["job_max_salary"] = None
+        jobs.append(job)
+    return jobs
+
+
+# Gemini stand-in responder: answers with the recorded parse of whichever
+# fixture resume's email appears in the prompt (the first one otherwise)
+def recorded_gemini_responder():
+    parses = [parsed for _, parsed in load_resume_fixtures().values()]
+
+    def respond(contents):
+        prompt = contents if isinstance(contents, str) else json.dumps(contents)
+        for parsed in parses:
+            email = parsed.get("basic_info", {}).get("email")
+            if email and email in prompt:
+                return copy.deepcopy(parsed)
+        return copy.deepcopy(parses[0])
+    return respond
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this the body waits
+    # on a delayed ACK and every request takes ~40ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        params = parse_qs(urlsplit(self.path).query)
+        page = int(params.get("page", ["1"])[0])
+        with server.lock:
+            server.calls += 1
+        if server.delay:
+            time.sleep(server.delay)
+        # Every page replays the recorded data under page-specific job_ids
+        response = dict(server.responses[(page - 1) % len(server.responses)])
+        response["data"] = [dict(job, job_id=f"{job['job_id']}-p{page}") for job in response["data"]]
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Local HTTP server answering JSearch /search requests from the recorded
+# responses; point the app at it with JSEARCH_BASE_URL=server.url
+class ReplayJSearchServer:
+    def __init__(self, delay=0.0, responses=None):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+        self._server.daemon_threads = True
+        self._server.responses = responses or load_search_fixtures()
+        self._server.delay = delay
+        self._server.calls = 0
+        self._server.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def calls(self):
+        return self._server.calls
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="replay-jsearch", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
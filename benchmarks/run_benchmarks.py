@@ -0,0 +1,245 @@
+# Benchmark suite: times each pipeline stage at several scales against
+# recorded JSearch / Gemini responses (see replay.py, no network), writes
+# the results as JSON and compares them with a stored baseline.
+#
+#   python benchmarks/run_benchmarks.py                      # full run
+#   python benchmarks/run_benchmarks.py --quick              # 10 / 1k jobs, short PDFs
+#   python benchmarks/run_benchmarks.py --save-baseline      # record a new baseline
+#   python benchmarks/run_benchmarks.py --fail-on-regression # non-zero exit if slower
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+# Stand-ins must be configured before the app modules create their singletons
+os.environ.setdefault("RESUME_CACHE_DIR", "")
+os.environ.setdefault("GEMINI_BACKEND", "fake")
+
+import numpy as np
+
+import jsearch_client
+from gemini_client import FakeGeminiModel, set_gemini_backend
+from job_filters import FilterState, IncrementalFilter, JobColumns
+from job_records import JobMatch, compact_jobs
+from local_resume_parser import parse_resume_locally
+from pdf_extract import extract_text_from_pdf
+from replay import ReplayJSearchServer, load_resume_fixtures, recorded_gemini_responder, scaled_jobs
+from resume_parser import parse_resume_with_gemini
+from resume_text_prep import prepare_resume_text
+from semantic_rank import HashingEmbedder, SemanticRanker, VectorIndex
+from skill_matcher import SkillMatcher
+from synthetic_pdf import make_pdf
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+JOB_SCALES = (10, 1000, 100000)
+PDF_PAGES = (1, 10, 50, 200)
+# A case counts as a regression when its median is this much above baseline
+DEFAULT_THRESHOLD = 1.25
+# Semantic scoring embeds every job, so it is only run up to this scale
+SEMANTIC_MAX_JOBS = 1000
+
+FILTERS = FilterState(remote_only=False, employment_types=("FULLTIME", "CONTRACTOR"), date_posted_days=30,
+                      min_salary=50000, max_salary=250000, company_types=())
+
+
+# Function to time fn, returning the min / median of `repeat` runs in ms
+def measure(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state) if setup else fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": round(min(times), 4), "median_ms": round(statistics.median(times), 4), "repeat": repeat}
+
+
+def _repeat_for(size, repeat):
+    # Fewer repetitions for the slowest cases
+    return max(1, repeat // 4) if size >= 100000 else repeat
+
+
+def bench_pdf(results, pages_list, repeat):
+    for pages in pages_list:
+        pdf = make_pdf(pages)
+        results[f"pdf_extract[pages={pages}]"] = measure(
+            lambda: extract_text_from_pdf(pdf), max(1, repeat // 2) if pages >= 50 else repeat)
+
+
+def bench_resume(results, repeat):
+    set_gemini_backend(FakeGeminiModel(recorded_gemini_responder()))
+    for name, (text, _) in load_resume_fixtures().items():
+        prepared = prepare_resume_text(text)
+        results[f"resume_text_prep[{name}]"] = measure(lambda: prepare_resume_text(text), repeat * 10)
+        results[f"resume_parse_gemini[{name}]"] = measure(lambda: parse_resume_with_gemini(prepared.text), repeat * 10)
+        results[f"resume_parse_local[{name}]"] = measure(lambda: parse_resume_locally(prepared.text), repeat * 10)
+
+
+def bench_search(results, repeat):
+    server = ReplayJSearchServer().start()
+    # The process-wide client reads JSEARCH_BASE_URL when first created
+    os.environ["JSEARCH_BASE_URL"] = server.url
+    jsearch_client._client = None
+    queries = itertools.count()
+    try:
+        for pages in (1, 10):
+            # A fresh query each run so every page misses the search cache
+            def search():
+                query = f"python developer {next(queries)}"
+                return [job for _, jobs in jsearch_client.iter_search_pages(query, "new york", pages) for job in jobs]
+            results[f"jsearch_search[pages={pages}]"] = measure(search, repeat)
+    finally:
+        server.stop()
+
+
+def bench_jobs(results, scales, repeat):
+    resume = load_resume_fixtures()["backend_engineer"][1]
+    skills = sorted(set(resume["technical_skills"]) | set(resume["skills"]) | set(resume["soft_skills"]))
+    for size in scales:
+        postings = scaled_jobs(size, seed=size)
+        n = _repeat_for(size, repeat)
+
+        results[f"compact_jobs[jobs={size}]"] = measure(lambda: compact_jobs(postings), n)
+        jobs = compact_jobs(postings)
+
+        results[f"apply_filters_cold[jobs={size}]"] = measure(
+            lambda: IncrementalFilter(JobColumns(jobs)).apply(FILTERS), n)
+
+        def warm_setup():
+            job_filter = IncrementalFilter(JobColumns(jobs))
+            job_filter.apply(FILTERS)
+            return job_filter
+        changed = FILTERS._replace(remote_only=True)
+        results[f"apply_filters_warm[jobs={size}]"] = measure(lambda job_filter: job_filter.apply(changed), n, warm_setup)
+
+        # A new matcher each run so the per-job score memo starts empty
+        skill_matches = []
+        def score(matcher):
+            skill_matches[:] = [matcher.score_job(job) for job in jobs]
+        results[f"skill_scoring[jobs={size}]"] = measure(score, n, lambda: SkillMatcher(skills))
+        percentages = [match_percentage for match_percentage, _ in skill_matches]
+
+        if size <= SEMANTIC_MAX_JOBS:
+            embedder = HashingEmbedder()
+            semantic_scores = []
+            def semantic(ranker):
+                semantic_scores[:] = ranker.score_jobs(resume, jobs, percentages)
+            results[f"semantic_scoring[jobs={size}]"] = measure(
+                semantic, n, lambda: SemanticRanker(embedder, VectorIndex(embedder.dim)))
+        else:
+            semantic_scores = [(0, match_percentage) for match_percentage in percentages]
+        matches = [JobMatch(*skill_match, *scores) for skill_match, scores in zip(skill_matches, semantic_scores)]
+
+        results[f"sort_by_match[jobs={size}]"] = measure(
+            lambda: sorted(zip(jobs, matches), key=lambda pair: pair[1].match_score, reverse=True), n)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Function to compare results with a baseline. Returns rows of
+# (case, baseline_ms, current_ms, ratio, flag) using medians.
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    rows = []
+    for case, current in results.items():
+        before = baseline.get(case)
+        if before is None:
+            rows.append((case, None, current["median_ms"], None, "new"))
+            continue
+        ratio = current["median_ms"] / max(before["median_ms"], 1e-9)
+        flag = "slower" if ratio > threshold else "faster" if ratio < 1 / threshold else ""
+        rows.append((case, before["median_ms"], current["median_ms"], ratio, flag))
+    return rows
+
+
+def print_comparison(rows, out=sys.stderr):
+    print(f"{'case':<44} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}", file=out)
+    for case, before, current, ratio, flag in rows:
+        before_text = f"{before:12.3f}" if before is not None else f"{'-':>12}"
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{case:<44} {before_text} {current:12.3f} {ratio_text}  {flag}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite against recorded fixtures.")
+    parser.add_argument("--quick", action="store_true", help="only 10 / 1k jobs and resumes up to 10 pages")
+    parser.add_argument("--jobs", type=int, nargs="+", help=f"job scales (default {' '.join(map(str, JOB_SCALES))})")
+    parser.add_argument("--pages", type=int, nargs="+", help=f"PDF page counts (default {' '.join(map(str, PDF_PAGES))})")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    scales = args.jobs or ((10, 1000) if args.quick else JOB_SCALES)
+    pages = args.pages or ((1, 10) if args.quick else PDF_PAGES)
+
+    results = {}
+    started = time.perf_counter()
+    bench_pdf(results, pages, args.repeat)
+    bench_resume(results, args.repeat)
+    bench_search(results, args.repeat)
+    bench_jobs(results, scales, args.repeat)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "job_scales": list(scales),
+            "pdf_pages": list(pages),
+            "seconds": round(time.perf_counter() - started, 1),
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote {output}", file=sys.stderr)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"Compared with baseline from commit {baseline['meta'].get('commit')}:", file=sys.stderr)
+        rows = compare(results, baseline["results"], args.threshold)
+        print_comparison(rows)
+        regressions = [row[0] for row in rows if row[4] == "slower"]
+    else:
+        print_comparison(compare(results, {}))
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+
+    if regressions:
+        print(f"{len(regressions)} cases slower than baseline by more than {args.threshold:g}x", file=sys.stderr)
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
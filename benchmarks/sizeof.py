@@ -0,0 +1,21 @@
+# Deep object size estimate shared by the memory benchmarks
+import sys
+
+
+# Function to estimate the bytes reachable from obj, counting each object
+# once per `seen` set
+def deep_sizeof(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(type(obj), "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in type(obj).__slots__
+                    if isinstance(name, str) and hasattr(obj, name))
+    return size
@@ -0,0 +1,58 @@
+# Minimal PDF writer for benchmarks: builds text-only, multi-page resumes
+# without pulling in a PDF generation library.
+import random
+
+WORDS = (
+    "python sql aws docker kubernetes react machine learning data pipelines "
+    "led team delivered platform improved latency reduced cost designed built "
+    "migrated services customers analytics dashboards testing automation"
+).split()
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_lines(page_num, rng, lines_per_page):
+    yield f"Jane Doe - Resume page {page_num + 1}"
+    for _ in range(lines_per_page - 1):
+        yield " ".join(rng.choice(WORDS) for _ in range(12))
+
+
+# Function to build a PDF with the given number of pages of random resume text
+def make_pdf(pages, lines_per_page=45, seed=0):
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for page_num in range(pages):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        ops.extend(f"({_escape(line)}) '" for line in _page_lines(page_num, rng, lines_per_page))
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
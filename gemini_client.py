@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+
+import perf
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_QUEUE_TIMEOUT = 120.0
+
+
+class GeminiBusyError(RuntimeError):
+    pass
+
+
+# Backend that talks to the Gemini API through one long-lived genai.Client,
+# so HTTP connections and auth setup are reused across calls
+class GenaiBackend:
+    def __init__(self, api_key=None):
+        from google import genai
+
+        self.client = genai.Client(api_key=api_key or os.getenv('GEMINI_API_KEY'))
+
+    def generate_content(self, model, contents, config=None):
+        return self.client.models.generate_content(model=model, contents=contents, config=config)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+# Local stand-in for the Gemini API, for tests and load runs. `responder`
+# is called with the prompt and returns the response text, a dict (sent
+# back as JSON) or raises; by default every call returns an empty object.
+class FakeGeminiModel:
+    def __init__(self, responder=None, latency=0.0):
+        self.responder = responder or (lambda contents: {})
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, model, contents, config=None):
+        with self._lock:
+            self.calls.append({"model": model, "contents": contents, "config": config})
+        if self.latency:
+            time.sleep(self.latency)
+        result = self.responder(contents)
+        return FakeResponse(result if isinstance(result, str) else json.dumps(result))
+
+
+# Process-wide Gemini client. The backend is created once on first use and
+# shared by every Streamlit session; at most max_in_flight requests run at
+# a time and the rest wait their turn (up to queue_timeout seconds) instead
+# of hitting the API as a burst.
+class GeminiClientManager:
+    def __init__(self, backend_factory=GenaiBackend, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT, model=DEFAULT_MODEL):
+        self.backend_factory = backend_factory
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.model = model
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "errors": 0, "rejected": 0, "in_flight": 0, "queued": 0,
+                       "max_queued": 0, "wait_seconds": 0.0}
+
+    @property
+    def backend(self):
+        with self._backend_lock:
+            if self._backend is None:
+                self._backend = self.backend_factory()
+            return self._backend
+
+    # Replace the backend, e.g. with a FakeGeminiModel in tests
+    def set_backend(self, backend):
+        with self._backend_lock:
+            self._backend = backend
+
+    def generate_content(self, contents, model=None, config=None):
+        with self._lock:
+            self._stats["queued"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._stats["queued"])
+        start = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        waited = time.monotonic() - start
+        perf.observe("gemini_queue_wait", waited)
+        with self._lock:
+            self._stats["queued"] -= 1
+            self._stats["wait_seconds"] += waited
+            if not acquired:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["in_flight"] += 1
+                self._stats["calls"] += 1
+        if not acquired:
+            raise GeminiBusyError(f"Gemini is busy, no slot freed up within {self.queue_timeout:g}s")
+        try:
+            with perf.span("gemini_request"):
+                return self.backend.generate_content(model or self.model, contents, config=config)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, max_in_flight=self.max_in_flight)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+# Function to get the process-wide Gemini client, configured from the
+# environment. GEMINI_BACKEND=fake swaps in FakeGeminiModel.
+def get_gemini_client():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            backend_factory = FakeGeminiModel if os.getenv("GEMINI_BACKEND") == "fake" else GenaiBackend
+            _manager = GeminiClientManager(
+                backend_factory=backend_factory,
+                max_in_flight=int(os.getenv("GEMINI_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+                queue_timeout=float(os.getenv("GEMINI_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+                model=os.getenv("GEMINI_MODEL", DEFAULT_MODEL),
+            )
+            perf.register_collector("gemini", _manager.stats)
+        return _manager
+
+
+# Function to swap the backend of the process-wide client
+def set_gemini_backend(backend):
+    get_gemini_client().set_backend(backend)
@@ -0,0 +1,119 @@
+import html
+
+# Templates for the parsed-resume and stats sections of main.py. Each
+# component is rendered as a single HTML fragment, so it costs one
+# st.markdown delta instead of one per line, tag and open/close div.
+
+
+def _text(value, default=""):
+    return html.escape(str(value if value not in (None, "") else default))
+
+
+def _paragraphs(value, default=""):
+    return _text(value, default).replace("\n", "<br>")
+
+
+# Function to build the basic info card (name, contact, summary)
+def basic_info_card_html(parsed_data):
+    basic_info = parsed_data.get("basic_info") or {}
+    summary = ""
+    if parsed_data.get("professional_summary"):
+        summary = (
+            "<hr style='margin: 1rem 0'>"
+            "<strong>Professional Summary:</strong>"
+            f"<p>{_paragraphs(parsed_data.get('professional_summary'))}</p>"
+        )
+    return (
+        "<div class='card'>"
+        "<div style='display: flex; gap: 1rem;'>"
+        "<div style='flex: 1;'>"
+        f"<p><strong>Name:</strong> {_text(basic_info.get('name'), 'Not found')}</p>"
+        f"<p><strong>Email:</strong> {_text(basic_info.get('email'), 'Not found')}</p>"
+        "</div>"
+        "<div style='flex: 1;'>"
+        f"<p><strong>Phone:</strong> {_text(basic_info.get('phone'), 'Not found')}</p>"
+        f"<p><strong>Location:</strong> {_text(basic_info.get('location'), 'Not found')}</p>"
+        "</div>"
+        "</div>"
+        f"{summary}"
+        "</div>"
+    )
+
+
+# Function to build one card per experience entry
+def experience_cards_html(experience):
+    return "".join(
+        "<div class='card'>"
+        f"<div style='color: #1E3A8A; font-weight: 600; font-size: 1.1rem;'>{_text(exp.get('job_title'), 'Role')}</div>"
+        f"<div style='color: #64748B; font-weight: 500;'>{_text(exp.get('company'), 'Company')}</div>"
+        f"<div style='color: #94A3B8; font-size: 0.9rem; margin-bottom: 0.75rem;'>{_text(exp.get('duration'), 'Duration not specified')}</div>"
+        f"<div>{_paragraphs(exp.get('description'), 'No description available')}</div>"
+        "</div>"
+        for exp in experience
+    )
+
+
+# Function to build a cloud of skill tags, or a fallback line if empty
+def skill_tags_html(skills, empty_message):
+    if not skills:
+        return f"<div>{_text(empty_message)}</div>"
+    return "<div>" + "".join(f"<span class='skill-tag'>{_text(skill)}</span>" for skill in skills) + "</div>"
+
+
+# Function to build the skills card (technical, soft and general skills)
+def skills_card_html(parsed_data):
+    return (
+        "<div class='card'>"
+        "<strong>Skills</strong>"
+        "<div style='margin-top: 0.5rem;'><strong>Technical Skills:</strong></div>"
+        f"{skill_tags_html(parsed_data.get('technical_skills'), 'No technical skills found')}"
+        "<div style='margin-top: 1rem;'><strong>Soft Skills:</strong></div>"
+        f"{skill_tags_html(parsed_data.get('soft_skills'), 'No soft skills found')}"
+        "<div style='margin-top: 1rem;'><strong>General Skills:</strong></div>"
+        f"{skill_tags_html(parsed_data.get('skills'), 'No general skills found')}"
+        f"<div style='margin-top: 1rem;'><strong>Years of Experience:</strong> {_text(parsed_data.get('years_of_experience'), 'Not specified')}</div>"
+        "</div>"
+    )
+
+
+# Function to build the education card, with certifications if any
+def education_card_html(parsed_data):
+    entries = "".join(
+        "<div style='margin-bottom: 1rem;'>"
+        f"<div style='font-weight: 600;'>{_text(edu.get('degree'), 'Degree')}</div>"
+        f"<div>{_text(edu.get('institution'), 'Institution')}</div>"
+        f"<div style='color: #94A3B8; font-size: 0.9rem;'>{_text(edu.get('year'), 'Year not specified')}</div>"
+        "</div>"
+        for edu in parsed_data.get("education") or []
+    )
+    certifications = ""
+    if parsed_data.get("certifications"):
+        certifications = (
+            "<hr style='margin: 1rem 0'>"
+            "<strong>Certifications</strong>"
+            + "".join(f"<div>• {_text(cert)}</div>" for cert in parsed_data.get("certifications"))
+        )
+    return f"<div class='card'><strong>Education</strong>{entries}{certifications}</div>"
+
+
+# Function to build one stats metric card; value None renders a dimmed "-"
+def metric_card_html(value, label):
+    if value is None:
+        return (
+            "<div class='metric-card' style='opacity: 0.5'>"
+            "<div class='metric-value'>-</div>"
+            f"<div class='metric-label'>{_text(label)}</div>"
+            "</div>"
+        )
+    return (
+        "<div class='metric-card'>"
+        f"<div class='metric-value'>{_text(value)}</div>"
+        f"<div class='metric-label'>{_text(label)}</div>"
+        "</div>"
+    )
+
+
+# Function to lay several metric cards out side by side in one fragment
+def metric_row_html(metrics):
+    cards = "".join(f"<div style='flex: 1;'>{metric_card_html(value, label)}</div>" for value, label in metrics)
+    return f"<div class='card' style='display: flex; gap: 0.75rem;'>{cards}</div>"
@@ -0,0 +1,70 @@
+import html
+import threading
+from collections import OrderedDict
+
+PAGE_SIZES = [10, 25, 50]
+DEFAULT_MAX_CACHED_CARDS = 20000
+
+
+# Function to work out which slice of the results a page shows.
+# Returns (start, end, page, page_count) with page clamped into range.
+def paginate(total, page, page_size):
+    page_count = max(1, -(-total // page_size))
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page, page_count
+
+
+# Function to pick the CSS class for a match percentage
+def match_class(match_percentage):
+    if match_percentage > 70:
+        return "match-high"
+    elif match_percentage > 40:
+        return "match-medium"
+    return "match-low"
+
+
+def _text(job, key, default):
+    return html.escape(str(job.get(key) or default))
+
+
+# Function to build the HTML for one job card header
+def render_job_card_html(job, match_percentage=None):
+    title = f"<div class='job-title'>{_text(job, 'job_title', 'Job Title Not Available')}</div>"
+    if match_percentage is not None:
+        title = (
+            "<div style='display: flex; align-items: center;'>"
+            f"{title}"
+            "<div style='margin-left: 0.75rem; padding: 0.2rem 0.5rem; border-radius: 4px; font-size: 0.8rem;' "
+            f"class='{match_class(match_percentage)}'>{match_percentage}% Match</div>"
+            "</div>"
+        )
+    return (
+        "<div class='card job-card'>"
+        f"{title}"
+        f"<div class='job-company'>{_text(job, 'employer_name', 'Company Not Available')}</div>"
+        "</div>"
+    )
+
+
+_card_cache = OrderedDict()
+_card_cache_lock = threading.Lock()
+
+
+# Function to get a job card's HTML, rendered once per job_id + match score
+def job_card_html(job, match_percentage=None):
+    job_id = job.get('job_id')
+    if job_id is None:
+        return render_job_card_html(job, match_percentage)
+    key = (job_id, match_percentage)
+    with _card_cache_lock:
+        card = _card_cache.get(key)
+        if card is not None:
+            _card_cache.move_to_end(key)
+            return card
+    card = render_job_card_html(job, match_percentage)
+    with _card_cache_lock:
+        _card_cache[key] = card
+        while len(_card_cache) > DEFAULT_MAX_CACHED_CARDS:
+            _card_cache.popitem(last=False)
+    return card
@@ -0,0 +1,187 @@
+import math
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+import numpy as np
+
+from job_records import JobRecord
+
+SECONDS_PER_DAY = 60 * 60 * 24
+
+# Sidebar filter values, read from session state once per rerun
+FilterState = namedtuple("FilterState", [
+    "remote_only",
+    "employment_types",
+    "date_posted_days",
+    "min_salary",
+    "max_salary",
+    "company_types",
+])
+
+
+# Function to read the sidebar filters out of st.session_state
+def filter_state_from_session(session_state):
+    return FilterState(
+        remote_only=bool(session_state.get('filter_remote_only', False)),
+        employment_types=tuple(session_state.get('filter_employment_types') or ()),
+        date_posted_days=session_state.get('filter_date_posted', 0) or 0,
+        min_salary=session_state.get('min_salary', 0),
+        max_salary=session_state.get('max_salary', 1000000),
+        company_types=tuple(session_state.get('filter_company_types') or ()),
+    )
+
+
+def _to_float(value, missing):
+    if value is None:
+        return missing
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return missing
+
+
+# Function to read one field of every job. JobRecords are read by
+# attribute, which is much faster than their dict-style get().
+def _column(jobs, field):
+    if jobs and isinstance(jobs[0], JobRecord):
+        return map(attrgetter(field), jobs)
+    return (job.get(field) for job in jobs)
+
+
+# Function to dictionary-encode a categorical field into integer codes
+def _encode(values):
+    vocab = {}
+    codes = np.fromiter((vocab.setdefault(value, len(vocab)) for value in values), dtype=np.int32)
+    return vocab, codes
+
+
+# Columnar view of a search result set. Built once per result set, after
+# which every filter combination is evaluated as a handful of vectorized
+# comparisons instead of a Python loop over the job dicts.
+class JobColumns:
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.size = len(jobs)
+        self.remote = np.fromiter(map(bool, _column(jobs, 'job_is_remote')), dtype=bool, count=self.size)
+        self.employment_vocab, self.employment_codes = _encode(_column(jobs, 'job_employment_type'))
+        self.company_vocab, self.company_codes = _encode(_column(jobs, 'employer_company_type'))
+        self.posted_at = np.fromiter(
+            (_to_float(value, 0.0) for value in _column(jobs, 'job_posted_at_timestamp')), dtype=np.float64, count=self.size)
+        # Missing salaries are NaN, which never fails a salary bound
+        self.min_salary = np.fromiter(
+            (_to_float(value, math.nan) for value in _column(jobs, 'job_min_salary')), dtype=np.float64, count=self.size)
+        self.max_salary = np.fromiter(
+            (_to_float(value, math.nan) for value in _column(jobs, 'job_max_salary')), dtype=np.float64, count=self.size)
+
+    # True if these columns were built from exactly this job list
+    def covers(self, jobs):
+        return self.jobs is jobs and self.size == len(jobs)
+
+    def _in_codes(self, vocab, codes, selected):
+        wanted = [vocab[value] for value in selected if value in vocab]
+        return np.isin(codes, wanted)
+
+    # Per-filter masks; None means the filter is off and keeps every job
+    def remote_mask(self, remote_only):
+        return self.remote if remote_only else None
+
+    def employment_mask(self, employment_types):
+        if not employment_types:
+            return None
+        return self._in_codes(self.employment_vocab, self.employment_codes, employment_types)
+
+    def date_mask(self, date_posted_days, now=None):
+        if not date_posted_days or date_posted_days <= 0:
+            return None
+        now = int(time.time()) if now is None else now
+        return (now - self.posted_at) / SECONDS_PER_DAY <= date_posted_days
+
+    def salary_mask(self, min_salary, max_salary):
+        with np.errstate(invalid="ignore"):
+            return ~(self.min_salary < min_salary) & ~(self.max_salary > max_salary)
+
+    def company_mask(self, company_types):
+        if not company_types:
+            return None
+        return self._in_codes(self.company_vocab, self.company_codes, company_types)
+
+    def mask(self, filters, now=None):
+        result = np.ones(self.size, dtype=bool)
+        for part in (
+            self.remote_mask(filters.remote_only),
+            self.employment_mask(filters.employment_types),
+            self.date_mask(filters.date_posted_days, now),
+            self.salary_mask(filters.min_salary, filters.max_salary),
+            self.company_mask(filters.company_types),
+        ):
+            if part is not None:
+                result &= part
+        return result
+
+    def select(self, mask):
+        jobs = self.jobs
+        return [jobs[i] for i in np.flatnonzero(mask)]
+
+    def apply(self, filters, now=None):
+        return self.select(self.mask(filters, now))
+
+
+# How long a "posted in the last N days" mask is reused before it is
+# recomputed against the current time
+DATE_MASK_TTL_SECONDS = 60
+
+
+# Incremental filtering over JobColumns. Each predicate's mask is cached
+# under the value of the filter that drives it, so when one sidebar control
+# changes only that predicate is recomputed before the masks are intersected.
+class IncrementalFilter:
+    def __init__(self, columns):
+        self.columns = columns
+        self._masks = {}
+        self._combined = None
+        self.stats = {"recomputed": 0, "reused": 0}
+
+    def _predicate(self, name, key, compute):
+        cached = self._masks.get(name)
+        if cached is not None and cached[0] == key:
+            self.stats["reused"] += 1
+            return cached[1]
+        mask = compute()
+        self._masks[name] = (key, mask)
+        self.stats["recomputed"] += 1
+        return mask
+
+    def mask(self, filters, now=None):
+        columns = self.columns
+        now = int(time.time()) if now is None else now
+        date_key = (filters.date_posted_days, now // DATE_MASK_TTL_SECONDS if filters.date_posted_days else None)
+        parts = (
+            self._predicate("remote", filters.remote_only,
+                            lambda: columns.remote_mask(filters.remote_only)),
+            self._predicate("employment", frozenset(filters.employment_types),
+                            lambda: columns.employment_mask(filters.employment_types)),
+            self._predicate("date", date_key,
+                            lambda: columns.date_mask(filters.date_posted_days, now)),
+            self._predicate("salary", (filters.min_salary, filters.max_salary),
+                            lambda: columns.salary_mask(filters.min_salary, filters.max_salary)),
+            self._predicate("company", frozenset(filters.company_types),
+                            lambda: columns.company_mask(filters.company_types)),
+        )
+        # Nothing changed since the last call, reuse the intersection too
+        if self._combined is not None and all(a is b for a, b in zip(self._combined[0], parts)):
+            return self._combined[1]
+        result = np.ones(columns.size, dtype=bool)
+        for part in parts:
+            if part is not None:
+                result &= part
+        self._combined = (parts, result, None)
+        return result
+
+    def apply(self, filters, now=None):
+        self.mask(filters, now)
+        parts, combined, selected = self._combined
+        if selected is None:
+            selected = self.columns.select(combined)
+            self._combined = (parts, combined, selected)
+        return list(selected)
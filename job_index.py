@@ -0,0 +1,358 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+import perf
+from search_cache import normalize_search
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "job_index")
+# Save a new on-disk segment once this many postings changed in memory
+DEFAULT_SAVE_EVERY = 200
+
+# Searches with fewer local hits than this are cold and go upstream
+LOCAL_MIN_RESULTS = 10
+RESULTS_PER_PAGE = 10
+
+# BM25 parameters, and how many times a token counts per field
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = (("job_title", 3), ("employer_name", 2), ("job_description", 1))
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to we will with you your".split())
+
+
+# Function to split text into lowercase index terms
+def tokenize(text):
+    return [token for token in _TOKEN.findall(str(text or "").lower()) if token not in STOPWORDS]
+
+
+def _location_terms(job):
+    text = " ".join(str(job.get(key) or "") for key in ("job_city", "job_state", "job_country", "job_location"))
+    terms = {"loc:" + token for token in tokenize(text)}
+    if job.get("job_is_remote"):
+        terms.add("loc:remote")
+    return terms
+
+
+def _job_terms(job):
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(job.get(field)):
+            counts[token] += weight
+    counts.update(_location_terms(job))
+    return counts
+
+
+# Function to get (docs, tfs) arrays for a term across an on-disk segment
+# (terms -> spans into docs / tfs) and an in-memory one (term -> {doc: tf}),
+# live documents only
+def _merged_postings(term, live, disk_terms, disk_docs, disk_tfs, memory_terms):
+    parts_docs, parts_tfs = [], []
+    span = disk_terms.get(term)
+    if span is not None:
+        docs = np.asarray(disk_docs[span[0]:span[1]])
+        keep = live[docs]
+        parts_docs.append(docs[keep])
+        parts_tfs.append(np.asarray(disk_tfs[span[0]:span[1]])[keep].astype(np.float64))
+    memory = memory_terms.get(term)
+    if memory:
+        parts_docs.append(np.fromiter(memory.keys(), dtype=np.int32, count=len(memory)))
+        parts_tfs.append(np.fromiter(memory.values(), dtype=np.float64, count=len(memory)))
+    if not parts_docs:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64)
+    return np.concatenate(parts_docs), np.concatenate(parts_tfs)
+
+
+# Inverted index over job postings with BM25 ranking. Postings live in an
+# immutable on-disk segment, loaded with mmap, plus an in-memory segment
+# for postings added since it was written; removed or replaced postings
+# are masked out until the next save merges both into a new segment.
+# Saves write from a snapshot, so searches and adds carry on meanwhile.
+class JobIndex:
+    def __init__(self, index_dir=None, save_every=DEFAULT_SAVE_EVERY):
+        self.index_dir = index_dir or None
+        self.save_every = save_every
+        self._lock = threading.RLock()
+        # Held for the whole of a save, so only one runs at a time
+        self._save_lock = threading.Lock()
+        self._saving = False
+        self._reset()
+        if self.index_dir:
+            self._load()
+
+    def _reset(self):
+        # Segment on disk: term -> (start, end) into the mmapped arrays
+        self._disk_terms = {}
+        self._disk_docs = np.zeros(0, dtype=np.int32)
+        self._disk_tfs = np.zeros(0, dtype=np.uint16)
+        # Per document (disk documents first, then memory ones)
+        self._doc_ids = []
+        self._doc_lens = []
+        self._live = []
+        self._doc_of = {}
+        # Segment in memory: term -> {doc: tf}, plus each doc's terms
+        self._memory_terms = {}
+        self._memory_doc_terms = {}
+        self._changes = 0
+        self._segment = None
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    def __contains__(self, job_id):
+        return job_id in self._doc_of
+
+    def job_ids(self):
+        with self._lock:
+            return list(self._doc_of)
+
+    # Function to load the given segment, or the one CURRENT points to
+    def _load(self, segment=None):
+        if segment is None:
+            pointer = os.path.join(self.index_dir, "CURRENT")
+            if not os.path.exists(pointer):
+                return
+            with open(pointer) as f:
+                segment = f.read().strip()
+        self._remove_old_segments(segment)
+        path = os.path.join(self.index_dir, segment)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            docs = np.load(os.path.join(path, "docs.npy"), mmap_mode="r")
+            tfs = np.load(os.path.join(path, "tfs.npy"), mmap_mode="r")
+            doc_lens = np.load(os.path.join(path, "doc_lens.npy"))
+        except (OSError, ValueError):
+            return
+        self._disk_terms = {term: tuple(span) for term, span in meta["terms"].items()}
+        self._disk_docs, self._disk_tfs = docs, tfs
+        self._doc_ids = list(meta["doc_ids"])
+        self._doc_lens = doc_lens.tolist()
+        self._live = [True] * len(self._doc_ids)
+        self._doc_of = {job_id: doc for doc, job_id in enumerate(self._doc_ids)}
+        self._segment = segment
+
+    # Function to delete segments replaced by a save. A segment still mapped
+    # can't be deleted on Windows; it is tried again on the next load.
+    def _remove_old_segments(self, current):
+        for name in os.listdir(self.index_dir):
+            if name.startswith("segment-") and name != current:
+                try:
+                    shutil.rmtree(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+
+    def add(self, jobs):
+        with self._lock:
+            for job in jobs:
+                job_id = job.get("job_id")
+                if job_id is None:
+                    continue
+                self._remove(job_id)
+                terms = _job_terms(job)
+                doc = len(self._doc_ids)
+                self._doc_ids.append(job_id)
+                self._doc_lens.append(sum(count for term, count in terms.items() if not term.startswith("loc:")))
+                self._live.append(True)
+                self._doc_of[job_id] = doc
+                self._memory_doc_terms[doc] = list(terms)
+                for term, tf in terms.items():
+                    self._memory_terms.setdefault(term, {})[doc] = tf
+                self._changes += 1
+
+    def _remove(self, job_id):
+        doc = self._doc_of.pop(job_id, None)
+        if doc is None:
+            return
+        self._live[doc] = False
+        for term in self._memory_doc_terms.pop(doc, ()):
+            postings = self._memory_terms[term]
+            postings.pop(doc, None)
+            if not postings:
+                del self._memory_terms[term]
+        self._changes += 1
+
+    def remove(self, job_ids):
+        with self._lock:
+            for job_id in job_ids:
+                self._remove(job_id)
+
+    def _postings(self, term, live):
+        return _merged_postings(term, live, self._disk_terms, self._disk_docs, self._disk_tfs, self._memory_terms)
+
+    # Returns [(job_id, score)] best first. Every query term must match
+    # (AND), and every location term when a location is given.
+    @perf.timed("local_index_search")
+    def search(self, query, location="", limit=10):
+        query, location = normalize_search(query, location)
+        terms = list(dict.fromkeys(tokenize(query)))
+        location_terms = ["loc:" + token for token in dict.fromkeys(tokenize(location))]
+        if not terms:
+            return []
+        with self._lock:
+            live = np.array(self._live, dtype=bool)
+            live_count = len(self._doc_of)
+            if not live_count:
+                return []
+            doc_lens = np.array(self._doc_lens, dtype=np.float64)
+            avg_len = doc_lens[live].mean() or 1.0
+            scores = np.zeros(len(live), dtype=np.float64)
+            matched = np.zeros(len(live), dtype=np.int32)
+            for term in terms:
+                docs, tfs = self._postings(term, live)
+                if not len(docs):
+                    return []
+                idf = np.log(1 + (live_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = tfs + K1 * (1 - B + B * doc_lens[docs] / avg_len)
+                np.add.at(scores, docs, idf * tfs * (K1 + 1) / norm)
+                np.add.at(matched, docs, 1)
+            required = len(terms)
+            for term in location_terms:
+                docs, _ = self._postings(term, live)
+                np.add.at(matched, docs, 1)
+            required += len(location_terms)
+            candidates = np.flatnonzero(matched == required)
+            if not len(candidates):
+                return []
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self._doc_ids[doc], float(scores[doc])) for doc in candidates]
+
+    # Function to write both segments, minus removed postings, as a new
+    # on-disk segment and switch to it. Only taking the snapshot and the
+    # switch hold the index lock; postings added or removed while the
+    # segment is written are carried over to it.
+    def save(self):
+        if not self.index_dir:
+            return
+        with self._save_lock:
+            with self._lock:
+                count = len(self._doc_ids)
+                live = np.array(self._live, dtype=bool)
+                disk = (self._disk_terms, self._disk_docs, self._disk_tfs)
+                memory_terms = {term: dict(postings) for term, postings in self._memory_terms.items()}
+                doc_ids = self._doc_ids[:count]
+                doc_lens = self._doc_lens[:count]
+                changes = self._changes
+            segment = self._write_segment(live, disk, memory_terms, doc_ids, doc_lens)
+            with self._lock:
+                self._switch(segment, count, live, changes)
+
+    def _write_segment(self, live, disk, memory_terms, doc_ids, doc_lens):
+        keep = np.flatnonzero(live)
+        renumber = np.full(len(doc_ids), -1, dtype=np.int32)
+        renumber[keep] = np.arange(len(keep), dtype=np.int32)
+        terms = {}
+        docs_parts, tfs_parts = [], []
+        offset = 0
+        for term in sorted(set(disk[0]) | set(memory_terms)):
+            docs, tfs = _merged_postings(term, live, *disk, memory_terms)
+            if not len(docs):
+                continue
+            order = np.argsort(renumber[docs], kind="stable")
+            docs_parts.append(renumber[docs][order])
+            tfs_parts.append(np.minimum(tfs[order], np.iinfo(np.uint16).max).astype(np.uint16))
+            terms[term] = (offset, offset + len(docs))
+            offset += len(docs)
+        docs = np.concatenate(docs_parts) if docs_parts else np.zeros(0, dtype=np.int32)
+        tfs = np.concatenate(tfs_parts) if tfs_parts else np.zeros(0, dtype=np.uint16)
+
+        segment = f"segment-{time.time_ns()}"
+        path = os.path.join(self.index_dir, segment)
+        os.makedirs(path)
+        np.save(os.path.join(path, "docs.npy"), docs)
+        np.save(os.path.join(path, "tfs.npy"), tfs)
+        np.save(os.path.join(path, "doc_lens.npy"), np.array([doc_lens[doc] for doc in keep], dtype=np.float32))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"doc_ids": [doc_ids[doc] for doc in keep], "terms": terms}, f, separators=(",", ":"))
+        tmp = os.path.join(self.index_dir, "CURRENT.tmp")
+        with open(tmp, "w") as f:
+            f.write(segment)
+        os.replace(tmp, os.path.join(self.index_dir, "CURRENT"))
+        return segment
+
+    # Function to switch to a segment written from the first `count` docs,
+    # then redo what changed since: saved postings removed meanwhile are
+    # masked out and postings added meanwhile go back into memory
+    def _switch(self, segment, count, saved_live, saved_changes):
+        doc_ids, doc_lens, live = self._doc_ids, self._doc_lens, self._live
+        memory_terms, memory_doc_terms = self._memory_terms, self._memory_doc_terms
+        changes = self._changes - saved_changes
+        self._reset()
+        self._load(segment)
+        for doc, old_doc in enumerate(np.flatnonzero(saved_live)):
+            if not live[old_doc]:
+                self._live[doc] = False
+                del self._doc_of[doc_ids[old_doc]]
+        for old_doc in range(count, len(doc_ids)):
+            if not live[old_doc]:
+                continue
+            doc = len(self._doc_ids)
+            self._doc_ids.append(doc_ids[old_doc])
+            self._doc_lens.append(doc_lens[old_doc])
+            self._live.append(True)
+            self._doc_of[doc_ids[old_doc]] = doc
+            self._memory_doc_terms[doc] = memory_doc_terms[old_doc]
+            for term in memory_doc_terms[old_doc]:
+                self._memory_terms.setdefault(term, {})[doc] = memory_terms[term][old_doc]
+        self._changes = changes
+
+    # Function to start a save on a background thread once enough postings
+    # changed, so the rerun that crosses the threshold doesn't wait for it
+    def maybe_save(self):
+        with self._lock:
+            if not self.index_dir or self._saving or self._changes < self.save_every:
+                return
+            self._saving = True
+        threading.Thread(target=self._save_in_background, name="job-index-save", daemon=True).start()
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "postings": len(self._doc_of),
+                "disk_terms": len(self._disk_terms),
+                "memory_terms": len(self._memory_terms),
+                "unsaved_changes": self._changes,
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# Function to get the process-wide job index, kept in step with the job
+# store: postings missing from the index are added, expired ones removed
+def get_job_index(job_store=None):
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobIndex(
+                index_dir=os.getenv("JOB_INDEX_DIR", DEFAULT_INDEX_DIR),
+                save_every=int(os.getenv("JOB_INDEX_SAVE_EVERY", DEFAULT_SAVE_EVERY)),
+            )
+            if job_store is not None:
+                stored = set(job_store.job_ids())
+                _index.remove([job_id for job_id in _index.job_ids() if job_id not in stored])
+                missing = [job_id for job_id in stored if job_id not in _index]
+                for start in range(0, len(missing), 500):
+                    _index.add(job_store.get_jobs(missing[start:start + 500]))
+                _index.maybe_save()
+                job_store.attach_index(_index)
+            perf.register_collector("job_index", _index.stats)
+        return _index
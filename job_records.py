@@ -0,0 +1,275 @@
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+import perf
+
+# Size caps of the job records kept for later searches and of the
+# descriptions they point to
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DESCRIPTION_BYTES = 256 * 1024 * 1024
+
+# Fields of a JSearch posting the app shows, filters or matches on. The
+# rest of the response (highlights, publisher metadata, ...) is dropped.
+JOB_FIELDS = (
+    "job_id",
+    "job_title",
+    "employer_name",
+    "employer_company_type",
+    "job_employment_type",
+    "job_is_remote",
+    "job_posted_at_timestamp",
+    "job_posted_at_datetime_utc",
+    "job_city",
+    "job_country",
+    "job_min_salary",
+    "job_max_salary",
+    "job_salary_currency",
+    "job_apply_link",
+)
+# Short categorical values repeated across postings, interned so every
+# record shares one copy
+_INTERNED_FIELDS = ("employer_name", "employer_company_type", "job_employment_type",
+                    "job_city", "job_country", "job_salary_currency")
+# Fields whose values belong to a single record, counted in its size
+_OWN_FIELDS = ("job_id", "job_title", "job_posted_at_datetime_utc", "job_apply_link", "description_key")
+
+# One job's match against the session's resume. Kept apart from the job
+# records, which are shared between sessions and never modified.
+JobMatch = namedtuple("JobMatch", ["match_percentage", "matched_skills", "semantic_score", "match_score"])
+
+
+def description_key(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Process-wide store of job descriptions, keyed by content so a description
+# is held once however many postings and sessions share it. LRU-bounded by
+# size whoever holds the records; evicted descriptions are reloaded from
+# the job store if there is one.
+class DescriptionStore:
+    def __init__(self, max_bytes=DEFAULT_MAX_DESCRIPTION_BYTES, job_store=None):
+        self.max_bytes = max_bytes
+        self.job_store = job_store
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "shared": 0, "reloaded": 0, "evictions": 0}
+
+    # Function to reload evicted descriptions from job_store from now on.
+    # The store is usually created by the first JobRecord, before the job
+    # store is known.
+    def attach_job_store(self, job_store):
+        self.job_store = job_store
+
+    # Function to add a description. Returns its key, or None for no text.
+    def put(self, text):
+        if not text:
+            return None
+        key = description_key(text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["shared"] += 1
+                return key
+            self._entries[key] = text
+            self._bytes += sys.getsizeof(text)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, oldest = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(oldest)
+                self._stats["evictions"] += 1
+        return key
+
+    def get(self, key, job_id=None):
+        if key is None:
+            return None
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return text
+            self._stats["misses"] += 1
+        if self.job_store is None or job_id is None:
+            return None
+        stored = self.job_store.get_jobs([job_id])
+        text = stored[0].get("job_description") if stored else None
+        if text and description_key(text) == key:
+            self.put(text)
+            with self._lock:
+                self._stats["reloaded"] += 1
+            return text
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, descriptions=len(self._entries), bytes=self._bytes)
+
+
+_descriptions = None
+_descriptions_lock = threading.Lock()
+
+
+# Function to get the process-wide description store. A job store passed
+# in is attached so evicted descriptions can be reloaded from it.
+def get_description_store(job_store=None):
+    global _descriptions
+    with _descriptions_lock:
+        if _descriptions is None:
+            _descriptions = DescriptionStore(
+                max_bytes=int(os.getenv("JOB_DESCRIPTIONS_MAX_BYTES", DEFAULT_MAX_DESCRIPTION_BYTES)),
+            )
+            perf.register_collector("job_descriptions", _descriptions.stats)
+        if job_store is not None:
+            _descriptions.attach_job_store(job_store)
+        return _descriptions
+
+
+# Compact, read-only view of a posting holding only JOB_FIELDS, with apply
+# options reduced to (publisher, link) pairs and the description left in
+# the DescriptionStore until something reads it. Records with a job_id are
+# shared by every session through the PostingStore.
+class JobRecord:
+    __slots__ = JOB_FIELDS + ("apply_options", "description_key", "__weakref__")
+    _fields = frozenset(JOB_FIELDS + ("apply_options", "description_key"))
+
+    def __init__(self, job):
+        for field in JOB_FIELDS:
+            setattr(self, field, job.get(field))
+        for field in _INTERNED_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, str):
+                setattr(self, field, sys.intern(value))
+        self.apply_options = tuple(
+            (option.get("publisher"), option.get("apply_link"))
+            for option in job.get("apply_options") or () if isinstance(option, dict)
+        )
+        self.description_key = get_description_store().put(job.get("job_description"))
+
+    @property
+    def description(self):
+        return get_description_store().get(self.description_key, self.job_id)
+
+    # Dict-style access for code written against raw postings. Missing and
+    # None values both give the default.
+    def get(self, key, default=None):
+        if key == "job_description":
+            value = self.description
+        elif key in self._fields:
+            value = getattr(self, key)
+        else:
+            value = None
+        return default if value is None else value
+
+
+# Function to estimate the memory a record holds on its own, its
+# description aside
+def record_bytes(record):
+    size = sys.getsizeof(record) + sys.getsizeof(record.apply_options)
+    for field in _OWN_FIELDS:
+        value = getattr(record, field)
+        if isinstance(value, str):
+            size += sys.getsizeof(value)
+    for option in record.apply_options:
+        size += sum(sys.getsizeof(value) for value in option if isinstance(value, str))
+    return size
+
+
+# Process-wide JobRecords keyed by job_id, so sessions with overlapping
+# results hold references to one copy of each posting. Every record alive
+# is found through a weak reference, so it stays shared for as long as any
+# session holds it. The most recently searched records are also held by an
+# LRU, trimmed by its own size to max_bytes, so later searches find them
+# after the sessions that fetched them are gone. Dropping a record from the
+# LRU while a session still holds it frees nothing until the session lets
+# go of it, but never loses it: it is still found through the weak map.
+class PostingStore:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._live = weakref.WeakValueDictionary()
+        # job_id -> (record, size), least recently used first
+        self._recent = OrderedDict()
+        self._recent_bytes = 0
+        self._bytes = 0
+        # Re-entrant: dropping a record from the LRU can free it and run its
+        # finalizer while this thread holds the lock
+        self._lock = threading.RLock()
+        self._stats = {"shared": 0, "created": 0, "freed": 0, "evictions": 0}
+
+    def _freed(self, size):
+        with self._lock:
+            self._bytes -= size
+            self._stats["freed"] += 1
+
+    def _touch(self, job_id, record, size=None):
+        entry = self._recent.get(job_id)
+        if entry is not None:
+            self._recent.move_to_end(job_id)
+            return
+        size = record_bytes(record) if size is None else size
+        self._recent[job_id] = (record, size)
+        self._recent_bytes += size
+        self._evict()
+
+    # Function to get the shared record for a posting. A record still alive
+    # for its job_id is reused as is; postings without one aren't shared.
+    def get_record(self, job):
+        job_id = job.get("job_id")
+        if job_id is None:
+            return JobRecord(job)
+        with self._lock:
+            record = self._live.get(job_id)
+            if record is not None:
+                self._stats["shared"] += 1
+                self._touch(job_id, record)
+                return record
+        record = JobRecord(job)
+        size = record_bytes(record)
+        with self._lock:
+            existing = self._live.get(job_id)
+            if existing is not None:
+                self._stats["shared"] += 1
+                self._touch(job_id, existing)
+                return existing
+            self._live[job_id] = record
+            weakref.finalize(record, self._freed, size)
+            self._bytes += size
+            self._stats["created"] += 1
+            self._touch(job_id, record, size)
+        return record
+
+    # Drop the least recently used records from the LRU until it fits
+    def _evict(self):
+        while self._recent_bytes > self.max_bytes and len(self._recent) > 1:
+            _, (_, size) = self._recent.popitem(last=False)
+            self._recent_bytes -= size
+            self._stats["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, live=len(self._live), recent=len(self._recent),
+                        recent_bytes=self._recent_bytes, bytes=self._bytes)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# Function to get the process-wide posting store
+def get_posting_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PostingStore(max_bytes=int(os.getenv("JOB_POSTINGS_MAX_BYTES", DEFAULT_MAX_BYTES)))
+            perf.register_collector("job_postings", _store.stats)
+        return _store
+
+
+# Function to get the shared JobRecord for each raw posting, storing their
+# descriptions
+def compact_jobs(jobs):
+    store = get_posting_store()
+    return [job if isinstance(job, JobRecord) else store.get_record(job) for job in jobs]
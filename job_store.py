@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import perf
+from job_records import get_description_store
+from search_cache import normalize_search
+
+DEFAULT_PATH = os.path.join(".cache", "jobs.sqlite3")
+# A stored search page is served locally for this long before it is refetched
+DEFAULT_MAX_AGE_SECONDS = 6 * 60 * 60
+# Postings not seen in any search for this long are deleted
+DEFAULT_RETENTION_SECONDS = 30 * 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (query, location, page)
+);
+CREATE TABLE IF NOT EXISTS search_results (
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    PRIMARY KEY (query, location, page, position)
+);
+"""
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _normalize(value):
+    return _NON_WORD.sub(" ", str(value or "").lower()).strip()
+
+
+# Function to build the key that identifies the same posting listed under
+# different job_ids (e.g. reposted or syndicated to several boards). Sparse
+# postings without both a title and an employer get None and are only
+# deduplicated by job_id, so they don't all collapse into one row.
+def dedupe_key(job):
+    title, employer = _normalize(job.get("job_title")), _normalize(job.get("employer_name"))
+    if not title or not employer:
+        return None
+    location = job.get("job_location") or ", ".join(
+        part for part in (job.get("job_city"), job.get("job_state"), job.get("job_country")) if part)
+    return "|".join((title, employer, _normalize(location)))
+
+
+# Embedded SQLite store of job postings shared by every session. Postings
+# are deduplicated by job_id and by normalized title + employer + location,
+# and each search page remembers which postings it returned so repeated
+# searches are answered locally until the page is older than max_age.
+class JobStore:
+    def __init__(self, path=DEFAULT_PATH, max_age_seconds=DEFAULT_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"local_pages": 0, "upstream_pages": 0, "inserted": 0, "updated": 0, "merged": 0}
+        self._indexes = []
+        # An in-memory database is private to its connection, so share one
+        self._shared = sqlite3.connect(path, check_same_thread=False) if path == ":memory:" else None
+        with self._write_lock:
+            self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Function to keep an index (anything with add(jobs) / remove(job_ids))
+    # in step with the postings fetched into and pruned from the store
+    def attach_index(self, index):
+        self._indexes.append(index)
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    # Function to add or refresh postings. Returns the stored job_id of each
+    # posting, which differs from its own when it duplicates an earlier one.
+    def ingest(self, jobs, now=None):
+        now = time.time() if now is None else now
+        job_ids = []
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                for job in jobs:
+                    key = dedupe_key(job)
+                    job_id = job.get("job_id") or key or hashlib.sha1(
+                        json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()
+                    # The column is unique, so postings without a key get one
+                    # of their own that no normalized key can equal
+                    key = key or f"#{job_id}"
+                    row = conn.execute(
+                        "SELECT job_id FROM jobs WHERE job_id = ? OR dedupe_key = ? "
+                        "ORDER BY job_id = ? DESC LIMIT 1", (job_id, key, job_id)).fetchone()
+                    if row is None:
+                        conn.execute(
+                            "INSERT INTO jobs (data, last_seen, job_id, dedupe_key, first_seen) VALUES (?, ?, ?, ?, ?)",
+                            (json.dumps(job), now, job_id, key, now))
+                        self._count("inserted")
+                    elif row[0] == job_id:
+                        conn.execute("UPDATE jobs SET data = ?, last_seen = ? WHERE job_id = ?",
+                                     (json.dumps(job), now, job_id))
+                        self._count("updated")
+                    else:
+                        # Same posting under another job_id: keep the first copy
+                        job_id = row[0]
+                        conn.execute("UPDATE jobs SET last_seen = ? WHERE job_id = ?", (now, job_id))
+                        self._count("merged")
+                    job_ids.append(job_id)
+        return job_ids
+
+    def job_ids(self):
+        return [job_id for (job_id,) in self._conn().execute("SELECT job_id FROM jobs")]
+
+    def get_jobs(self, job_ids):
+        if not job_ids:
+            return []
+        found = {}
+        conn = self._conn()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for job_id, data in conn.execute(
+                    f"SELECT job_id, data FROM jobs WHERE job_id IN ({placeholders})", chunk):
+                found[job_id] = data
+        return [json.loads(found[job_id]) for job_id in job_ids if job_id in found]
+
+    # Function to get a stored search page, or None if it is missing or stale
+    def cached_page(self, query, location, page, now=None):
+        now = time.time() if now is None else now
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT fetched_at FROM searches WHERE query = ? AND location = ? AND page = ?",
+            (query, location, page)).fetchone()
+        if row is None or now - row[0] > self.max_age_seconds:
+            return None
+        job_ids = [job_id for (job_id,) in conn.execute(
+            "SELECT job_id FROM search_results WHERE query = ? AND location = ? AND page = ? ORDER BY position",
+            (query, location, page))]
+        return self.get_jobs(job_ids)
+
+    def store_page(self, query, location, page, jobs, now=None):
+        now = time.time() if now is None else now
+        job_ids = list(dict.fromkeys(self.ingest(jobs, now)))
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute("DELETE FROM search_results WHERE query = ? AND location = ? AND page = ?",
+                             (query, location, page))
+                conn.executemany(
+                    "INSERT INTO search_results (query, location, page, position, job_id) VALUES (?, ?, ?, ?, ?)",
+                    [(query, location, page, position, job_id) for position, job_id in enumerate(job_ids)])
+                conn.execute(
+                    "INSERT OR REPLACE INTO searches (query, location, page, fetched_at) VALUES (?, ?, ?, ?)",
+                    (query, location, page, now))
+        stored = self.get_jobs(job_ids)
+        for index in self._indexes:
+            index.add(stored)
+        return stored
+
+    # Drop-in backend for jsearch_client.search_jobs(query, location, page):
+    # answers from the store while the page is fresh and only goes
+    # upstream (through `fetch`) for pages never fetched or gone stale
+    def search_page(self, query, location="", page=1, fetch=None):
+        query, location = normalize_search(query, location)
+        jobs = self.cached_page(query, location, page)
+        if jobs is not None:
+            self._count("local_pages")
+            return {"status": "OK", "data": jobs}
+        if fetch is None:
+            from jsearch_client import search_jobs as fetch
+        data = fetch(query, location, page)
+        self._count("upstream_pages")
+        return {"status": data.get("status", "OK"), "data": self.store_page(query, location, page, data.get("data", []))}
+
+    # Function to delete postings (and search pages) not seen recently
+    def prune(self, retention_seconds=DEFAULT_RETENTION_SECONDS, now=None):
+        cutoff = (time.time() if now is None else now) - retention_seconds
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                deleted = [job_id for (job_id,) in conn.execute("SELECT job_id FROM jobs WHERE last_seen < ?", (cutoff,))]
+                conn.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,))
+                conn.execute("DELETE FROM searches WHERE fetched_at < ?", (cutoff,))
+                conn.execute(
+                    "DELETE FROM search_results WHERE NOT EXISTS (SELECT 1 FROM searches s WHERE "
+                    "s.query = search_results.query AND s.location = search_results.location "
+                    "AND s.page = search_results.page)")
+        for index in self._indexes:
+            index.remove(deleted)
+        return len(deleted)
+
+    def stats(self):
+        count = self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        with self._stats_lock:
+            return dict(self._stats, jobs=count)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# Function to get the process-wide job store, or None when JOB_STORE_PATH
+# is set to "" to disable it
+def get_job_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.getenv("JOB_STORE_PATH", DEFAULT_PATH)
+            if not path:
+                return None
+            _store = JobStore(path, max_age_seconds=float(os.getenv("JOB_STORE_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS)))
+            _store.prune(float(os.getenv("JOB_STORE_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS)))
+            perf.register_collector("job_store", _store.stats)
+            # Descriptions dropped from memory are reloaded from the store
+            get_description_store(_store)
+        return _store
@@ -0,0 +1,270 @@
+import http.client
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlsplit
+
+import perf
+from search_cache import get_search_cache, normalize_search
+
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+
+# Pool defaults, all overridable through environment variables
+DEFAULT_POOL_SIZE = 16
+DEFAULT_MAX_PER_HOST = 8
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 20.0
+DEFAULT_IDLE_TIMEOUT = 60.0
+DEFAULT_PAGE_WORKERS = 8
+
+# Errors that mean a kept-alive connection was closed by the server while idle
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class JSearchError(Exception):
+    pass
+
+
+# Keep-alive connection pool shared by every client in the process. Idle
+# connections are kept per (scheme, host, port) up to max_size in total,
+# in-flight connections are capped per host and idle ones are reaped after
+# idle_timeout seconds.
+class ConnectionPool:
+    def __init__(self, max_size=DEFAULT_POOL_SIZE, max_per_host=DEFAULT_MAX_PER_HOST,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.max_size = max_size
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._idle_count = 0
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "reused": 0, "reaped": 0, "discarded": 0}
+
+    def _slots(self, key):
+        with self._lock:
+            if key not in self._host_slots:
+                self._host_slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[key]
+
+    def _new_connection(self, scheme, host, port):
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.connect_timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+
+    def _reap(self, now):
+        for key, idle in self._idle.items():
+            while idle and now - idle[0][1] > self.idle_timeout:
+                conn, _ = idle.popleft()
+                conn.close()
+                self._idle_count -= 1
+                self._stats["reaped"] += 1
+
+    # Returns (connection, reused) and blocks while the host is at its limit
+    def acquire(self, scheme, host, port):
+        key = (scheme, host, port)
+        if not self._slots(key).acquire(timeout=self.connect_timeout + self.read_timeout):
+            raise JSearchError(f"Timed out waiting for a connection to {host}")
+        try:
+            with self._lock:
+                self._reap(time.monotonic())
+                idle = self._idle.get(key)
+                if idle:
+                    conn, _ = idle.pop()
+                    self._idle_count -= 1
+                    self._stats["reused"] += 1
+                    return conn, True
+            return self._new_connection(scheme, host, port), False
+        except BaseException:
+            self._slots(key).release()
+            raise
+
+    def release(self, conn, scheme, host, port, reusable=True):
+        key = (scheme, host, port)
+        try:
+            with self._lock:
+                if reusable and self._idle_count < self.max_size:
+                    self._idle.setdefault(key, deque()).append((conn, time.monotonic()))
+                    self._idle_count += 1
+                    return
+                self._stats["discarded"] += 1
+            conn.close()
+        finally:
+            self._slots(key).release()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                while idle:
+                    conn, _ = idle.popleft()
+                    conn.close()
+            self._idle_count = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = self._idle_count
+        return stats
+
+
+# JSearch API client. base_url points it at a local stub server in tests,
+# e.g. JSearchClient(base_url="http://127.0.0.1:8080")
+class JSearchClient:
+    def __init__(self, api_key=None, base_url=None, pool=None):
+        self.api_key = api_key if api_key is not None else os.getenv('RAPIDAPI_KEY')
+        url = urlsplit(base_url or f"https://{JSEARCH_HOST}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.pool = pool or get_connection_pool()
+        self.headers = {
+            'X-RapidAPI-Key': self.api_key or "",
+            'X-RapidAPI-Host': JSEARCH_HOST,
+            'Connection': 'keep-alive',
+        }
+
+    def _get(self, path):
+        # A pooled connection may have been closed server-side while idle,
+        # so retry once on a fresh connection if a reused one fails
+        for attempt in range(2):
+            conn, reused = self.pool.acquire(self.scheme, self.host, self.port)
+            try:
+                conn.request("GET", path, headers=self.headers)
+                res = conn.getresponse()
+                data = res.read()
+            except _STALE_CONNECTION_ERRORS:
+                self.pool.release(conn, self.scheme, self.host, self.port, reusable=False)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                self.pool.release(conn, self.scheme, self.host, self.port, reusable=False)
+                raise
+            self.pool.release(conn, self.scheme, self.host, self.port, reusable=not res.will_close)
+            if res.status >= 400:
+                raise JSearchError(f"JSearch returned HTTP {res.status}: {data[:200].decode('utf-8', 'replace')}")
+            return data
+
+    def search(self, query, location="", page=1, num_pages=1):
+        search_query = query
+        if location:
+            search_query += f" in {location}"
+        path = f"/search?query={quote(search_query)}&page={page}&num_pages={num_pages}"
+        return json.loads(self._get(path).decode("utf-8"))
+
+
+_pool = None
+_client = None
+_page_executor = None
+_singleton_lock = threading.Lock()
+
+
+# Function to get the process-wide connection pool
+def get_connection_pool():
+    global _pool
+    with _singleton_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                max_size=int(os.getenv("JSEARCH_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                max_per_host=int(os.getenv("JSEARCH_MAX_PER_HOST", DEFAULT_MAX_PER_HOST)),
+                connect_timeout=float(os.getenv("JSEARCH_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+                read_timeout=float(os.getenv("JSEARCH_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+                idle_timeout=float(os.getenv("JSEARCH_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)),
+            )
+            perf.register_collector("jsearch_pool", _pool.stats)
+        return _pool
+
+
+# Function to get the process-wide JSearch client
+def get_client():
+    global _client
+    pool = get_connection_pool()
+    with _singleton_lock:
+        if _client is None:
+            _client = JSearchClient(base_url=os.getenv("JSEARCH_BASE_URL"), pool=pool)
+        return _client
+
+
+# Drop-in backend for search_jobs(query, location, page); raises on failure.
+# Searches are normalized and served from the shared result cache, so
+# identical searches from different sessions make one upstream call.
+def search_jobs(query, location="", page=1):
+    query, location = normalize_search(query, location)
+    
+    def fetch():
+        with perf.span("jsearch_request"):
+            data = get_client().search(query, location, page)
+        if data.get("status") == "ERROR":
+            raise JSearchError(f"JSearch returned an error: {data.get('error')}")
+        return data
+    
+    return get_search_cache().get_or_fetch((query, location, page), fetch)
+
+
+# Function to get the process-wide thread pool used for concurrent page fetches
+def get_page_executor():
+    global _page_executor
+    with _singleton_lock:
+        if _page_executor is None:
+            _page_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("JSEARCH_PAGE_WORKERS", DEFAULT_PAGE_WORKERS)),
+                thread_name_prefix="jsearch-page",
+            )
+        return _page_executor
+
+
+# Function to fetch result pages 1..num_pages concurrently. Yields
+# (page, new_jobs) as each page lands, in completion order, with jobs already
+# seen on an earlier page dropped by job_id. Failed pages are passed to
+# on_error(page, exception) if given, otherwise the exception is raised.
+def iter_search_pages(query, location="", num_pages=1, on_error=None, search=None):
+    search = search or search_jobs
+    executor = get_page_executor()
+    futures = {
+        executor.submit(search, query, location, page): page
+        for page in range(1, num_pages + 1)
+    }
+    seen_ids = set()
+    try:
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                jobs = future.result().get("data", [])
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(page, e)
+                continue
+            new_jobs = []
+            for job in jobs:
+                job_id = job.get("job_id")
+                if job_id is not None:
+                    if job_id in seen_ids:
+                        continue
+                    seen_ids.add(job_id)
+                # Responses are shared through the search cache, so hand each
+                # caller its own copy of the job dicts
+                new_jobs.append(dict(job))
+            yield page, new_jobs
+    finally:
+        # Don't leave queued pages running if the caller stops early
+        for future in futures:
+            future.cancel()
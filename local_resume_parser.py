@@ -0,0 +1,262 @@
+import os
+import re
+from datetime import date
+
+from resume_parser import RESUME_SCHEMA, empty_value
+from resume_text_prep import split_sections
+from skill_matcher import get_skill_matcher
+
+# "fast" uses the local parse instead of Gemini when it is confident and as
+# a fallback when Gemini fails, "fallback" only as the fallback, "off" never
+LOCAL_PARSE_MODE = os.getenv("RESUME_LOCAL_PARSE", "fast")
+
+# Parses at or above this confidence skip Gemini entirely
+MIN_CONFIDENCE = float(os.getenv("LOCAL_PARSE_MIN_CONFIDENCE", 0.8))
+# Below this a local parse isn't worth showing even when Gemini fails
+MIN_FALLBACK_CONFIDENCE = 0.3
+
+TECHNICAL_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Golang", "Rust", "Ruby", "PHP",
+    "Kotlin", "Swift", "Scala", "R", "MATLAB", "Perl", "Bash", "Shell", "SQL", "NoSQL", "PL/SQL", "HTML", "CSS",
+    "Sass", "React", "React Native", "Angular", "Vue", "Vue.js", "Next.js", "Node.js", "Express", "Django",
+    "Flask", "FastAPI", "Spring", "Spring Boot", "Rails", "Ruby on Rails", ".NET", "ASP.NET", "Laravel",
+    "GraphQL", "REST", "REST APIs", "gRPC", "Microservices", "PostgreSQL", "MySQL", "SQLite", "MongoDB",
+    "Redis", "Cassandra", "DynamoDB", "Elasticsearch", "Oracle", "SQL Server", "Snowflake", "BigQuery",
+    "Redshift", "Kafka", "RabbitMQ", "Spark", "PySpark", "Hadoop", "Airflow", "dbt", "Databricks", "ETL",
+    "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins",
+    "GitHub Actions", "CI/CD", "Git", "Linux", "Nginx", "Prometheus", "Grafana", "Pandas", "NumPy", "SciPy",
+    "scikit-learn", "TensorFlow", "PyTorch", "Keras", "Machine Learning", "Deep Learning", "NLP",
+    "Computer Vision", "Data Analysis", "Data Science", "Data Engineering", "Statistics", "Tableau",
+    "Power BI", "Excel", "Looker", "LLM", "OpenCV", "Figma", "Jira", "Agile", "Scrum", "Selenium", "Cypress",
+    "Jest", "JUnit", "pytest", "Unit Testing", "Android", "iOS", "Flutter", "Unity", "Hibernate", "jQuery",
+    "Bootstrap", "Tailwind", "Webpack", "Redux", "Salesforce", "SAP", "Blockchain", "Solidity", "Cybersecurity",
+    "Networking", "Embedded Systems", "Verilog", "VHDL", "AutoCAD", "SolidWorks",
+]
+
+# Skill names that are also everyday words ("Go", "Express", "Excel"). They
+# only count when written exactly so, in the skills section.
+AMBIGUOUS_SKILLS = ["C", "Go", "R", "Swift", "Rust", "Express", "REST", "Shell", "Spring", "Spark", "Unity", "Excel"]
+
+SOFT_SKILLS = [
+    "Leadership", "Communication", "Teamwork", "Collaboration", "Problem Solving", "Critical Thinking",
+    "Time Management", "Project Management", "Mentoring", "Public Speaking", "Adaptability", "Creativity",
+    "Attention to Detail", "Stakeholder Management", "Negotiation", "Presentation", "Customer Service",
+    "Conflict Resolution", "Decision Making", "Organization", "Analytical Skills", "Interpersonal Skills",
+]
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<![\w+])\+?\(?\d[\d\s().-]{7,}\d(?!\w)")
+_LOCATION = re.compile(r"\b([A-Z][A-Za-z.]+(?: [A-Z][A-Za-z.]+)*, (?:[A-Z]{2}|[A-Z][a-z]+(?: [A-Z][a-z]+)*))\b")
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}"
+_DATE_RANGE = re.compile(
+    rf"({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|Present|Current|Now|Today)", re.IGNORECASE)
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+_STATED_YEARS = re.compile(
+    r"(\d+(?:\.\d+)?)\+?\s*years?\s+(?:of\s+)?(?:professional\s+|industry\s+|work\s+|hands-on\s+)?experience",
+    re.IGNORECASE)
+_BULLET = re.compile(r"^[\-–•*●▪◦·]\s*")
+_PARTS = re.compile(r"\s+(?:at|@)\s+|\s*[|•·]\s*|\s+[-–—]\s+|,\s+")
+_LIST_ITEMS = re.compile(r"\s*[,;|•·]\s*")
+_DEGREE = re.compile(
+    r"\b(?:Bachelor|Master|Doctor|Ph\.?\s?D|MBA|B\.?\s?S\.?c?|M\.?\s?S\.?c?|B\.?\s?A\.?|M\.?\s?A\.?|B\.?\s?Tech|"
+    r"M\.?\s?Tech|B\.?\s?E\.?|M\.?\s?E\.?|Associate|Diploma|High School)\b", re.IGNORECASE)
+_INSTITUTION = re.compile(r"\b(?:University|College|Institute|School|Academy|Polytechnic)\b", re.IGNORECASE)
+_COMPANY_HINTS = re.compile(r"\b(?:Inc|LLC|Ltd|Corp|Corporation|Company|Co|GmbH|Technologies|Labs|Group)\b\.?")
+# Same boundaries as SkillMatcher, so "C" doesn't match "C++" or "Cloud"
+_AMBIGUOUS = re.compile(r"(?<![0-9A-Za-z_])(" + "|".join(
+    re.escape(skill) for skill in sorted(AMBIGUOUS_SKILLS, key=len, reverse=True)) + r")(?![0-9A-Za-z_+#])")
+
+
+def _strip_bullet(line):
+    return _BULLET.sub("", line).strip()
+
+
+def _section_lines(sections, name):
+    lines = []
+    for section in sections:
+        if section.name == name:
+            lines.extend(section.lines[1:] if section.name != "header" else section.lines)
+    return lines
+
+
+def _parse_date(text, end=False):
+    if re.fullmatch(r"present|current|now|today", text, re.IGNORECASE):
+        today = date.today()
+        return today.year + (today.month - 1) / 12
+    year = int(_YEAR.search(text).group())
+    month_match = re.match(_MONTH, text, re.IGNORECASE)
+    if month_match:
+        month = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"].index(
+            month_match.group()[:3].lower()) + 1
+    elif "/" in text:
+        month = int(text.split("/")[0])
+    else:
+        month = 12 if end else 1
+    return year + (month - 1) / 12
+
+
+# Function to add up the time covered by date ranges, counting overlaps once
+def _years_covered(ranges):
+    spans = sorted((_parse_date(start), _parse_date(end, end=True)) for start, end in ranges)
+    total, current_start, current_end = 0.0, None, None
+    for start, end in spans:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _split_title_company(text):
+    parts = [part.strip() for part in _PARTS.split(text) if part and part.strip()]
+    if not parts:
+        return "", ""
+    if len(parts) == 1:
+        return parts[0], ""
+    title, company = parts[0], parts[1]
+    if _COMPANY_HINTS.search(title) and not _COMPANY_HINTS.search(company):
+        title, company = company, title
+    return title, company
+
+
+# Function to split an experience section into entries, each starting at
+# a line with a date range; the short lines just above it are the title
+# and company, the lines after it the description
+def _parse_experience(lines):
+    entries = []
+    pending = []
+    for line in lines:
+        match = _DATE_RANGE.search(line)
+        if match is None:
+            pending.append(line)
+            continue
+        rest = (line[:match.start()] + " " + line[match.end():]).strip(" ,|-–—()")
+        heading = []
+        while pending and len(heading) < 2 and not _BULLET.match(pending[-1]) and len(pending[-1]) <= 60:
+            heading.insert(0, pending.pop())
+        if entries:
+            entries[-1]["description"] = "\n".join(_strip_bullet(item) for item in pending)
+        elif pending:
+            heading = pending[-2:] if not heading else heading
+        pending = []
+        heading_text = " | ".join(part for part in heading + [rest] if part)
+        title, company = _split_title_company(heading_text)
+        entries.append({
+            "job_title": title,
+            "company": company,
+            "duration": f"{match.group(1)} - {match.group(2)}",
+            "description": "",
+            "_range": (match.group(1), match.group(2)),
+        })
+    if entries:
+        entries[-1]["description"] = "\n".join(_strip_bullet(item) for item in pending)
+    return entries
+
+
+def _parse_education(lines):
+    entries = []
+    for index, line in enumerate(lines):
+        text = _strip_bullet(line)
+        if not _DEGREE.search(text):
+            continue
+        # Look at this line first, then the next, then the one before
+        nearby = [_strip_bullet(other) for other in [line] + lines[index + 1:index + 2] + lines[max(0, index - 1):index]]
+        institution = next((part for other in nearby for part in _LIST_ITEMS.split(other)
+                            if _INSTITUTION.search(part)), "")
+        years = [year for other in nearby for year in _YEAR.findall(other)]
+        degree = next((part for part in re.split(r"\s*[,|–—]\s*|\s+-\s+", text) if _DEGREE.search(part)), text)
+        entries.append({"degree": degree.strip(), "institution": institution.strip(), "year": years[0] if years else ""})
+    return entries
+
+
+# Function to find a phone number: 10 to 15 digits, not a date range
+def _find_phone(text):
+    for match in _PHONE.finditer(text):
+        digits = sum(ch.isdigit() for ch in match.group())
+        if 10 <= digits <= 15 and not _DATE_RANGE.search(match.group()):
+            return match.group().strip()
+    return ""
+
+
+# Function to find technical skills in text. Ambiguous skills are matched
+# case-sensitively, and only when the text is the skills section.
+def _technical_skills(text, skills_section=False):
+    unambiguous = [skill for skill in TECHNICAL_SKILLS if skill not in AMBIGUOUS_SKILLS]
+    found = get_skill_matcher(unambiguous).find(text)
+    if skills_section:
+        found += [(m.group(1), m.start(), m.end()) for m in _AMBIGUOUS.finditer(text)]
+    return list(dict.fromkeys(skill for skill, _, _ in sorted(found, key=lambda hit: hit[1])))
+
+
+def _parse_name(header_lines):
+    for line in header_lines[:4]:
+        candidate = _LIST_ITEMS.split(line)[0].strip()
+        words = candidate.split()
+        if (2 <= len(words) <= 4 and not _EMAIL.search(candidate) and not any(ch.isdigit() for ch in candidate)
+                and all(word[0].isupper() for word in words)):
+            return candidate.title() if candidate.isupper() else candidate
+    return ""
+
+
+# Function to parse resume text with rules only, no LLM. Returns the data
+# in the RESUME_SCHEMA shape and a confidence score between 0 and 1.
+def parse_resume_locally(resume_text):
+    sections = split_sections(resume_text)
+    header_lines = _section_lines(sections, "header")
+    header_text = "\n".join(header_lines[:8])
+    parsed = empty_value(RESUME_SCHEMA["schema"])
+
+    email = _EMAIL.search(header_text) or _EMAIL.search(resume_text)
+    location = _LOCATION.search(header_text)
+    parsed["basic_info"] = {
+        "name": _parse_name(header_lines),
+        "email": email.group() if email else "",
+        "phone": _find_phone(header_text) or _find_phone(resume_text),
+        "location": location.group(1) if location else "",
+    }
+    parsed["professional_summary"] = " ".join(_section_lines(sections, "summary"))
+
+    skills_lines = _section_lines(sections, "skills")
+    # Skills named in the skills section, and those only mentioned in prose
+    listed_technical = _technical_skills("\n".join(skills_lines), skills_section=True)
+    technical = listed_technical + [skill for skill in _technical_skills(resume_text) if skill not in listed_technical]
+    soft = get_skill_matcher(SOFT_SKILLS).match(resume_text)
+    listed = [item for line in skills_lines
+              for item in _LIST_ITEMS.split(re.sub(r"^[^:]{0,30}:\s*", "", _strip_bullet(line)))
+              if item and len(item) <= 40]
+    parsed["technical_skills"] = technical
+    parsed["soft_skills"] = soft
+    parsed["skills"] = list(dict.fromkeys(listed)) or technical + soft
+
+    experience = _parse_experience(_section_lines(sections, "experience"))
+    parsed["education"] = _parse_education(_section_lines(sections, "education"))
+    parsed["certifications"] = [_strip_bullet(line) for line in _section_lines(sections, "certifications")
+                                if _strip_bullet(line)]
+
+    stated = _STATED_YEARS.search(resume_text)
+    if stated:
+        years = float(stated.group(1))
+    elif experience:
+        years = round(_years_covered([entry["_range"] for entry in experience]), 1)
+    else:
+        years = None
+    parsed["years_of_experience"] = int(years) if years is not None and float(years).is_integer() else years
+    parsed["experience"] = [{key: value for key, value in entry.items() if key != "_range"} for entry in experience]
+
+    checks = [
+        (bool(parsed["basic_info"]["name"]), 0.15),
+        (bool(parsed["basic_info"]["email"]), 0.15),
+        (bool(parsed["basic_info"]["phone"]), 0.05),
+        (len(listed_technical) >= 3, 0.2),
+        (any(entry["job_title"] and entry["company"] for entry in parsed["experience"]), 0.2),
+        (bool(parsed["education"]), 0.15),
+        (bool(parsed["professional_summary"]) or years is not None, 0.1),
+    ]
+    confidence = round(sum(weight for ok, weight in checks if ok), 2)
+    return parsed, confidence
+
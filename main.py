@@ -1,13 +1,21 @@
 import streamlit as st
-import http.client
-import json
-import os
-import PyPDF2
-import io
-from google import genai
+import html
 import requests
 from dotenv import load_dotenv
 import time
+import jsearch_client
+import perf
+from job_store import get_job_store
+from job_index import LOCAL_MIN_RESULTS, RESULTS_PER_PAGE, get_job_index
+from pdf_extract import MAX_PDF_BYTES
+from resume_jobs import FAILED, STATUS_LABELS, get_resume_job_manager
+from skill_matcher import get_skill_matcher
+from semantic_rank import get_semantic_ranker
+from job_records import JobMatch, compact_jobs, get_description_store, get_posting_store
+from job_filters import IncrementalFilter, JobColumns, filter_state_from_session
+from job_cards import PAGE_SIZES, job_card_html, paginate
+from html_cards import (basic_info_card_html, education_card_html, experience_cards_html,
+                        metric_row_html, skills_card_html)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -251,8 +259,6 @@ st.markdown('<p class="main-header">AI-Powered Job Finder</p>', unsafe_allow_htm
 st.markdown('<p class="sub-header">Upload your resume and find relevant jobs tailored to your skills and experience</p>', unsafe_allow_html=True)
 
 # Initialize session state variables
-if 'resume_text' not in st.session_state:
-    st.session_state.resume_text = ""
 if 'resume_parsed' not in st.session_state:
     st.session_state.resume_parsed = False
 if 'parsed_data' not in st.session_state:
@@ -262,106 +268,105 @@ if 'job_results' not in st.session_state:
 if 'search_completed' not in st.session_state:
     st.session_state.search_completed = False
 
-# Define the JSON schema for resume parsing
-RESUME_SCHEMA = {
-    "schema": {
-        "basic_info": {
-            "name": "string",
-            "email": "string",
-            "phone": "string",
-            "location": "string"
-        },
-        "professional_summary": "string",
-        "skills": ["string"],
-        "technical_skills": ["string"],
-        "soft_skills": ["string"],
-        "experience": [{
-            "job_title": "string",
-            "company": "string",
-            "duration": "string",
-            "description": "string"
-        }],
-        "education": [{
-            "degree": "string",
-            "institution": "string",
-            "year": "string"
-        }],
-        "certifications": ["string"],
-        "years_of_experience": "number"
-    }
-}
+# Process-wide background resume parser, shared across sessions and reruns
+resume_jobs = get_resume_job_manager()
+RESUME_POLL_SECONDS = 1.0
 
-# Function to extract text from PDF
-def extract_text_from_pdf(pdf_file):
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page_num in range(len(pdf_reader.pages)):
-        text += pdf_reader.pages[page_num].extract_text()
-    return text
+# Process-wide job posting store and its full-text index, shared across
+# sessions and reruns
+job_store = get_job_store()
+job_index = get_job_index(job_store) if job_store is not None else None
+# Job embeddings for semantic ranking, computed as postings are stored
+semantic_ranker = get_semantic_ranker(job_store)
+# Results hold compact job records, one per job_id shared by every session;
+# their descriptions live once in a process-wide store and are reloaded
+# from the job store if evicted
+get_posting_store()
+get_description_store(job_store)
+# Stage timings are exported when PERF_METRICS is set
+perf.start_exporters()
 
-# Function to parse resume with Gemini
-def parse_resume_with_gemini(resume_text):
-    try:
-        # Configure the Gemini API
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
-        
-        # Construct the prompt with schema
-        prompt = f"""
-        Parse the following resume text and extract information according to this exact JSON schema:
-        
-        {json.dumps(RESUME_SCHEMA, indent=2)}
-        
-        Resume text:
-        {resume_text}
-        
-        Make sure to follow the schema exactly. If any information is not available, use empty strings or empty arrays as appropriate.
-        Return ONLY the JSON object with no additional text.
-        """
+# Function to display the parsed resume
+def show_parsed_resume(parsed_data):
+    # Display the parsed information
+    with st.expander("View Parsed Resume Information", expanded=True):
+        tab1, tab2, tab3 = st.tabs(["Basic Info", "Experience", "Skills & Education"])
         
-        # Generate the response
-        response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+        with tab1:
+            # Basic information card
+            st.markdown(basic_info_card_html(parsed_data), unsafe_allow_html=True)
         
-        # Parse the response to get JSON
-        try:
-            parsed_data = json.loads(response.text)
-            return parsed_data
-        except json.JSONDecodeError:
-            # Try to extract JSON from the text if not directly parseable
-            import re
-            json_match = re.search(r'```json\n(.*?)\n```', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
+        with tab2:
+            if parsed_data.get("experience"):
+                st.markdown(experience_cards_html(parsed_data.get("experience", [])), unsafe_allow_html=True)
             else:
-                st.error("Could not parse the response as JSON")
-                return RESUME_SCHEMA["schema"]
-    except Exception as e:
-        st.error(f"Error parsing resume: {str(e)}")
-        return RESUME_SCHEMA["schema"]
-
-# Function to search for jobs
-def search_jobs(query, location="", page=1):
-    try:
-        conn = http.client.HTTPSConnection("jsearch.p.rapidapi.com")
-        
-        # Format the query string
-        search_query = query.replace(" ", "%20")
-        if location:
-            search_query += f"%20in%20{location.replace(' ', '%20')}"
-        
-        headers = {
-            'X-RapidAPI-Key': os.getenv('RAPIDAPI_KEY'),
-            'X-RapidAPI-Host': "jsearch.p.rapidapi.com"
-        }
-        
-        conn.request("GET", f"/search?query={search_query}&page={page}&num_pages=1", headers=headers)
+                st.info("No experience information found in your resume")
         
-        res = conn.getresponse()
-        data = res.read()
-        
-        return json.loads(data.decode("utf-8"))
-    except Exception as e:
-        st.error(f"Error searching for jobs: {str(e)}")
-        return {"data": []}
+        with tab3:
+            skills_col, education_col = st.columns(2)
+            
+            with skills_col:
+                st.markdown(skills_card_html(parsed_data), unsafe_allow_html=True)
+            
+            with education_col:
+                st.markdown(education_card_html(parsed_data), unsafe_allow_html=True)
+
+# Function to show the status of a background resume job. Runs as a fragment
+# that polls until the job finishes, then hands the parse to the rest of the app.
+def show_resume_job(job_key, was_finished):
+    job = resume_jobs.get(job_key)
+    if job is None:
+        return
+    if not job.finished:
+        st.markdown(f'<div class="info-box">⏳ {STATUS_LABELS[job.status]} You can search for jobs in the meantime.</div>', unsafe_allow_html=True)
+        return
+    
+    for message in job.errors:
+        st.error(message)
+    if job.status == FAILED:
+        st.markdown(f'<div class="warning-message">{STATUS_LABELS[job.status]}</div>', unsafe_allow_html=True)
+        if st.button("Retry parsing", key="resume_retry_button"):
+            st.session_state.resume_retry = True
+            st.rerun()
+        return
+    
+    if st.session_state.get('resume_job_key') != job.key:
+        st.session_state.parsed_data = job.parsed_data
+        st.session_state.resume_parsed = True
+        st.session_state.resume_job_key = job.key
+        if not was_finished:
+            # The parse landed during a fragment rerun, rerun the whole app
+            # so the job matches below pick up the new skills
+            st.rerun()
+    
+    # Display success message
+    st.markdown('<div class="success-message">Resume successfully parsed!</div>', unsafe_allow_html=True)
+
+    if job.parser == "local":
+        st.caption(f"Parsed locally without Gemini (confidence {job.local_confidence:.0%})")
+    elif job.tokens_before is not None:
+        st.caption(f"Resume text sent to Gemini: ~{job.tokens_after:,} tokens (from ~{job.tokens_before:,})")
+    show_parsed_resume(job.parsed_data)
+
+# Function to search for jobs, fetching result pages concurrently and
+# yielding (page, new_jobs) as each page arrives
+def search_job_pages(query, location="", num_pages=1):
+    def report_error(page, e):
+        st.error(f"Error searching for jobs (page {page}): {str(e)}")
+    
+    # Pages already in the job store are answered locally
+    search = job_store.search_page if job_store is not None else None
+    return jsearch_client.iter_search_pages(query, location, num_pages, on_error=report_error, search=search)
+
+# Function to answer a search from the index of saved postings. Returns
+# None for cold queries, which are searched upstream instead.
+def local_job_search(query, location="", num_pages=1):
+    if job_index is None:
+        return None
+    hits = job_index.search(query, location, limit=num_pages * RESULTS_PER_PAGE)
+    if len(hits) < LOCAL_MIN_RESULTS:
+        return None
+    return job_store.get_jobs([job_id for job_id, _ in hits])
 
 if 'filter_remote_only' not in st.session_state:
     st.session_state.filter_remote_only = False
@@ -375,43 +380,50 @@ if 'max_salary' not in st.session_state:
     st.session_state.max_salary = 1000000
 if 'filter_company_types' not in st.session_state:
     st.session_state.filter_company_types = []
-    
+if 'results_page' not in st.session_state:
+    st.session_state.results_page = 0
+if 'results_page_size' not in st.session_state:
+    st.session_state.results_page_size = PAGE_SIZES[0]
+    
+# Function to move the job results to another page
+def change_results_page(delta):
+    st.session_state.results_page += delta
+
+def reset_results_page():
+    st.session_state.results_page = 0
+
+# Function to show stage timings and cache stats in the sidebar
+def show_perf_panel():
+    metrics = perf.get_metrics()
+    with st.sidebar.expander("Performance"):
+        stages = metrics.snapshot()
+        if stages:
+            st.table([
+                {"Stage": name, "Calls": stage["count"], "p50 ms": f"{stage['p50'] * 1000:.1f}",
+                 "p95 ms": f"{stage['p95'] * 1000:.1f}", "p99 ms": f"{stage['p99'] * 1000:.1f}"}
+                for name, stage in stages.items()
+            ])
+        else:
+            st.caption("No timings recorded yet")
+        st.table([
+            {"Source": name, "Stat": key, "Value": f"{value:g}"}
+            for name, values in metrics.collect().items() for key, value in values.items()
+        ])
+
 # Function to apply filters to job results
+@perf.timed("apply_filters")
 def apply_filters(jobs):
-    filtered_jobs = []
+    # Read the sidebar filters once instead of once per job
+    filters = filter_state_from_session(st.session_state)
     
-    for job in jobs:
-        # Check remote filter
-        if st.session_state.filter_remote_only and not job.get('job_is_remote', False):
-            continue
-            
-        # Check employment type filter
-        if st.session_state.filter_employment_types and job.get('job_employment_type') not in st.session_state.filter_employment_types:
-            continue
-            
-        # Check date posted filter (in days)
-        if st.session_state.filter_date_posted > 0:
-            current_time = int(time.time())
-            posted_time = job.get('job_posted_at_timestamp', 0)
-            days_ago = (current_time - posted_time) / (60 * 60 * 24)
-            if days_ago > st.session_state.filter_date_posted:
-                continue
-                
-        # Check salary filter
-        if job.get('job_min_salary') is not None and job.get('job_min_salary') < st.session_state.min_salary:
-            continue
-            
-        if job.get('job_max_salary') is not None and job.get('job_max_salary') > st.session_state.max_salary:
-            continue
-            
-        # Check company type filter
-        if st.session_state.filter_company_types and job.get('employer_company_type') not in st.session_state.filter_company_types:
-            continue
-            
-        # All filters passed, add job to filtered results
-        filtered_jobs.append(job)
-        
-    return filtered_jobs
+    # Columns are built once per result set, and only the predicates whose
+    # filter value changed since the last rerun are recomputed
+    job_filter = st.session_state.get('job_filter')
+    if job_filter is None or not job_filter.columns.covers(jobs):
+        job_filter = IncrementalFilter(JobColumns(jobs))
+        st.session_state.job_filter = job_filter
+    
+    return job_filter.apply(filters)
 
 # Main layout
 col1, col2 = st.columns([3, 1])
@@ -424,142 +436,62 @@ with col1:
     
     uploaded_file = st.file_uploader("Upload your resume (PDF format)", type=['pdf'])
 
-    if uploaded_file is not None:
-        with st.spinner('Processing your resume...'):
-            # Extract text from the PDF
-            resume_text = extract_text_from_pdf(uploaded_file)
-            st.session_state.resume_text = resume_text
-            
-            # Parse the resume
-            parsed_data = parse_resume_with_gemini(resume_text)
-            st.session_state.parsed_data = parsed_data
-            st.session_state.resume_parsed = True
-            
-            # Display success message
-            st.markdown('<div class="success-message">Resume successfully parsed!</div>', unsafe_allow_html=True)
-            
-            # Display the parsed information
-            with st.expander("View Parsed Resume Information", expanded=True):
-                tab1, tab2, tab3 = st.tabs(["Basic Info", "Experience", "Skills & Education"])
-                
-                with tab1:
-                    # Basic information card
-                    basic_info = parsed_data.get("basic_info", {})
-                    st.markdown('<div class="card">', unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.markdown(f"**Name:** {basic_info.get('name', 'Not found')}")
-                        st.markdown(f"**Email:** {basic_info.get('email', 'Not found')}")
-                    
-                    with col2:
-                        st.markdown(f"**Phone:** {basic_info.get('phone', 'Not found')}")
-                        st.markdown(f"**Location:** {basic_info.get('location', 'Not found')}")
-                    
-                    if parsed_data.get("professional_summary"):
-                        st.markdown("<hr style='margin: 1rem 0'>", unsafe_allow_html=True)
-                        st.markdown("**Professional Summary:**")
-                        st.markdown(parsed_data.get("professional_summary", ""))
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with tab2:
-                    if parsed_data.get("experience"):
-                        for exp in parsed_data.get("experience", []):
-                            st.markdown('<div class="card">', unsafe_allow_html=True)
-                            st.markdown(f"<div style='color: #1E3A8A; font-weight: 600; font-size: 1.1rem;'>{exp.get('job_title', 'Role')}</div>", unsafe_allow_html=True)
-                            st.markdown(f"<div style='color: #64748B; font-weight: 500;'>{exp.get('company', 'Company')}</div>", unsafe_allow_html=True)
-                            st.markdown(f"<div style='color: #94A3B8; font-size: 0.9rem; margin-bottom: 0.75rem;'>{exp.get('duration', 'Duration not specified')}</div>", unsafe_allow_html=True)
-                            st.markdown(exp.get('description', 'No description available'))
-                            st.markdown('</div>', unsafe_allow_html=True)
-                    else:
-                        st.info("No experience information found in your resume")
-                
-                with tab3:
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown('<div class="card">', unsafe_allow_html=True)
-                        st.markdown("<strong>Skills</strong>")
-                        
-                        # Technical skills
-                        st.markdown("**Technical Skills:**")
-                        tech_skills = parsed_data.get("technical_skills", [])
-                        if tech_skills:
-                            for skill in tech_skills:
-                                st.markdown(f"<span class='skill-tag'>{skill}</span>", unsafe_allow_html=True)
-                        else:
-                            st.markdown("No technical skills found")
-                        
-                        # Soft skills
-                        st.markdown("<div style='margin-top: 1rem;'>**Soft Skills:**</div>", unsafe_allow_html=True)
-                        soft_skills = parsed_data.get("soft_skills", [])
-                        if soft_skills:
-                            for skill in soft_skills:
-                                st.markdown(f"<span class='skill-tag'>{skill}</span>", unsafe_allow_html=True)
-                        else:
-                            st.markdown("No soft skills found")
-                        
-                        # General skills
-                        st.markdown("<div style='margin-top: 1rem;'>**General Skills:**</div>", unsafe_allow_html=True)
-                        skills = parsed_data.get("skills", [])
-                        if skills:
-                            for skill in skills:
-                                st.markdown(f"<span class='skill-tag'>{skill}</span>", unsafe_allow_html=True)
-                        else:
-                            st.markdown("No general skills found")
-                            
-                        st.markdown(f"<div style='margin-top: 1rem;'>**Years of Experience:** {parsed_data.get('years_of_experience', 'Not specified')}</div>", unsafe_allow_html=True)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown('<div class="card">', unsafe_allow_html=True)
-                        st.markdown("<strong>Education</strong>")
-                        
-                        for edu in parsed_data.get("education", []):
-                            st.markdown(f"<div style='margin-bottom: 1rem;'>", unsafe_allow_html=True)
-                            st.markdown(f"<div style='font-weight: 600;'>{edu.get('degree', 'Degree')}</div>", unsafe_allow_html=True)
-                            st.markdown(f"<div>{edu.get('institution', 'Institution')}</div>", unsafe_allow_html=True)
-                            st.markdown(f"<div style='color: #94A3B8; font-size: 0.9rem;'>{edu.get('year', 'Year not specified')}</div>", unsafe_allow_html=True)
-                            st.markdown("</div>", unsafe_allow_html=True)
-                            
-                        # Certifications if available
-                        if parsed_data.get("certifications"):
-                            st.markdown("<hr style='margin: 1rem 0'>", unsafe_allow_html=True)
-                            st.markdown("<strong>Certifications</strong>")
-                            for cert in parsed_data.get("certifications", []):
-                                st.markdown(f"• {cert}")
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
+    if uploaded_file is not None and uploaded_file.size > MAX_PDF_BYTES:
+        st.markdown(f'<div class="warning-message">This PDF is too large to process (limit {MAX_PDF_BYTES // (1024 * 1024)} MB)</div>', unsafe_allow_html=True)
+    elif uploaded_file is not None:
+        # Parse in the background so the search section below stays usable
+        resume_job = resume_jobs.submit(uploaded_file.getvalue(), retry_failed=st.session_state.pop('resume_retry', False))
+        st.fragment(show_resume_job, run_every=None if resume_job.finished else RESUME_POLL_SECONDS)(resume_job.key, resume_job.finished)
 
     # Job Search Section
     st.markdown('<p class="section-header">🔍 Search for Jobs</p>', unsafe_allow_html=True)
     
     # Search form with improved styling
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    
-    search_query = st.text_input("Job Title", placeholder="e.g., Python Developer, Product Manager")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        location = st.text_input("Location", placeholder="e.g., New York, Remote")
-    with col2:
-        search_button = st.button("Search Jobs", use_container_width=True)
-    
-    if st.session_state.resume_parsed:
-        st.markdown('<div class="success-message">Resume skills will be used for job matching</div>', unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    with st.container(border=True):
+        search_query = st.text_input("Job Title", placeholder="e.g., Python Developer, Product Manager")
+        
+        location_col, button_col = st.columns(2)
+        with location_col:
+            location = st.text_input("Location", placeholder="e.g., New York, Remote")
+        with button_col:
+            search_button = st.button("Search Jobs", use_container_width=True)
+        
+        num_pages = st.number_input("Result pages", min_value=1, max_value=10, value=1, step=1)
+        fetch_fresh = st.checkbox("Fetch fresh results", help="Search JSearch instead of the postings saved from earlier searches")
+        
+        if st.session_state.resume_parsed:
+            st.markdown('<div class="success-message">Resume skills will be used for job matching</div>', unsafe_allow_html=True)
     
     if search_button:
         if search_query:
             with st.spinner('Searching for relevant jobs...'):
-                # Search for jobs
-                job_results = search_jobs(search_query, location)
-                
-                # Store the results in session state
-                st.session_state.job_results = job_results.get('data', [])
+                # Store the results in session state as each page lands
+                st.session_state.job_results = []
+                st.session_state.results_page = 0
                 st.session_state.search_completed = True
+                
+                # Warm queries are answered from saved postings without an API call
+                started = time.perf_counter()
+                local_jobs = None if fetch_fresh else local_job_search(search_query, location, int(num_pages))
+                if local_jobs is not None:
+                    st.session_state.job_results = compact_jobs(local_jobs)
+                    st.caption(f"Answered from saved postings in {(time.perf_counter() - started) * 1000:.0f} ms")
+                else:
+                    live_results = st.empty()
+                    for pages_done, (page, jobs) in enumerate(search_job_pages(search_query, location, int(num_pages)), start=1):
+                        st.session_state.job_results.extend(compact_jobs(jobs))
+                        
+                        # Show what has arrived so far while the remaining pages load
+                        preview = "".join(
+                            f"<div class='job-detail'>{html.escape(str(job.get('job_title', 'Job Title Not Available')))} - {html.escape(str(job.get('employer_name', 'Company Not Available')))}</div>"
+                            for job in st.session_state.job_results[:20]
+                        )
+                        live_results.markdown(f'<div class="info-box">Fetched {len(st.session_state.job_results)} jobs ({pages_done}/{int(num_pages)} pages)</div>{preview}', unsafe_allow_html=True)
+                    live_results.empty()
+                    if job_index is not None:
+                        job_index.maybe_save()
+                    semantic_ranker.maybe_save()
+                perf.observe("job_search", time.perf_counter() - started)
         else:
             st.markdown('<div class="warning-message">Please enter a job title to search</div>', unsafe_allow_html=True)
 
@@ -567,92 +499,64 @@ with col2:
     # Filter sidebar
     st.markdown('<p class="section-header">⚙️ Filters</p>', unsafe_allow_html=True)
     
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    
-    # Remote work filter
-    st.checkbox("Remote Only", key="filter_remote_only")
-    
-    # Employment type filter
-    st.markdown("<div style='margin-top: 1rem;'><strong>Employment Type</strong></div>", unsafe_allow_html=True)
-    employment_types = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN"]
-    st.multiselect(
-        "Select types", 
-        employment_types,
-        default=None,
-        key="filter_employment_types",
-        label_visibility="collapsed"
-    )
-    
-    # Date posted filter
-    st.markdown("<div style='margin-top: 1rem;'><strong>Date Posted</strong></div>", unsafe_allow_html=True)
-    date_options = {
-        "Any time": 0,
-        "Past 24 hours": 1,
-        "Past week": 7,
-        "Past month": 30
-    }
-    selected_date = st.selectbox(
-        "Select timeframe",
-        options=list(date_options.keys()),
-        index=0,
-        label_visibility="collapsed"
-    )
-    st.session_state.filter_date_posted = date_options[selected_date]
-    
-    # Salary range filter
-    st.markdown("<div style='margin-top: 1rem;'><strong>Salary Range</strong></div>", unsafe_allow_html=True)
-    col1, col2 = st.columns(2)
-    with col1:
-        st.number_input("Min (₹)", value=0, step=10000, key="min_salary")
-    with col2:
-        st.number_input("Max (₹)", value=1000000, step=10000, key="max_salary")
-    
-    # Company type filter
-    st.markdown("<div style='margin-top: 1rem;'><strong>Company Type</strong></div>", unsafe_allow_html=True)
-    company_types = ["Public", "Private", "Nonprofit", "Government", "Startup", "Other"]
-    st.multiselect(
-        "Select types",
-        company_types,
-        default=None,
-        key="filter_company_types",
-        label_visibility="collapsed"
-    )
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    with st.container(border=True):
+        # Remote work filter
+        st.checkbox("Remote Only", key="filter_remote_only")
+        
+        # Employment type filter
+        st.markdown("<div style='margin-top: 1rem;'><strong>Employment Type</strong></div>", unsafe_allow_html=True)
+        employment_types = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN"]
+        st.multiselect(
+            "Select types", 
+            employment_types,
+            default=None,
+            key="filter_employment_types",
+            label_visibility="collapsed"
+        )
+        
+        # Date posted filter
+        st.markdown("<div style='margin-top: 1rem;'><strong>Date Posted</strong></div>", unsafe_allow_html=True)
+        date_options = {
+            "Any time": 0,
+            "Past 24 hours": 1,
+            "Past week": 7,
+            "Past month": 30
+        }
+        selected_date = st.selectbox(
+            "Select timeframe",
+            options=list(date_options.keys()),
+            index=0,
+            label_visibility="collapsed"
+        )
+        st.session_state.filter_date_posted = date_options[selected_date]
+        
+        # Salary range filter
+        st.markdown("<div style='margin-top: 1rem;'><strong>Salary Range</strong></div>", unsafe_allow_html=True)
+        min_col, max_col = st.columns(2)
+        with min_col:
+            st.number_input("Min (₹)", value=0, step=10000, key="min_salary")
+        with max_col:
+            st.number_input("Max (₹)", value=1000000, step=10000, key="max_salary")
+        
+        # Company type filter
+        st.markdown("<div style='margin-top: 1rem;'><strong>Company Type</strong></div>", unsafe_allow_html=True)
+        company_types = ["Public", "Private", "Nonprofit", "Government", "Startup", "Other"]
+        st.multiselect(
+            "Select types",
+            company_types,
+            default=None,
+            key="filter_company_types",
+            label_visibility="collapsed"
+        )
     
     # App metrics
     st.markdown('<p class="section-header">📊 Stats</p>', unsafe_allow_html=True)
     
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.session_state.resume_parsed:
-            skill_count = len(st.session_state.parsed_data.get("skills", [])) + len(st.session_state.parsed_data.get("technical_skills", []))
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-value">{skill_count}</div>', unsafe_allow_html=True)
-            st.markdown('<div class="metric-label">Skills</div>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="metric-card" style="opacity: 0.5">', unsafe_allow_html=True)
-            st.markdown('<div class="metric-value">-</div>', unsafe_allow_html=True)
-            st.markdown('<div class="metric-label">Skills</div>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        if st.session_state.search_completed:
-            job_count = len(st.session_state.job_results)
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-value">{job_count}</div>', unsafe_allow_html=True)
-            st.markdown('<div class="metric-label">Jobs</div>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="metric-card" style="opacity: 0.5">', unsafe_allow_html=True)
-            st.markdown('<div class="metric-value">-</div>', unsafe_allow_html=True)
-            st.markdown('<div class="metric-label">Jobs</div>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    skill_count = None
+    if st.session_state.resume_parsed:
+        skill_count = len(st.session_state.parsed_data.get("skills", [])) + len(st.session_state.parsed_data.get("technical_skills", []))
+    job_count = len(st.session_state.job_results) if st.session_state.search_completed else None
+    st.markdown(metric_row_html([(skill_count, "Skills"), (job_count, "Jobs")]), unsafe_allow_html=True)
 
 # Display Results
 if st.session_state.search_completed:
@@ -666,6 +570,7 @@ if st.session_state.search_completed:
             st.markdown(f'<div class="success-message">Found {len(filtered_jobs)} jobs matching your criteria</div>', unsafe_allow_html=True)
             
             # Calculate skill match percentages if resume is uploaded
+            matches = None
             if st.session_state.resume_parsed:
                 # Extract all skills from resume
                 tech_skills = set(st.session_state.parsed_data.get("technical_skills", []))
@@ -673,48 +578,56 @@ if st.session_state.search_completed:
                 soft_skills = set(st.session_state.parsed_data.get("soft_skills", []))
                 all_skills = tech_skills.union(general_skills).union(soft_skills)
                 
-                # Add match score to each job
-                for job in filtered_jobs:
-                    if job.get('job_description'):
-                        desc = job.get('job_description', '').lower()
-                        matched_skills = [skill for skill in all_skills if skill.lower() in desc]
-                        match_percentage = int((len(matched_skills) / max(1, len(all_skills))) * 100)
-                        job['match_percentage'] = match_percentage
-                        job['matched_skills'] = matched_skills
-                    else:
-                        job['match_percentage'] = 0
-                        job['matched_skills'] = []
+                # Compiled once per resume and reused across reruns
+                skill_matcher = get_skill_matcher(all_skills)
+                
+                # Score each job, keeping the results apart from the shared job records
+                scoring_started = time.perf_counter()
+                skill_matches = [
+                    skill_matcher.score_job(job) if job.description_key is not None else (0, [])
+                    for job in filtered_jobs
+                ]
+                
+                # Blend in how close each job is to the resume as a whole
+                semantic_scores = semantic_ranker.score_jobs(
+                    st.session_state.parsed_data, filtered_jobs, [match_percentage for match_percentage, _ in skill_matches])
+                matches = [JobMatch(*skill_match, *semantic) for skill_match, semantic in zip(skill_matches, semantic_scores)]
+                perf.observe("match_scoring", time.perf_counter() - scoring_started)
                 
                 # Option to sort by match percentage
                 col1, col2 = st.columns([1, 2])
                 with col1:
-                    sort_by_match = st.checkbox("Sort by match percentage", value=True)
+                    sort_by_match = st.checkbox("Sort by best match", value=True)
                 
                 if sort_by_match:
-                    filtered_jobs = sorted(filtered_jobs, key=lambda x: x.get('match_percentage', 0), reverse=True)
+                    ranked = sorted(zip(filtered_jobs, matches), key=lambda pair: pair[1].match_score, reverse=True)
+                    filtered_jobs = [job for job, _ in ranked]
+                    matches = [match for _, match in ranked]
             
-            for job_idx, job in enumerate(filtered_jobs):
-                # Create a job card
-                st.markdown('<div class="card job-card">', unsafe_allow_html=True)
-                
-                # Job header
-                cols = st.columns([3, 1])
-                
-                with cols[0]:
-                    if st.session_state.resume_parsed and 'match_percentage' in job:
-                        match_percentage = job.get('match_percentage', 0)
-                        if match_percentage > 70:
-                            match_class = "match-high"
-                        elif match_percentage > 40:
-                            match_class = "match-medium"
-                        else:
-                            match_class = "match-low"
-                            
-                        st.markdown(f"<div style='display: flex; align-items: center;'>", unsafe_allow_html=True)
-                        st.markdown(f"<div class='job-title'>{job.get('job_title', 'Job Title Not Available')}</div>", unsafe_allow_html=True)
-                        st.markdown(f"<div style='margin-left: 0.75rem; padding: 0.2rem 0.5rem; border-radius: 4px; font-size: 0.8rem;' class='{match_class}'>{match_percentage}% Match</div>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"<div class='job-title'>{job.get('job_title', 'Job Title Not Available')}</div>", unsafe_allow_html=True)
-                    
-                    st.markdown(f"<div class='job-company'>{job.get('employer_name', 'Company Not Available')}</div>", unsafe_allow_html=True)
\ No newline at end of file
+            # Only build elements for the visible page of results
+            start, end, page, page_count = paginate(len(filtered_jobs), st.session_state.results_page, st.session_state.results_page_size)
+            st.session_state.results_page = page
+            
+            render_started = time.perf_counter()
+            for job_idx, job in enumerate(filtered_jobs[start:end], start=start):
+                # Card HTML is rendered once per job and match score. The
+                # card shows the blended score the results are sorted by.
+                match_score = matches[job_idx].match_score if matches is not None else None
+                st.markdown(job_card_html(job, match_score), unsafe_allow_html=True)
+            
+            perf.observe("render_results", time.perf_counter() - render_started)
+            
+            # Pagination controls
+            nav_prev, nav_info, nav_next, nav_size = st.columns([1, 2, 1, 1])
+            with nav_prev:
+                st.button("← Previous", on_click=change_results_page, args=(-1,), disabled=page == 0, key="results_prev", use_container_width=True)
+            with nav_info:
+                st.markdown(f"<div style='text-align: center; color: #64748B;'>Page {page + 1} of {page_count} · jobs {start + 1}-{end} of {len(filtered_jobs)}</div>", unsafe_allow_html=True)
+            with nav_next:
+                st.button("Next →", on_click=change_results_page, args=(1,), disabled=page >= page_count - 1, key="results_next", use_container_width=True)
+            with nav_size:
+                st.selectbox("Jobs per page", PAGE_SIZES, key="results_page_size", on_change=reset_results_page, label_visibility="collapsed")
+
+# Stage timings and cache stats, for tracking down slow sessions
+if perf.ENABLED:
+    show_perf_panel()
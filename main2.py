@@ -1,13 +1,18 @@
 import streamlit as st
-import http.client
-import json
-import os
-import PyPDF2
-import io
-from google import genai
 import requests
 from dotenv import load_dotenv
 import time
+import jsearch_client
+import perf
+from job_store import get_job_store
+from job_index import LOCAL_MIN_RESULTS, RESULTS_PER_PAGE, get_job_index
+from pdf_extract import MAX_PDF_BYTES
+from resume_jobs import FAILED, STATUS_LABELS, get_resume_job_manager
+from skill_matcher import get_skill_matcher
+from semantic_rank import get_semantic_ranker
+from job_records import JobMatch, compact_jobs, get_description_store, get_posting_store
+from job_filters import IncrementalFilter, JobColumns, filter_state_from_session
+from job_cards import PAGE_SIZES, job_card_html, paginate
 
 # Load environment variables from .env file
 load_dotenv()
@@ -51,8 +56,6 @@ st.markdown('<p class="main-header">AI-Powered Job Finder</p>', unsafe_allow_htm
 st.markdown('<p class="sub-header">Upload your resume and find relevant jobs</p>', unsafe_allow_html=True)
 
 # Initialize session state variables
-if 'resume_text' not in st.session_state:
-    st.session_state.resume_text = ""
 if 'resume_parsed' not in st.session_state:
     st.session_state.resume_parsed = False
 if 'parsed_data' not in st.session_state:
@@ -62,109 +65,133 @@ if 'job_results' not in st.session_state:
 if 'search_completed' not in st.session_state:
     st.session_state.search_completed = False
 
-# Define the JSON schema for resume parsing
-RESUME_SCHEMA = {
-    "schema": {
-        "basic_info": {
-            "name": "string",
-            "email": "string",
-            "phone": "string",
-            "location": "string"
-        },
-        "professional_summary": "string",
-        "skills": ["string"],
-        "technical_skills": ["string"],
-        "soft_skills": ["string"],
-        "experience": [{
-            "job_title": "string",
-            "company": "string",
-            "duration": "string",
-            "description": "string"
-        }],
-        "education": [{
-            "degree": "string",
-            "institution": "string",
-            "year": "string"
-        }],
-        "certifications": ["string"],
-        "years_of_experience": "number"
-    }
-}
+# Process-wide background resume parser, shared across sessions and reruns
+resume_jobs = get_resume_job_manager()
+RESUME_POLL_SECONDS = 1.0
 
-# Function to extract text from PDF
-def extract_text_from_pdf(pdf_file):
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page_num in range(len(pdf_reader.pages)):
-        text += pdf_reader.pages[page_num].extract_text()
-    return text
-
-# Function to parse resume with Gemini
-def parse_resume_with_gemini(resume_text):
-    try:
-        # Configure the Gemini API
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
-        
-        # Construct the prompt with schema
-        prompt = f"""
-        Parse the following resume text and extract information according to this exact JSON schema:
-        
-        {json.dumps(RESUME_SCHEMA, indent=2)}
-        
-        Resume text:
-        {resume_text}
-        
-        Make sure to follow the schema exactly. If any information is not available, use empty strings or empty arrays as appropriate.
-        Return ONLY the JSON object with no additional text.
-        """
-        
-        # Get the model
-        
-        # Generate the response
-        response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+# Process-wide job posting store and its full-text index, shared across
+# sessions and reruns
+job_store = get_job_store()
+job_index = get_job_index(job_store) if job_store is not None else None
+# Job embeddings for semantic ranking, computed as postings are stored
+semantic_ranker = get_semantic_ranker(job_store)
+# Results hold compact job records, one per job_id shared by every session;
+# their descriptions live once in a process-wide store and are reloaded
+# from the job store if evicted
+get_posting_store()
+get_description_store(job_store)
+# Stage timings are exported when PERF_METRICS is set
+perf.start_exporters()
 
+# Function to display the parsed resume
+def show_parsed_resume(parsed_data):
+    # Display the parsed information
+    with st.expander("Resume Parsed Information", expanded=True):
+        col1, col2 = st.columns(2)
         
-        # Parse the response to get JSON
-        try:
-            parsed_data = json.loads(response.text)
-            return parsed_data
-        except json.JSONDecodeError:
-            # Try to extract JSON from the text if not directly parseable
-            import re
-            json_match = re.search(r'```json\n(.*?)\n```', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
-            else:
-                st.error("Could not parse the response as JSON")
-                return RESUME_SCHEMA["schema"]
-    except Exception as e:
-        st.error(f"Error parsing resume: {str(e)}")
-        return RESUME_SCHEMA["schema"]
-
-# Function to search for jobs
-def search_jobs(query, location="", page=1):
-    try:
-        conn = http.client.HTTPSConnection("jsearch.p.rapidapi.com")
-        
-        # Format the query string
-        search_query = query.replace(" ", "%20")
-        if location:
-            search_query += f"%20in%20{location.replace(' ', '%20')}"
-        
-        headers = {
-            'X-RapidAPI-Key': os.getenv('RAPIDAPI_KEY'),
-            'X-RapidAPI-Host': "jsearch.p.rapidapi.com"
-        }
-        
-        conn.request("GET", f"/search?query={search_query}&page={page}&num_pages=1", headers=headers)
-        
-        res = conn.getresponse()
-        data = res.read()
+        with col1:
+            st.markdown("### Basic Information")
+            basic_info = parsed_data.get("basic_info", {})
+            st.write(f"**Name:** {basic_info.get('name', 'Not found')}")
+            st.write(f"**Email:** {basic_info.get('email', 'Not found')}")
+            st.write(f"**Phone:** {basic_info.get('phone', 'Not found')}")
+            st.write(f"**Location:** {basic_info.get('location', 'Not found')}")
+            
+            st.markdown("### Experience")
+            for exp in parsed_data.get("experience", []):
+                st.markdown(f"**{exp.get('job_title', 'Role')} at {exp.get('company', 'Company')}**")
+                st.write(f"*{exp.get('duration', 'Duration not specified')}*")
+                st.write(exp.get('description', 'No description available'))
+                st.write("---")
         
-        return json.loads(data.decode("utf-8"))
-    except Exception as e:
-        st.error(f"Error searching for jobs: {str(e)}")
-        return {"data": []}
+        with col2:
+            st.markdown("### Skills")
+            
+            # Technical skills
+            st.write("**Technical Skills:**")
+            tech_skills = parsed_data.get("technical_skills", [])
+            if tech_skills:
+                st.write(", ".join(tech_skills))
+            else:
+                st.write("No technical skills found")
+            
+            # Soft skills
+            st.write("**Soft Skills:**")
+            soft_skills = parsed_data.get("soft_skills", [])
+            if soft_skills:
+                st.write(", ".join(soft_skills))
+            else:
+                st.write("No soft skills found")
+            
+            # General skills
+            st.write("**General Skills:**")
+            skills = parsed_data.get("skills", [])
+            if skills:
+                st.write(", ".join(skills))
+            else:
+                st.write("No general skills found")
+            
+            st.markdown("### Education")
+            for edu in parsed_data.get("education", []):
+                st.write(f"**{edu.get('degree', 'Degree')}** - {edu.get('institution', 'Institution')}")
+                st.write(f"*{edu.get('year', 'Year not specified')}*")
+            
+            years_of_experience = parsed_data.get('years_of_experience')
+            st.write(f"**Years of Experience:** {years_of_experience if years_of_experience is not None else 'Not specified'}")
+
+# Function to show the status of a background resume job. Runs as a fragment
+# that polls until the job finishes, then hands the parse to the rest of the app.
+def show_resume_job(job_key, was_finished):
+    job = resume_jobs.get(job_key)
+    if job is None:
+        return
+    if not job.finished:
+        st.info(f"⏳ {STATUS_LABELS[job.status]} You can search for jobs in the meantime.")
+        return
+    
+    for message in job.errors:
+        st.error(message)
+    if job.status == FAILED:
+        st.warning(STATUS_LABELS[job.status])
+        if st.button("Retry parsing", key="resume_retry_button"):
+            st.session_state.resume_retry = True
+            st.rerun()
+        return
+    
+    if st.session_state.get('resume_job_key') != job.key:
+        st.session_state.parsed_data = job.parsed_data
+        st.session_state.resume_parsed = True
+        st.session_state.resume_job_key = job.key
+        if not was_finished:
+            # The parse landed during a fragment rerun, rerun the whole app
+            # so the job matches below pick up the new skills
+            st.rerun()
+    
+    if job.parser == "local":
+        st.caption(f"Parsed locally without Gemini (confidence {job.local_confidence:.0%})")
+    elif job.tokens_before is not None:
+        st.caption(f"Resume text sent to Gemini: ~{job.tokens_after:,} tokens (from ~{job.tokens_before:,})")
+    show_parsed_resume(job.parsed_data)
+
+# Function to search for jobs, fetching result pages concurrently and
+# yielding (page, new_jobs) as each page arrives
+def search_job_pages(query, location="", num_pages=1):
+    def report_error(page, e):
+        st.error(f"Error searching for jobs (page {page}): {str(e)}")
+    
+    # Pages already in the job store are answered locally
+    search = job_store.search_page if job_store is not None else None
+    return jsearch_client.iter_search_pages(query, location, num_pages, on_error=report_error, search=search)
+
+# Function to answer a search from the index of saved postings. Returns
+# None for cold queries, which are searched upstream instead.
+def local_job_search(query, location="", num_pages=1):
+    if job_index is None:
+        return None
+    hits = job_index.search(query, location, limit=num_pages * RESULTS_PER_PAGE)
+    if len(hits) < LOCAL_MIN_RESULTS:
+        return None
+    return job_store.get_jobs([job_id for job_id, _ in hits])
 
 if 'filter_remote_only' not in st.session_state:
     st.session_state.filter_remote_only = False
@@ -178,117 +205,78 @@ if 'max_salary' not in st.session_state:
     st.session_state.max_salary = 1000000
 if 'filter_company_types' not in st.session_state:
     st.session_state.filter_company_types = []
+if 'results_page' not in st.session_state:
+    st.session_state.results_page = 0
+if 'results_page_size' not in st.session_state:
+    st.session_state.results_page_size = PAGE_SIZES[0]
+# Descriptions the user opened, by description key
+if 'open_descriptions' not in st.session_state:
+    st.session_state.open_descriptions = set()
     
+# Function to move the job results to another page
+def change_results_page(delta):
+    st.session_state.results_page += delta
+
+def reset_results_page():
+    st.session_state.results_page = 0
+
+# Function to show a job's description. Streamlit runs every expander body
+# on each rerun, so descriptions are only loaded once asked for.
+def open_description(key):
+    st.session_state.open_descriptions.add(key)
+
+# Function to show stage timings and cache stats in the sidebar
+def show_perf_panel():
+    metrics = perf.get_metrics()
+    with st.sidebar.expander("Performance"):
+        stages = metrics.snapshot()
+        if stages:
+            st.table([
+                {"Stage": name, "Calls": stage["count"], "p50 ms": f"{stage['p50'] * 1000:.1f}",
+                 "p95 ms": f"{stage['p95'] * 1000:.1f}", "p99 ms": f"{stage['p99'] * 1000:.1f}"}
+                for name, stage in stages.items()
+            ])
+        else:
+            st.caption("No timings recorded yet")
+        st.table([
+            {"Source": name, "Stat": key, "Value": f"{value:g}"}
+            for name, values in metrics.collect().items() for key, value in values.items()
+        ])
+
 # Function to apply filters to job results
+@perf.timed("apply_filters")
 def apply_filters(jobs):
-    filtered_jobs = []
+    # Read the sidebar filters once instead of once per job
+    filters = filter_state_from_session(st.session_state)
     
-    for job in jobs:
-        # Check remote filter
-        if st.session_state.filter_remote_only and not job.get('job_is_remote', False):
-            continue
-            
-        # Check employment type filter
-        if st.session_state.filter_employment_types and job.get('job_employment_type') not in st.session_state.filter_employment_types:
-            continue
-            
-        # Check date posted filter (in days)
-        if st.session_state.filter_date_posted > 0:
-            current_time = int(time.time())
-            posted_time = job.get('job_posted_at_timestamp', 0)
-            days_ago = (current_time - posted_time) / (60 * 60 * 24)
-            if days_ago > st.session_state.filter_date_posted:
-                continue
-                
-        # Check salary filter
-        if job.get('job_min_salary') is not None and job.get('job_min_salary') < st.session_state.min_salary:
-            continue
-            
-        if job.get('job_max_salary') is not None and job.get('job_max_salary') > st.session_state.max_salary:
-            continue
-            
-        # Check company type filter
-        if st.session_state.filter_company_types and job.get('employer_company_type') not in st.session_state.filter_company_types:
-            continue
-            
-        # All filters passed, add job to filtered results
-        filtered_jobs.append(job)
-        
-    return filtered_jobs
+    # Columns are built once per result set, and only the predicates whose
+    # filter value changed since the last rerun are recomputed
+    job_filter = st.session_state.get('job_filter')
+    if job_filter is None or not job_filter.columns.covers(jobs):
+        job_filter = IncrementalFilter(JobColumns(jobs))
+        st.session_state.job_filter = job_filter
+    
+    return job_filter.apply(filters)
 
 # Resume Upload Section
 st.subheader("Step 1: Upload Your Resume First")
 uploaded_file = st.file_uploader("Upload your resume (PDF format)", type=['pdf'])
 
-if uploaded_file is not None:
-    with st.spinner('Processing your resume...'):
-        # Extract text from the PDF
-        resume_text = extract_text_from_pdf(uploaded_file)
-        st.session_state.resume_text = resume_text
-        
-        # Parse the resume
-        parsed_data = parse_resume_with_gemini(resume_text)
-        st.session_state.parsed_data = parsed_data
-        st.session_state.resume_parsed = True
-        
-        # Display the parsed information
-        with st.expander("Resume Parsed Information", expanded=True):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### Basic Information")
-                basic_info = parsed_data.get("basic_info", {})
-                st.write(f"**Name:** {basic_info.get('name', 'Not found')}")
-                st.write(f"**Email:** {basic_info.get('email', 'Not found')}")
-                st.write(f"**Phone:** {basic_info.get('phone', 'Not found')}")
-                st.write(f"**Location:** {basic_info.get('location', 'Not found')}")
-                
-                st.markdown("### Experience")
-                for exp in parsed_data.get("experience", []):
-                    st.markdown(f"**{exp.get('job_title', 'Role')} at {exp.get('company', 'Company')}**")
-                    st.write(f"*{exp.get('duration', 'Duration not specified')}*")
-                    st.write(exp.get('description', 'No description available'))
-                    st.write("---")
-            
-            with col2:
-                st.markdown("### Skills")
-                
-                # Technical skills
-                st.write("**Technical Skills:**")
-                tech_skills = parsed_data.get("technical_skills", [])
-                if tech_skills:
-                    st.write(", ".join(tech_skills))
-                else:
-                    st.write("No technical skills found")
-                
-                # Soft skills
-                st.write("**Soft Skills:**")
-                soft_skills = parsed_data.get("soft_skills", [])
-                if soft_skills:
-                    st.write(", ".join(soft_skills))
-                else:
-                    st.write("No soft skills found")
-                
-                # General skills
-                st.write("**General Skills:**")
-                skills = parsed_data.get("skills", [])
-                if skills:
-                    st.write(", ".join(skills))
-                else:
-                    st.write("No general skills found")
-                
-                st.markdown("### Education")
-                for edu in parsed_data.get("education", []):
-                    st.write(f"**{edu.get('degree', 'Degree')}** - {edu.get('institution', 'Institution')}")
-                    st.write(f"*{edu.get('year', 'Year not specified')}*")
-                
-                st.write(f"**Years of Experience:** {parsed_data.get('years_of_experience', 'Not specified')}")
+if uploaded_file is not None and uploaded_file.size > MAX_PDF_BYTES:
+    st.warning(f"This PDF is too large to process (limit {MAX_PDF_BYTES // (1024 * 1024)} MB)")
+elif uploaded_file is not None:
+    # Parse in the background so the search section below stays usable
+    resume_job = resume_jobs.submit(uploaded_file.getvalue(), retry_failed=st.session_state.pop('resume_retry', False))
+    st.fragment(show_resume_job, run_every=None if resume_job.finished else RESUME_POLL_SECONDS)(resume_job.key, resume_job.finished)
+
 st.markdown("---")
 st.subheader("Step 2: Search for Jobs")
 
 # Query input
 search_query = st.text_input("Enter your job search query (e.g., 'Python Developer')")
 location = st.text_input("Location (e.g., 'New York', 'Remote')")
+num_pages = st.number_input("Result pages", min_value=1, max_value=10, value=1, step=1)
+fetch_fresh = st.checkbox("Fetch fresh results", help="Search JSearch instead of the postings saved from earlier searches")
 
 # Add filter options to sidebar
 st.sidebar.markdown("### Filter Options")
@@ -341,12 +329,32 @@ if st.button("Search Jobs"):
         with st.spinner('Searching for jobs...'):
             final_query = search_query
             
-            # Search for jobs
-            job_results = search_jobs(final_query, location)
-            
-            # Store the results in session state
-            st.session_state.job_results = job_results.get('data', [])
+            # Store the results in session state as each page lands
+            st.session_state.job_results = []
+            st.session_state.results_page = 0
             st.session_state.search_completed = True
+            
+            # Warm queries are answered from saved postings without an API call
+            started = time.perf_counter()
+            local_jobs = None if fetch_fresh else local_job_search(final_query, location, int(num_pages))
+            if local_jobs is not None:
+                st.session_state.job_results = compact_jobs(local_jobs)
+                st.caption(f"Answered from saved postings in {(time.perf_counter() - started) * 1000:.0f} ms")
+            else:
+                live_results = st.empty()
+                for pages_done, (page, jobs) in enumerate(search_job_pages(final_query, location, int(num_pages)), start=1):
+                    st.session_state.job_results.extend(compact_jobs(jobs))
+                    
+                    # Show what has arrived so far while the remaining pages load
+                    with live_results.container():
+                        st.info(f"Fetched {len(st.session_state.job_results)} jobs ({pages_done}/{int(num_pages)} pages)")
+                        for job in st.session_state.job_results[:20]:
+                            st.write(f"- {job.get('job_title', 'Job Title Not Available')} - {job.get('employer_name', 'Company Not Available')}")
+                live_results.empty()
+                if job_index is not None:
+                    job_index.maybe_save()
+                semantic_ranker.maybe_save()
+            perf.observe("job_search", time.perf_counter() - started)
     else:
         st.warning("Please enter a search query")
 
@@ -363,6 +371,7 @@ if st.session_state.search_completed:
             st.success(f"Found {len(filtered_jobs)} jobs matching your criteria")
             
             # Calculate skill match percentages if resume is uploaded
+            matches = None
             if st.session_state.resume_parsed:
                 # Extract all skills from resume
                 tech_skills = set(st.session_state.parsed_data.get("technical_skills", []))
@@ -370,28 +379,40 @@ if st.session_state.search_completed:
                 soft_skills = set(st.session_state.parsed_data.get("soft_skills", []))
                 all_skills = tech_skills.union(general_skills).union(soft_skills)
                 
-                # Add match score to each job
-                for job in filtered_jobs:
-                    if job.get('job_description'):
-                        desc = job.get('job_description', '').lower()
-                        matched_skills = [skill for skill in all_skills if skill.lower() in desc]
-                        match_percentage = int((len(matched_skills) / max(1, len(all_skills))) * 100)
-                        job['match_percentage'] = match_percentage
-                        job['matched_skills'] = matched_skills
-                    else:
-                        job['match_percentage'] = 0
-                        job['matched_skills'] = []
+                # Compiled once per resume and reused across reruns
+                skill_matcher = get_skill_matcher(all_skills)
+                
+                # Score each job, keeping the results apart from the shared job records
+                scoring_started = time.perf_counter()
+                skill_matches = [
+                    skill_matcher.score_job(job) if job.description_key is not None else (0, [])
+                    for job in filtered_jobs
+                ]
+                
+                # Blend in how close each job is to the resume as a whole
+                semantic_scores = semantic_ranker.score_jobs(
+                    st.session_state.parsed_data, filtered_jobs, [match_percentage for match_percentage, _ in skill_matches])
+                matches = [JobMatch(*skill_match, *semantic) for skill_match, semantic in zip(skill_matches, semantic_scores)]
+                perf.observe("match_scoring", time.perf_counter() - scoring_started)
                 
                 # Option to sort by match percentage
-                sort_by_match = st.checkbox("Sort jobs by skill match percentage", value=True)
+                sort_by_match = st.checkbox("Sort jobs by match to your resume", value=True)
                 if sort_by_match:
-                    filtered_jobs = sorted(filtered_jobs, key=lambda x: x.get('match_percentage', 0), reverse=True)
+                    ranked = sorted(zip(filtered_jobs, matches), key=lambda pair: pair[1].match_score, reverse=True)
+                    filtered_jobs = [job for job, _ in ranked]
+                    matches = [match for _, match in ranked]
+            
+            # Only build widgets for the visible page of results
+            start, end, page, page_count = paginate(len(filtered_jobs), st.session_state.results_page, st.session_state.results_page_size)
+            st.session_state.results_page = page
             
-            for job_idx, job in enumerate(filtered_jobs):
+            render_started = time.perf_counter()
+            for job_idx, job in enumerate(filtered_jobs[start:end], start=start):
+                match = matches[job_idx] if matches is not None else None
                 # Customize job title based on match percentage if resume uploaded
-                if st.session_state.resume_parsed and 'match_percentage' in job:
+                if match is not None:
                     job_title = f"{job_idx+1}. {job.get('job_title', 'Job Title Not Available')} - {job.get('employer_name', 'Company Not Available')} "
-                    job_title += f"[Match: {job.get('match_percentage')}%]"
+                    job_title += f"[Match: {match.match_score}%]"
                 else:
                     job_title = f"{job_idx+1}. {job.get('job_title', 'Job Title Not Available')} - {job.get('employer_name', 'Company Not Available')}"
                 
@@ -417,9 +438,9 @@ if st.session_state.search_completed:
                     
                     with cols[1]:
                         # Enhanced skills match section
-                        if st.session_state.resume_parsed:
-                            match_percentage = job.get('match_percentage', 0)
-                            matched_skills = job.get('matched_skills', [])
+                        if match is not None:
+                            match_percentage = match.match_percentage
+                            matched_skills = match.matched_skills
                             
                             # Create a visual progress bar for match percentage
                             st.markdown("### Skills Match")
@@ -435,6 +456,8 @@ if st.session_state.search_completed:
                             # Display progress bar
                             st.progress(match_percentage / 100)
                             st.markdown(f"<h4 style='color:{bar_color};margin-top:0'>{match_percentage}% Match</h4>", unsafe_allow_html=True)
+                            st.caption(f"Similarity to your resume: {match.semantic_score}% · "
+                                       f"Overall match: {match.match_score}%")
                             
                             if matched_skills:
                                 st.markdown("**Matching Skills:**")
@@ -451,23 +474,34 @@ if st.session_state.search_completed:
                     
                     # Description
                     st.markdown("**Job Description:**")
-                    full_desc = job.get('job_description', 'No description available')
-                    
-                    if len(full_desc) > 1000:
-                        st.markdown(full_desc[:1000] + "...")
-                        if st.button(f"Show Full Description for Job {job_idx+1}", key=f"show_desc_{job_idx}"):
-                            st.markdown(full_desc)
+                    if job.description_key is None:
+                        st.markdown("No description available")
+                    elif job.description_key in st.session_state.open_descriptions:
+                        st.markdown(job.get('job_description', 'No description available'))
                     else:
-                        st.markdown(full_desc)
+                        st.button(f"Show Description for Job {job_idx+1}", key=f"show_desc_{job_idx}",
+                                  on_click=open_description, args=(job.description_key,))
 
                     # Display ALL application links
                     st.markdown("**Apply Links:**")
-                    apply_options = job.get('apply_options', [])
-                    if apply_options:
-                        for option in apply_options:
-                            st.markdown(f"[Apply on {option.get('publisher', 'Job Board')}]({option.get('apply_link')})")
+                    if job.apply_options:
+                        for publisher, apply_link in job.apply_options:
+                            st.markdown(f"[Apply on {publisher or 'Job Board'}]({apply_link})")
                     elif job.get('job_apply_link'):
                         st.markdown(f"[Apply for this job]({job.get('job_apply_link')})")
+            
+            perf.observe("render_results", time.perf_counter() - render_started)
+            
+            # Pagination controls
+            nav_prev, nav_info, nav_next, nav_size = st.columns([1, 2, 1, 1])
+            with nav_prev:
+                st.button("← Previous", on_click=change_results_page, args=(-1,), disabled=page == 0, key="results_prev")
+            with nav_info:
+                st.write(f"Page {page + 1} of {page_count} (jobs {start + 1}-{end} of {len(filtered_jobs)})")
+            with nav_next:
+                st.button("Next →", on_click=change_results_page, args=(1,), disabled=page >= page_count - 1, key="results_next")
+            with nav_size:
+                st.selectbox("Jobs per page", PAGE_SIZES, key="results_page_size", on_change=reset_results_page)
         else:
             st.info("No jobs match your filters. Try adjusting your filter criteria.")
     else:
@@ -496,4 +530,8 @@ if st.session_state.search_completed:
     st.sidebar.success("✅ Job Search Completed")
     st.sidebar.metric("Jobs Found", len(st.session_state.job_results))
 else:
-    st.sidebar.warning("❌ No Search Performed")
\ No newline at end of file
+    st.sidebar.warning("❌ No Search Performed")
+
+# Stage timings and cache stats, for tracking down slow sessions
+if perf.ENABLED:
+    show_perf_panel()
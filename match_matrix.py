@@ -0,0 +1,133 @@
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+from skill_matcher import SkillMatcher, normalize_skill
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+# Jobs scored per block; bounds the dense resumes x block result in memory
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_TOP_K = 10
+
+# Binary sparse matrix in CSR layout: row i has ones at indices[indptr[i]:indptr[i + 1]]
+SkillRows = namedtuple("SkillRows", ["indptr", "indices", "shape"])
+
+# Best jobs per resume and best resumes per job, best first. Ids are row
+# numbers into the resume and job lists; a slot with no match has score 0.
+MatchResult = namedtuple("MatchResult", ["top_jobs", "top_job_scores", "top_resumes", "top_resume_scores"])
+
+
+def _skill_rows(rows, columns):
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter(chain.from_iterable(rows), dtype=np.int32, count=int(indptr[-1]))
+    return SkillRows(indptr, indices, (len(rows), columns))
+
+
+# Function to map every distinct (normalized) resume skill to a column
+def build_vocabulary(resume_skills):
+    vocabulary = {}
+    for skills in resume_skills:
+        for skill in skills:
+            normalized = normalize_skill(skill)
+            if normalized:
+                vocabulary.setdefault(normalized, len(vocabulary))
+    return vocabulary
+
+
+# Function to build the resume x skill matrix
+def resume_skill_rows(resume_skills, vocabulary):
+    rows = []
+    for skills in resume_skills:
+        columns = {vocabulary[normalized] for normalized in map(normalize_skill, skills) if normalized in vocabulary}
+        rows.append(sorted(columns))
+    return _skill_rows(rows, len(vocabulary))
+
+
+# Function to build the job x skill matrix by running one SkillMatcher over
+# the whole vocabulary against every job_description
+def job_skill_rows(jobs, vocabulary):
+    matcher = SkillMatcher(list(vocabulary))
+    rows = []
+    for job in jobs:
+        rows.append(sorted({vocabulary[normalize_skill(skill)] for skill in matcher.match(job.get('job_description') or "")}))
+    return _skill_rows(rows, len(vocabulary))
+
+
+def _dense_block(rows, start, stop):
+    block = np.zeros((stop - start, rows.shape[1]), dtype=np.float32)
+    counts = np.diff(rows.indptr[start:stop + 1])
+    block[np.repeat(np.arange(stop - start), counts), rows.indices[rows.indptr[start]:rows.indptr[stop]]] = 1.0
+    return block
+
+
+def _to_sparse(rows, start, stop):
+    indptr = rows.indptr[start:stop + 1] - rows.indptr[start]
+    indices = rows.indices[rows.indptr[start]:rows.indptr[stop]]
+    return sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                             shape=(stop - start, rows.shape[1]))
+
+
+def _top_k(scores, ids, k):
+    # scores / ids are (rows, candidates); keep the k best per row, best first
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores, ids = np.take_along_axis(scores, keep, axis=1), np.take_along_axis(ids, keep, axis=1)
+    order = np.lexsort((ids, -scores), axis=1)
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+# Function to score every resume against every job. The match percentage
+# is the share of the resume's skills found in the job description, as in
+# SkillMatcher.score. Counts come from one sparse product per block of
+# jobs (resumes x skills times skills x jobs), or a dense BLAS product
+# over the resume skill vocabulary when SciPy isn't installed.
+def match_matrix(resume_rows, job_rows, k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE):
+    resume_count, job_count = resume_rows.shape[0], job_rows.shape[0]
+    resume_sizes = np.maximum(np.diff(resume_rows.indptr), 1).astype(np.float32)
+    k_jobs, k_resumes = min(k, job_count), min(k, resume_count)
+
+    best_job_scores = np.zeros((resume_count, 0), dtype=np.int16)
+    best_jobs = np.zeros((resume_count, 0), dtype=np.int64)
+    top_resumes = np.zeros((job_count, k_resumes), dtype=np.int64)
+    top_resume_scores = np.zeros((job_count, k_resumes), dtype=np.int16)
+    if sparse is not None:
+        resumes = _to_sparse(resume_rows, 0, resume_count)
+    else:
+        resumes = _dense_block(resume_rows, 0, resume_count)
+
+    for start in range(0, job_count, block_size):
+        stop = min(start + block_size, job_count)
+        if sparse is not None:
+            counts = (resumes @ _to_sparse(job_rows, start, stop).T).toarray()
+        else:
+            counts = resumes @ _dense_block(job_rows, start, stop).T
+        # Same rounding as SkillMatcher.score
+        scores = np.floor(counts * (100.0 / resume_sizes)[:, None] + 1e-4).astype(np.int16)
+
+        job_ids = np.broadcast_to(np.arange(start, stop), scores.shape)
+        block_scores, block_jobs = _top_k(scores, job_ids, k_jobs)
+        best_job_scores, best_jobs = _top_k(
+            np.hstack([best_job_scores, block_scores]), np.hstack([best_jobs, block_jobs]), k_jobs)
+
+        resume_ids = np.broadcast_to(np.arange(resume_count), scores.T.shape)
+        top_resume_scores[start:stop], top_resumes[start:stop] = _top_k(scores.T, resume_ids, k_resumes)
+
+    return MatchResult(best_jobs, best_job_scores, top_resumes, top_resume_scores)
+
+
+# Function to match parsed resumes against job postings in one go
+def match_resumes_to_jobs(parsed_resumes, jobs, k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE):
+    resume_skills = [
+        list(parsed.get("technical_skills") or []) + list(parsed.get("skills") or []) + list(parsed.get("soft_skills") or [])
+        for parsed in parsed_resumes
+    ]
+    vocabulary = build_vocabulary(resume_skills)
+    resume_rows = resume_skill_rows(resume_skills, vocabulary)
+    job_rows = job_skill_rows(jobs, vocabulary)
+    return match_matrix(resume_rows, job_rows, k, block_size)
@@ -0,0 +1,164 @@
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+import perf
+
+# Caps on what we are willing to extract from one upload
+MAX_PDF_BYTES = int(os.getenv("PDF_MAX_BYTES", 20 * 1024 * 1024))
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 200))
+MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 400_000))
+
+# Documents with at least this many pages are split across the process pool,
+# when there is more than one worker to split them across
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 32))
+PAGES_PER_TASK = 16
+
+# Text of the extracted pages, and how many pages the document has in total
+ExtractedPDF = namedtuple("ExtractedPDF", ["pages", "page_count"])
+
+
+class PDFTooLargeError(ValueError):
+    pass
+
+
+# Function to get the raw bytes of an uploaded file, file object or bytes
+def read_pdf_bytes(pdf_file):
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    if hasattr(pdf_file, "seek"):
+        pdf_file.seek(0)
+    return pdf_file.read()
+
+
+# Function to yield the text of pages [start, stop) in order. The reader
+# caches every object it resolves, so the cache is dropped after each page
+# to keep only one page's content streams in memory at a time.
+def _iter_reader_pages(reader, start, stop):
+    for page_num in range(start, min(stop, len(reader.pages))):
+        text = reader.pages[page_num].extract_text() or ""
+        reader.resolved_objects.clear()
+        yield text
+
+
+# Runs in a worker process: extract pages [start, stop) of the document
+# saved at path. Workers get the path rather than the bytes, so the PDF
+# isn't pickled over to the pool once per task.
+def _extract_page_range(path, start, stop):
+    return list(_iter_reader_pages(PyPDF2.PdfReader(path), start, stop))
+
+
+def _unlink(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# Function to delete path once every one of futures has finished or been
+# cancelled, without waiting for them
+def _unlink_when_done(futures, path):
+    remaining = [future for future in futures if not future.done()]
+    if not remaining:
+        _unlink(path)
+        return
+    lock = threading.Lock()
+    left = [len(remaining)]
+
+    def done(_):
+        with lock:
+            left[0] -= 1
+            last = left[0] == 0
+        if last:
+            _unlink(path)
+
+    for future in remaining:
+        future.add_done_callback(done)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# Function to get the process pool used for large documents. Workers are
+# spawned rather than forked because the Streamlit server is multi-threaded.
+def get_pdf_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, PDF_EXTRACT_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+# Function to yield page texts in order, extracting chunks of pages in
+# parallel across the process pool. The document is only opened here to
+# count its pages when page_count isn't given. It is written to a temp file
+# once for the workers to read, removed when the last chunk is done.
+def iter_pdf_pages_parallel(pdf_bytes, max_pages=MAX_PAGES, executor=None, page_count=None):
+    if page_count is None:
+        page_count = len(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)).pages)
+    page_count = min(page_count, max_pages)
+    executor = executor or get_pdf_executor()
+    with tempfile.NamedTemporaryFile(prefix="resume-", suffix=".pdf", delete=False) as f:
+        f.write(pdf_bytes)
+    futures = []
+    try:
+        for start in range(0, page_count, PAGES_PER_TASK):
+            futures.append(executor.submit(_extract_page_range, f.name, start, min(start + PAGES_PER_TASK, page_count)))
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        _unlink_when_done(futures, f.name)
+
+
+# Function to extract the text of each page of a PDF. Pages are streamed,
+# extraction stops at max_pages / max_chars, and large documents are
+# extracted in parallel on multi-core hosts unless parallel=False. The
+# document is parsed once here; the reader that counts its pages also
+# extracts them unless they go to the process pool.
+@perf.timed("pdf_extract")
+def extract_pdf_pages(pdf_file, max_pages=MAX_PAGES, max_chars=MAX_CHARS,
+                      max_bytes=MAX_PDF_BYTES, parallel=None):
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    if len(pdf_bytes) > max_bytes:
+        raise PDFTooLargeError(f"PDF is {len(pdf_bytes) // 1024} KB, the limit is {max_bytes // 1024} KB")
+
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    if parallel is None:
+        parallel = PDF_EXTRACT_WORKERS > 1 and page_count >= PARALLEL_MIN_PAGES
+    if parallel:
+        pages = iter_pdf_pages_parallel(pdf_bytes, max_pages, page_count=page_count)
+    else:
+        pages = _iter_reader_pages(reader, 0, max_pages)
+
+    parts = []
+    remaining = max_chars
+    for text in pages:
+        if len(text) >= remaining:
+            parts.append(text[:remaining])
+            break
+        parts.append(text)
+        remaining -= len(text)
+    pages.close()
+    return ExtractedPDF(parts, page_count)
+
+
+# Function to extract text from PDF, pages joined once
+def extract_text_from_pdf(pdf_file, max_pages=MAX_PAGES, max_chars=MAX_CHARS,
+                          max_bytes=MAX_PDF_BYTES, parallel=None):
+    return "\n".join(extract_pdf_pages(pdf_file, max_pages, max_chars, max_bytes, parallel).pages)
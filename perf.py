@@ -0,0 +1,231 @@
+import bisect
+import functools
+import os
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stage timing is off unless PERF_METRICS is set; span() and timed() are
+# then a shared no-op context manager and the undecorated function
+ENABLED = os.getenv("PERF_METRICS", "").lower() in ("1", "true", "yes", "on")
+
+# Histogram bucket upper bounds in seconds, as exported to Prometheus
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Recent samples kept per stage for the p50 / p95 / p99 estimates
+RESERVOIR_SIZE = 2048
+DEFAULT_EXPORT_SECONDS = 15
+
+METRIC_PREFIX = "aijobfinder"
+_NON_METRIC = re.compile(r"[^a-zA-Z0-9_]")
+
+
+# Latency histogram for one stage: cumulative-style bucket counts for
+# export plus a window of recent samples for percentiles
+class StageHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._collectors = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = StageHistogram()
+            histogram.observe(seconds)
+
+    # Register a function returning a dict of numbers (e.g. a cache's
+    # stats()) to be exported as gauges alongside the stage timings
+    def register_collector(self, name, collect):
+        with self._lock:
+            self._collectors[name] = collect
+
+    # Returns {stage: {count, mean, p50, p95, p99, max}} in seconds
+    def snapshot(self):
+        with self._lock:
+            stages = {name: (h.count, h.sum, h.max, list(h.recent)) for name, h in self._stages.items()}
+        snapshot = {}
+        for name, (count, total, longest, recent) in sorted(stages.items()):
+            recent.sort()
+            snapshot[name] = {"count": count, "mean": total / count if count else 0.0,
+                              "p50": _percentile(recent, 0.5), "p95": _percentile(recent, 0.95),
+                              "p99": _percentile(recent, 0.99), "max": longest}
+        return snapshot
+
+    # Returns {collector: {key: number}}, skipping values that aren't numbers
+    def collect(self):
+        with self._lock:
+            collectors = dict(self._collectors)
+        collected = {}
+        for name, collect in sorted(collectors.items()):
+            try:
+                values = collect()
+            except Exception:
+                continue
+            collected[name] = {key: float(value) for key, value in values.items()
+                               if isinstance(value, (int, float))}
+        return collected
+
+    # Function to render everything in the Prometheus text exposition format
+    def prometheus_text(self):
+        with self._lock:
+            stages = {name: (list(h.buckets), h.count, h.sum) for name, h in self._stages.items()}
+        metric = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [f"# HELP {metric} Time spent in each pipeline stage.", f"# TYPE {metric} histogram"]
+        for name, (buckets, count, total) in sorted(stages.items()):
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS + (float("inf"),), buckets):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {count}')
+        for name, values in self.collect().items():
+            for key, value in sorted(values.items()):
+                gauge = _NON_METRIC.sub("_", f"{METRIC_PREFIX}_{name}_{key}")
+                lines.append(f"# TYPE {gauge} gauge")
+                lines.append(f"{gauge} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+# Context manager timing a stage:  with perf.span("pdf_extract"): ...
+def span(stage):
+    return _Span(stage) if ENABLED else _NOOP_SPAN
+
+
+# Decorator timing every call of a function as a stage
+def timed(stage):
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Function to record a duration measured elsewhere
+def observe(stage, seconds):
+    if ENABLED:
+        _metrics.observe(stage, seconds)
+
+
+def register_collector(name, collect):
+    if ENABLED:
+        _metrics.register_collector(name, collect)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _export_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            _metrics.write_prometheus(path)
+        except OSError:
+            pass
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+# Function to start the optional exporters once per process: a /metrics
+# endpoint on PERF_METRICS_HOST:PERF_METRICS_PORT and/or a file rewritten every
+# PERF_EXPORT_SECONDS at PERF_METRICS_FILE (for a textfile collector)
+def start_exporters():
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started or not ENABLED:
+            return
+        _exporters_started = True
+        port = os.getenv("PERF_METRICS_PORT")
+        if port:
+            server = ThreadingHTTPServer((os.getenv("PERF_METRICS_HOST", "127.0.0.1"), int(port)), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="perf-metrics-http", daemon=True).start()
+        path = os.getenv("PERF_METRICS_FILE")
+        if path:
+            interval = float(os.getenv("PERF_EXPORT_SECONDS", DEFAULT_EXPORT_SECONDS))
+            threading.Thread(target=_export_loop, args=(path, interval), name="perf-metrics-file", daemon=True).start()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import perf
+
+# Bump this whenever the Gemini prompt changes so stale parses are not reused
+PROMPT_VERSION = "2"
+
+# Default on-disk tier settings (set RESUME_CACHE_DIR to "" to disable it)
+DEFAULT_CACHE_DIR = os.path.join(".cache", "resume_parse")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_DISK_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 128
+
+
+# Function to build a content-addressed key for a resume parsed by parser
+def resume_cache_key(pdf_bytes, schema, parser, prompt_version=PROMPT_VERSION):
+    digest = hashlib.sha256()
+    digest.update(pdf_bytes)
+    digest.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    digest.update(parser.encode("utf-8"))
+    digest.update(prompt_version.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Two-tier cache for parsed resumes: an in-process LRU in front of an
+# optional directory of JSON files with TTL and size-based eviction
+class ResumeParseCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or None
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._evict_disk()
+
+    # Drop expired files, then the oldest ones until we fit in max_disk_bytes
+    def _evict_disk(self):
+        now = time.time()
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._unlink(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    def _unlink(self, path):
+        try:
+            os.remove(path)
+            self._stats["evictions"] += 1
+        except OSError:
+            pass
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+            value = self._read_disk(key)
+            if value is not None:
+                self._remember(key, value)
+                self._stats["disk_hits"] += 1
+                return value
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._write_disk(key, value)
+            self._stats["stores"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir:
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".json"):
+                        self._unlink(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# Function to get the process-wide cache shared by all Streamlit sessions
+def get_resume_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResumeParseCache(
+                max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                cache_dir=os.getenv("RESUME_CACHE_DIR", DEFAULT_CACHE_DIR),
+                ttl_seconds=float(os.getenv("RESUME_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                max_disk_bytes=int(os.getenv("RESUME_CACHE_MAX_DISK_BYTES", DEFAULT_MAX_DISK_BYTES)),
+            )
+            perf.register_collector("resume_cache", _cache.stats)
+        return _cache
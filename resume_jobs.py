@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import perf
+from local_resume_parser import LOCAL_PARSE_MODE, MIN_CONFIDENCE, MIN_FALLBACK_CONFIDENCE, parse_resume_locally
+from pdf_extract import extract_pdf_pages
+from resume_cache import get_resume_cache, resume_cache_key
+from resume_parser import CACHE_PARSER, RESUME_SCHEMA, parse_resume_with_gemini
+from resume_text_prep import prepare_resume_text
+
+# Resume job statuses, in the order a job moves through them
+QUEUED = "queued"
+EXTRACTING = "extracting"
+PARSING = "parsing"
+DONE = "done"
+FAILED = "failed"
+
+STATUS_LABELS = {
+    QUEUED: "Waiting to be processed...",
+    EXTRACTING: "Reading your resume...",
+    PARSING: "Analyzing your resume with AI...",
+    DONE: "Resume successfully parsed!",
+    FAILED: "Could not parse your resume",
+}
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_JOBS = 256
+
+
+# One resume being processed in the background, identified by its cache key
+class ResumeJob:
+    def __init__(self, key):
+        self.key = key
+        self.status = QUEUED
+        self.parsed_data = None
+        self.errors = []
+        # Estimated prompt tokens of the resume text before / after compaction
+        self.tokens_before = None
+        self.tokens_after = None
+        # Pages in the uploaded PDF, read or not
+        self.page_count = None
+        # "gemini" or "local", and the local parser's confidence if it ran
+        self.parser = None
+        self.local_confidence = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def _finish(self, status):
+        self.status = status
+        self.finished_at = time.time()
+
+
+# Runs resume extraction and parsing on a thread pool so the Streamlit
+# script never waits on PyPDF2 or Gemini. Jobs are keyed by resume hash:
+# uploading the same resume again (from any session) attaches to the job
+# already running, and parses already in the resume cache finish at once.
+# Only Gemini parses are cached, and only the parse, never the resume text.
+class ResumeJobManager:
+    def __init__(self, workers=DEFAULT_WORKERS, cache=None, max_jobs=DEFAULT_MAX_JOBS):
+        self.cache = cache
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._tokens = {"before": 0, "after": 0}
+
+    # Function to get the job for a resume, starting one if needed. A failed
+    # job is only run again when retry_failed is set.
+    def submit(self, pdf_bytes, retry_failed=False):
+        key = resume_cache_key(pdf_bytes, RESUME_SCHEMA, CACHE_PARSER)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (retry_failed and job.status == FAILED):
+                self._jobs.move_to_end(key)
+                return job
+            job = ResumeJob(key)
+            self._jobs[key] = job
+            self._evict()
+
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            job.parsed_data = cached["parsed_data"]
+            job.parser = "gemini"
+            job._finish(DONE)
+        else:
+            self._executor.submit(self._run, job, pdf_bytes)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    # Drop the oldest finished jobs once there are too many
+    def _evict(self):
+        excess = len(self._jobs) - self.max_jobs
+        for key in [key for key, job in self._jobs.items() if job.finished][:max(0, excess)]:
+            del self._jobs[key]
+
+    def _finish_parsed(self, job, parsed_data, parser):
+        job.parsed_data = parsed_data
+        job.parser = parser
+        # Local parses are cheap to redo and not worth keeping on disk
+        if self.cache is not None and parser == "gemini":
+            self.cache.put(job.key, {"parsed_data": parsed_data})
+        job._finish(DONE)
+
+    def _run(self, job, pdf_bytes):
+        try:
+            job.status = EXTRACTING
+            extracted = extract_pdf_pages(pdf_bytes)
+            job.page_count = extracted.page_count
+            with perf.span("resume_text_prep"):
+                prepared = prepare_resume_text(extracted.pages)
+            job.tokens_before, job.tokens_after = prepared.tokens_before, prepared.tokens_after
+            with self._lock:
+                self._tokens["before"] += prepared.tokens_before
+                self._tokens["after"] += prepared.tokens_after
+
+            local_data = None
+            if LOCAL_PARSE_MODE != "off":
+                with perf.span("resume_parse_local"):
+                    local_data, job.local_confidence = parse_resume_locally(prepared.text)
+                # Cleanly structured resumes don't need the Gemini round trip
+                if LOCAL_PARSE_MODE == "fast" and job.local_confidence >= MIN_CONFIDENCE:
+                    self._finish_parsed(job, local_data, "local")
+                    return
+
+            job.status = PARSING
+            with perf.span("resume_parse_gemini"):
+                parsed_data = parse_resume_with_gemini(prepared.text, on_error=job.errors.append)
+
+            # Failed parses come back as None, don't cache those
+            if parsed_data is None:
+                if local_data is not None and job.local_confidence >= MIN_FALLBACK_CONFIDENCE:
+                    job.errors.append("Showing a basic parse of your resume instead")
+                    self._finish_parsed(job, local_data, "local")
+                else:
+                    job._finish(FAILED)
+                return
+            self._finish_parsed(job, parsed_data, "gemini")
+        except Exception as e:
+            job.errors.append(f"Error processing resume: {str(e)}")
+            job._finish(FAILED)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            counts["tokens_before"] = self._tokens["before"]
+            counts["tokens_after"] = self._tokens["after"]
+            return counts
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+# Function to get the process-wide resume job manager
+def get_resume_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ResumeJobManager(
+                workers=int(os.getenv("RESUME_JOB_WORKERS", DEFAULT_WORKERS)),
+                cache=get_resume_cache(),
+            )
+            perf.register_collector("resume_jobs", _manager.stats)
+        return _manager
@@ -0,0 +1,239 @@
+import json
+import os
+import re
+
+from gemini_client import get_gemini_client
+
+# Define the JSON schema for resume parsing
+RESUME_SCHEMA = {
+    "schema": {
+        "basic_info": {
+            "name": "string",
+            "email": "string",
+            "phone": "string",
+            "location": "string"
+        },
+        "professional_summary": "string",
+        "skills": ["string"],
+        "technical_skills": ["string"],
+        "soft_skills": ["string"],
+        "experience": [{
+            "job_title": "string",
+            "company": "string",
+            "duration": "string",
+            "description": "string"
+        }],
+        "education": [{
+            "degree": "string",
+            "institution": "string",
+            "year": "string"
+        }],
+        "certifications": ["string"],
+        "years_of_experience": "number"
+    }
+}
+
+# "structured" asks Gemini for schema-constrained JSON and validates it;
+# "prompt" is the original free-form prompt with the schema pasted in
+PARSE_MODE = os.getenv("RESUME_PARSE_MODE", "structured")
+# Names the parser in resume cache keys, so switching the parse mode doesn't
+# serve parses made the other way
+CACHE_PARSER = f"gemini-{PARSE_MODE}"
+
+# How many times fields that fail validation are asked for again
+MAX_FIELD_RETRIES = 1
+
+_JSON_FENCE = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_LIST_SEPARATORS = re.compile(r'\s*[,;\n]\s*')
+
+
+class FieldError(ValueError):
+    pass
+
+
+# Function to turn a RESUME_SCHEMA template into a Gemini response schema
+def response_schema(spec):
+    if isinstance(spec, dict):
+        return {
+            "type": "OBJECT",
+            "properties": {key: response_schema(value) for key, value in spec.items()},
+            "required": list(spec),
+        }
+    if isinstance(spec, list):
+        return {"type": "ARRAY", "items": response_schema(spec[0])}
+    if spec == "number":
+        return {"type": "NUMBER", "nullable": True}
+    return {"type": "STRING"}
+
+
+# Function to build the value used when a field is missing
+def empty_value(spec):
+    if isinstance(spec, dict):
+        return {key: empty_value(value) for key, value in spec.items()}
+    if isinstance(spec, list):
+        return []
+    return None if spec == "number" else ""
+
+
+def _coerce_string(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float, bool)):
+        return str(value)
+    raise FieldError(f"expected a string, got {type(value).__name__}")
+
+
+# Numbers may come back as strings such as "5+ years"
+def _coerce_number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if float(value).is_integer() else value
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        match = _NUMBER.search(value)
+        if match:
+            return _coerce_number(float(match.group()))
+    raise FieldError(f"expected a number, got {value!r}")
+
+
+# Function to compile a RESUME_SCHEMA template into a function that
+# coerces a value to that shape or raises FieldError
+def compile_validator(spec):
+    if isinstance(spec, dict):
+        fields = {key: (compile_validator(value), value) for key, value in spec.items()}
+
+        def coerce_object(value):
+            if value is None:
+                return empty_value(spec)
+            if not isinstance(value, dict):
+                raise FieldError(f"expected an object, got {type(value).__name__}")
+            return {key: coerce(value[key]) if key in value else empty_value(field_spec)
+                    for key, (coerce, field_spec) in fields.items()}
+        return coerce_object
+
+    if isinstance(spec, list):
+        coerce_item = compile_validator(spec[0])
+
+        def coerce_array(value):
+            if value is None:
+                return []
+            if isinstance(value, str) and not isinstance(spec[0], dict):
+                value = [item for item in _LIST_SEPARATORS.split(value) if item]
+            elif isinstance(value, dict):
+                value = [value]
+            if not isinstance(value, list):
+                raise FieldError(f"expected an array, got {type(value).__name__}")
+            return [coerce_item(item) for item in value]
+        return coerce_array
+
+    return _coerce_number if spec == "number" else _coerce_string
+
+
+_FIELD_VALIDATORS = {key: compile_validator(spec) for key, spec in RESUME_SCHEMA["schema"].items()}
+
+
+# Function to validate parsed resume data field by field (all top-level
+# fields, or just `fields`). Returns the coerced valid fields and the
+# names of the fields that were missing or invalid.
+def validate_resume(data, fields=None):
+    fields = list(_FIELD_VALIDATORS) if fields is None else fields
+    if not isinstance(data, dict):
+        return {}, list(fields)
+    result = {}
+    failed = []
+    for key in fields:
+        if key not in data:
+            failed.append(key)
+            continue
+        try:
+            result[key] = _FIELD_VALIDATORS[key](data[key])
+        except FieldError:
+            failed.append(key)
+    return result, failed
+
+
+def _load_json(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Try to extract JSON from the text if not directly parseable
+        json_match = _JSON_FENCE.search(text)
+        if json_match:
+            return json.loads(json_match.group(1))
+        raise
+
+
+# Function to parse resume with Gemini. Failures are reported through
+# on_error (e.g. st.error) and return None.
+def parse_resume_with_gemini(resume_text, on_error=None, mode=None):
+    if (mode or PARSE_MODE) == "structured":
+        return parse_resume_structured(resume_text, on_error=on_error)
+    report = on_error or (lambda message: None)
+    try:
+        # Construct the prompt with schema
+        prompt = (
+            "Parse the following resume text and extract information according to this exact JSON schema:\n"
+            f"{json.dumps(RESUME_SCHEMA, separators=(',', ':'))}\n\n"
+            f"Resume text:\n{resume_text}\n\n"
+            "Make sure to follow the schema exactly. If any information is not available, use empty strings or empty arrays as appropriate.\n"
+            "Return ONLY the JSON object with no additional text."
+        )
+
+        # Generate the response on the shared, concurrency-limited client
+        response = get_gemini_client().generate_content(prompt)
+
+        # Parse the response to get JSON
+        try:
+            return _load_json(response.text)
+        except json.JSONDecodeError:
+            report("Could not parse the response as JSON")
+            return None
+    except Exception as e:
+        report(f"Error parsing resume: {str(e)}")
+        return None
+
+
+def _request_fields(resume_text, fields):
+    spec = {key: RESUME_SCHEMA["schema"][key] for key in fields}
+    prompt = (
+        "Extract the following fields from the resume below. If any information is not available, "
+        "use empty strings, empty arrays or null as appropriate.\n"
+        f"Fields: {json.dumps(spec, separators=(',', ':'))}\n\n"
+        f"Resume text:\n{resume_text}"
+    )
+    config = {"response_mime_type": "application/json", "response_schema": response_schema(spec)}
+    response = get_gemini_client().generate_content(prompt, config=config)
+    return _load_json(response.text)
+
+
+# Function to parse resume with schema-constrained JSON output. The reply
+# is validated field by field and only the fields that fail are requested
+# again; fields still invalid after that are left empty.
+def parse_resume_structured(resume_text, on_error=None, max_retries=MAX_FIELD_RETRIES):
+    report = on_error or (lambda message: None)
+    parsed = {}
+    failed = list(RESUME_SCHEMA["schema"])
+    error = None
+    for _ in range(max_retries + 1):
+        try:
+            data = _request_fields(resume_text, failed)
+        except Exception as e:
+            error = e
+            continue
+        fixed, failed = validate_resume(data, failed)
+        parsed.update(fixed)
+        if not failed:
+            break
+
+    if not parsed:
+        report(f"Error parsing resume: {str(error)}" if error else "Could not parse the response as resume data")
+        return None
+    if failed:
+        report(f"Could not read {', '.join(failed)} from your resume")
+        parsed.update((key, empty_value(RESUME_SCHEMA["schema"][key])) for key in failed)
+    return {key: parsed[key] for key in RESUME_SCHEMA["schema"]}
@@ -0,0 +1,179 @@
+import os
+import re
+from collections import Counter, namedtuple
+
+# Token budget for the resume text sent to Gemini
+DEFAULT_TOKEN_BUDGET = 6000
+CHARS_PER_TOKEN = 4
+
+# Section headers we recognize, mapped to a canonical section name
+SECTION_ALIASES = {
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "about me": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "education": "education",
+    "academic background": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "key skills": "skills",
+    "soft skills": "skills",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses and certifications": "certifications",
+    "projects": "projects",
+    "personal projects": "projects",
+    "publications": "publications",
+    "awards": "awards",
+    "honors and awards": "awards",
+    "languages": "languages",
+    "interests": "interests",
+    "hobbies": "interests",
+    "volunteer experience": "volunteering",
+    "volunteering": "volunteering",
+    "references": "references",
+}
+
+# Order in which sections are given up when the text is over budget. The
+# header (contact details) and the sections every schema field comes from
+# are never dropped, only shortened.
+DROP_ORDER = ["references", "interests", "publications", "volunteering", "awards", "languages", "projects"]
+
+_SPACES = re.compile(r"[ \t\u00a0\u200b]+")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_HEADER_PUNCTUATION = re.compile(r"[:\-–—_|•]+")
+
+# Lines at least this long are dropped when they repeat anywhere in the text
+MIN_DEDUPE_LENGTH = 30
+# Lines looked at for running headers / footers at each end of a page
+EDGE_LINES = 3
+
+PreparedText = namedtuple("PreparedText", ["text", "tokens_before", "tokens_after", "dropped_sections"])
+Section = namedtuple("Section", ["name", "lines"])
+
+
+# Function to estimate the Gemini token count of some text
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _normalize_lines(page):
+    return [line for line in (_SPACES.sub(" ", line).strip() for line in page.splitlines()) if line]
+
+
+# Function to find lines repeated at the top or bottom of most pages
+def _running_lines(pages):
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        edges = lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+        counts.update({_DIGITS.sub("#", line) for line in edges})
+    threshold = max(2, len(pages) // 2 + 1)
+    return {line for line, count in counts.items() if count >= threshold}
+
+
+# Function to clean extracted page texts: normalizes whitespace, strips
+# page numbers and running headers/footers, and drops repeated lines
+def clean_pages(pages):
+    pages = [_normalize_lines(page) for page in pages]
+    running = _running_lines(pages)
+    seen = set()
+    cleaned = []
+    for page_num, lines in enumerate(pages):
+        for line_num, line in enumerate(lines):
+            if _PAGE_NUMBER.match(line):
+                continue
+            # Keep the first copy of a running header (usually the name)
+            if _DIGITS.sub("#", line) in running and (page_num > 0 or line_num >= EDGE_LINES):
+                continue
+            if cleaned and cleaned[-1] == line:
+                continue
+            if len(line) >= MIN_DEDUPE_LENGTH:
+                if line in seen:
+                    continue
+                seen.add(line)
+            cleaned.append(line)
+    return "\n".join(cleaned)
+
+
+# Function to get the canonical section name for a header line, or None
+def section_name(line):
+    if len(line) > 40:
+        return None
+    key = _HEADER_PUNCTUATION.sub(" ", line).strip().lower()
+    return SECTION_ALIASES.get(_SPACES.sub(" ", key).replace("&", "and"))
+
+
+# Function to split resume text into sections. Lines before the first
+# recognized header go into a "header" section.
+def split_sections(text):
+    sections = [Section("header", [])]
+    for line in text.splitlines():
+        name = section_name(line)
+        if name is not None:
+            sections.append(Section(name, [line]))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.lines]
+
+
+def _join(sections):
+    return "\n".join(line for section in sections for line in section.lines)
+
+
+def _section_size(section):
+    return sum(len(line) + 1 for line in section.lines)
+
+
+# Function to fit resume text into a token budget: low-value sections are
+# dropped first, then every remaining section is cut to its share of the
+# budget, keeping its header and first lines
+def truncate_to_budget(text, token_budget):
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text, []
+    sections = split_sections(text)
+    dropped = []
+    for name in DROP_ORDER:
+        if len(_join(sections)) <= max_chars:
+            break
+        if any(section.name == name for section in sections):
+            sections = [section for section in sections if section.name != name]
+            dropped.append(name)
+
+    total = sum(_section_size(section) for section in sections)
+    if total > max_chars:
+        shortened = []
+        for section in sections:
+            allowance = max_chars * _section_size(section) // total
+            lines, used = [], 0
+            for line in section.lines:
+                if used + len(line) + 1 > allowance:
+                    if not lines:
+                        lines.append(line[:max(0, allowance - 1)])
+                    break
+                lines.append(line)
+                used += len(line) + 1
+            shortened.append(Section(section.name, lines))
+        sections = shortened
+    return _join(sections), dropped
+
+
+# Function to prepare extracted resume pages for the Gemini prompt
+def prepare_resume_text(pages, token_budget=None):
+    if isinstance(pages, str):
+        pages = [pages]
+    token_budget = token_budget or int(os.getenv("RESUME_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+    tokens_before = sum(estimate_tokens(page) for page in pages)
+    text, dropped = truncate_to_budget(clean_pages(pages), token_budget)
+    return PreparedText(text, tokens_before, estimate_tokens(text), dropped)
@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import perf
+
+# Postings change within hours, so cached searches expire fairly quickly
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Common spellings of the same location, mapped to the form sent upstream
+LOCATION_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "new york, ny": "new york",
+    "ny": "new york",
+    "sf": "san francisco",
+    "san francisco, ca": "san francisco",
+    "bay area": "san francisco",
+    "la": "los angeles",
+    "los angeles, ca": "los angeles",
+    "dc": "washington dc",
+    "washington, dc": "washington dc",
+    "washington d.c.": "washington dc",
+    "uk": "united kingdom",
+    "usa": "united states",
+    "us": "united states",
+    "u.s.": "united states",
+    "bangalore": "bengaluru",
+    "bombay": "mumbai",
+    "gurgaon": "gurugram",
+    "wfh": "remote",
+    "work from home": "remote",
+    "anywhere": "remote",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Function to normalize a search so equivalent queries share a cache entry
+def normalize_search(query, location=""):
+    query = _WHITESPACE.sub(" ", query or "").strip().lower()
+    location = _WHITESPACE.sub(" ", location or "").strip().lower()
+    location = LOCATION_ALIASES.get(location, location)
+    return query, location
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+# TTL + LRU cache for search responses, bounded by the approximate size of
+# the cached JSON. Concurrent misses for the same key are coalesced so only
+# one upstream call is made ("single flight").
+class SearchResultCache:
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "upstream_calls": 0,
+                       "upstream_errors": 0, "expired": 0, "evictions": 0}
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if now >= expires_at:
+            self._drop(key)
+            self._stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key, value, now):
+        size = len(json.dumps(value, separators=(",", ":")))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (value, now + self.ttl_seconds, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._stats["evictions"] += 1
+
+    def get(self, key):
+        with self._lock:
+            return self._lookup(key, time.monotonic())
+
+    # Returns the cached value for key, or calls fetch() once no matter how
+    # many threads ask for the same key at the same time
+    def get_or_fetch(self, key, fetch):
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is not None:
+                self._stats["hits"] += 1
+                return value
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self._stats["misses"] += 1
+                self._stats["upstream_calls"] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats["upstream_errors"] += 1
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.result, time.monotonic())
+            return flight.result
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["saved_calls"] = stats["hits"] + stats["coalesced"]
+        stats["hit_ratio"] = stats["saved_calls"] / lookups if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# Function to get the process-wide search cache shared by all sessions
+def get_search_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchResultCache(
+                ttl_seconds=float(os.getenv("JSEARCH_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                max_bytes=int(os.getenv("JSEARCH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            )
+            perf.register_collector("search_cache", _cache.stats)
+        return _cache
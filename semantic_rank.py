@@ -0,0 +1,305 @@
+import json
+import os
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+import perf
+
+DEFAULT_VECTOR_DIR = os.path.join(".cache", "job_vectors")
+DEFAULT_DIM = 1024
+# Jobs embedded per call on ingest
+DEFAULT_BATCH_SIZE = 64
+# Save the vectors to disk once this many were added or removed
+DEFAULT_SAVE_EVERY = 200
+
+# Weight of semantic similarity against the skill-match percentage
+DEFAULT_SEMANTIC_WEIGHT = 0.5
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+# Function to hash a word into (columns, signs) of its embedding features:
+# the word itself plus its character 3- and 4-grams, so inflections and
+# spelling variants ("Postgres" / "PostgreSQL") share most of their features
+@lru_cache(maxsize=200000)
+def _word_features(word, dim):
+    padded = f"<{word}>"
+    features = ["w:" + word]
+    for n in (3, 4):
+        features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    hashes = np.array([zlib.crc32(feature.encode()) for feature in features], dtype=np.int64)
+    return hashes % dim, np.where((hashes // dim) & 1, 1.0, -1.0)
+
+
+# CPU-only embedder with no model to download: hashed bag of words and
+# character n-grams, log-scaled and L2-normalized
+class HashingEmbedder:
+    def __init__(self, dim=DEFAULT_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for word in _WORD.findall(str(text or "").lower()):
+                counts[word] = counts.get(word, 0) + 1
+            for word, count in counts.items():
+                columns, signs = _word_features(word, self.dim)
+                np.add.at(vectors[row], columns, signs * (1.0 + np.log(count)))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+# Embedder backed by a local sentence-transformers model, run on the CPU
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = model_name.replace("/", "--")
+
+    def embed(self, texts):
+        vectors = self._model.encode(list(texts), batch_size=DEFAULT_BATCH_SIZE, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+# Function to build the embedder named by EMBEDDING_MODEL, falling back to
+# hashing when sentence-transformers isn't installed
+def get_embedder(model_name=None):
+    model_name = model_name if model_name is not None else os.getenv("EMBEDDING_MODEL", "hashing")
+    if model_name and model_name != "hashing":
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except ImportError:
+            pass
+    return HashingEmbedder(int(os.getenv("EMBEDDING_DIM", DEFAULT_DIM)))
+
+
+# Function to get the text a job is embedded from
+def job_text(job):
+    return "\n".join(str(job.get(key) or "") for key in ("job_title", "employer_name", "job_description"))
+
+
+# Function to get the text a parsed resume is embedded from
+def resume_text(parsed_data):
+    parts = [parsed_data.get("professional_summary") or ""]
+    for key in ("technical_skills", "skills", "certifications"):
+        parts.append(", ".join(str(value) for value in parsed_data.get(key) or []))
+    for experience in parsed_data.get("experience") or []:
+        if isinstance(experience, dict):
+            parts.append(f"{experience.get('job_title') or ''} {experience.get('description') or ''}")
+    return "\n".join(part for part in parts if part)
+
+
+# Persistent store of unit-length job vectors keyed by job_id
+class VectorIndex:
+    def __init__(self, dim, path=None, save_every=DEFAULT_SAVE_EVERY):
+        self.dim = dim
+        self.path = path or None
+        self.save_every = save_every
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._ids = []
+        self._row_of = {}
+        self._changes = 0
+        self._save_lock = threading.Lock()
+        self._saving = False
+        if self.path:
+            self._load()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, job_id):
+        return job_id in self._row_of
+
+    def job_ids(self):
+        with self._lock:
+            return list(self._ids)
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.path, "ids.json")) as f:
+                ids = json.load(f)
+            vectors = np.load(os.path.join(self.path, "vectors.npy"))
+        except (OSError, ValueError):
+            return
+        if vectors.shape != (len(ids), self.dim):
+            return
+        self._vectors, self._size = vectors.astype(np.float32), len(ids)
+        self._ids = ids
+        self._row_of = {job_id: row for row, job_id in enumerate(ids)}
+
+    # Function to write the vectors to disk. Only copying them out holds the
+    # index lock; vectors added or removed while the files are written count
+    # towards the next save.
+    def save(self):
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                vectors = self._vectors[:self._size].copy()
+                ids = list(self._ids)
+                changes = self._changes
+            os.makedirs(self.path, exist_ok=True)
+            tmp = os.path.join(self.path, "vectors.tmp.npy")
+            np.save(tmp, vectors)
+            os.replace(tmp, os.path.join(self.path, "vectors.npy"))
+            with open(os.path.join(self.path, "ids.json.tmp"), "w") as f:
+                json.dump(ids, f)
+            os.replace(os.path.join(self.path, "ids.json.tmp"), os.path.join(self.path, "ids.json"))
+            with self._lock:
+                self._changes -= changes
+
+    # Function to start a save on a background thread once enough vectors
+    # changed, so the rerun that crosses the threshold doesn't wait for it
+    def maybe_save(self):
+        with self._lock:
+            if not self.path or self._saving or self._changes < self.save_every:
+                return
+            self._saving = True
+        threading.Thread(target=self._save_in_background, name="job-vectors-save", daemon=True).start()
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def add(self, job_ids, vectors):
+        with self._lock:
+            for job_id, vector in zip(job_ids, vectors):
+                row = self._row_of.get(job_id)
+                if row is None:
+                    if self._size == len(self._vectors):
+                        grown = np.zeros((max(64, 2 * self._size), self.dim), dtype=np.float32)
+                        grown[:self._size] = self._vectors[:self._size]
+                        self._vectors = grown
+                    row = self._size
+                    self._size += 1
+                    self._ids.append(job_id)
+                    self._row_of[job_id] = row
+                self._vectors[row] = vector
+                self._changes += 1
+
+    def remove(self, job_ids):
+        with self._lock:
+            for job_id in job_ids:
+                row = self._row_of.pop(job_id, None)
+                if row is None:
+                    continue
+                # Move the last vector into the freed row
+                last = self._size - 1
+                if row != last:
+                    self._vectors[row] = self._vectors[last]
+                    self._ids[row] = self._ids[last]
+                    self._row_of[self._ids[row]] = row
+                self._ids.pop()
+                self._size -= 1
+                self._changes += 1
+
+    # Returns the vectors of job_ids (None for any not in the index)
+    def get(self, job_ids):
+        with self._lock:
+            return [self._vectors[self._row_of[job_id]].copy() if job_id in self._row_of else None
+                    for job_id in job_ids]
+
+    def stats(self):
+        with self._lock:
+            return {"vectors": self._size, "unsaved_changes": self._changes}
+
+
+# Ranks jobs against a resume by embedding similarity. Job vectors are
+# computed once per job_id, in batches, and kept in a VectorIndex; it can
+# be attached to the job store so postings are embedded as they arrive.
+class SemanticRanker:
+    def __init__(self, embedder, index, batch_size=DEFAULT_BATCH_SIZE):
+        self.embedder = embedder
+        self.index = index
+        self.batch_size = batch_size
+
+    # Job store index hooks. Jobs that already have a vector aren't embedded
+    # again, so each job_id is embedded once however often it is fetched.
+    def add(self, jobs):
+        jobs = [job for job in jobs if job.get("job_id") is not None and job.get("job_id") not in self.index]
+        for start in range(0, len(jobs), self.batch_size):
+            batch = jobs[start:start + self.batch_size]
+            self.index.add([job.get("job_id") for job in batch], self.embedder.embed([job_text(job) for job in batch]))
+
+    def remove(self, job_ids):
+        self.index.remove(job_ids)
+
+    def maybe_save(self):
+        self.index.maybe_save()
+
+    def embed_resume(self, parsed_data):
+        return _embed_text(self.embedder, resume_text(parsed_data))
+
+    # Returns an array with the cosine similarity of each job to the resume
+    def similarities(self, parsed_data, jobs):
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        resume_vector = self.embed_resume(parsed_data)
+        self.add(jobs)
+        vectors = self.index.get([job.get("job_id") for job in jobs])
+        # Jobs without a job_id can't be cached, embed them on the spot
+        unkeyed = [i for i, vector in enumerate(vectors) if vector is None]
+        if unkeyed:
+            for i, vector in zip(unkeyed, self.embedder.embed([job_text(jobs[i]) for i in unkeyed])):
+                vectors[i] = vector
+        return np.clip(np.stack(vectors) @ resume_vector, 0.0, 1.0)
+
+    # Function to score jobs against a resume, blending in each job's skill
+    # match percentage. Returns a (semantic_score, match_score) pair per job,
+    # both whole percentages so the score shown is the one sorted by.
+    @perf.timed("semantic_scoring")
+    def score_jobs(self, parsed_data, jobs, match_percentages, weight=None):
+        weight = DEFAULT_SEMANTIC_WEIGHT if weight is None else weight
+        scores = []
+        for similarity, match_percentage in zip(self.similarities(parsed_data, jobs), match_percentages):
+            semantic_score = int(round(float(similarity) * 100))
+            scores.append((semantic_score, int(round(weight * semantic_score + (1 - weight) * match_percentage))))
+        return scores
+
+
+# Resume vectors, reused across reruns
+@lru_cache(maxsize=64)
+def _embed_text(embedder, text):
+    return embedder.embed([text])[0]
+
+
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+# Function to get the process-wide semantic ranker. With a job store, job
+# vectors already stored are reused and new postings are embedded on ingest.
+def get_semantic_ranker(job_store=None):
+    global _ranker
+    with _ranker_lock:
+        if _ranker is None:
+            embedder = get_embedder()
+            vector_dir = os.getenv("JOB_VECTOR_DIR", DEFAULT_VECTOR_DIR)
+            index = VectorIndex(
+                embedder.dim,
+                path=os.path.join(vector_dir, embedder.name) if vector_dir else None,
+                save_every=int(os.getenv("JOB_VECTOR_SAVE_EVERY", DEFAULT_SAVE_EVERY)),
+            )
+            _ranker = SemanticRanker(embedder, index)
+            if job_store is not None:
+                stored = set(job_store.job_ids())
+                index.remove([job_id for job_id in index.job_ids() if job_id not in stored])
+                missing = [job_id for job_id in stored if job_id not in index]
+                for start in range(0, len(missing), 500):
+                    _ranker.add(job_store.get_jobs(missing[start:start + 500]))
+                index.maybe_save()
+                job_store.attach_index(_ranker)
+            perf.register_collector("job_vectors", _ranker.index.stats)
+        return _ranker
@@ -0,0 +1,167 @@
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from job_records import description_key
+
+# Per-matcher memo of job scores, keyed by job_id and description content
+DEFAULT_MAX_CACHED_JOBS = 20000
+
+_WHITESPACE = re.compile(r"\s+")
+
+# A skill only matches when it isn't glued to other word characters, so
+# "C" doesn't match inside "Cloud" and "Go" doesn't match inside "Google".
+# "+" and "#" count as word characters on the right so "C" doesn't match "C++".
+_LEFT_BOUNDARY = r"(?<![0-9A-Za-z_])"
+_RIGHT_BOUNDARY = r"(?![0-9A-Za-z_+#])"
+_RIGHT_BOUNDARY_CHARS = re.compile(r"[0-9A-Za-z_+#]")
+
+
+# Function to normalize a skill or matched text to its lookup form.
+# casefold() rather than lower() so text that only matches under
+# re.IGNORECASE ("anſible") normalizes to the same key as the skill.
+def normalize_skill(skill):
+    return _WHITESPACE.sub(" ", str(skill)).strip().casefold()
+
+
+def _escape(ch):
+    return r"\s+" if ch == " " else re.escape(ch)
+
+
+# Function to turn a character trie into a regex whose alternatives share
+# prefixes, so the regex engine walks it like an automaton instead of
+# trying every skill separately at every position
+def _trie_pattern(node):
+    alternatives = [_escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and "" not in node:
+        return alternatives[0]
+    pattern = "(?:" + "|".join(alternatives) + ")"
+    return pattern + "?" if "" in node else pattern
+
+
+# Skill matcher compiled once per resume. Every skill is folded into one
+# prefix-sharing regex, so each description is scanned in a single pass
+# however many skills the resume has. Skills nested in or overlapping a
+# longer match (e.g. "Learning" inside "Machine Learning") are found too.
+class SkillMatcher:
+    def __init__(self, skills, max_cached_jobs=DEFAULT_MAX_CACHED_JOBS):
+        self.skills = []
+        self._originals = {}
+        for skill in skills:
+            normalized = normalize_skill(skill)
+            if not normalized:
+                continue
+            if skill not in self.skills:
+                self.skills.append(skill)
+                self._originals.setdefault(normalized, []).append(skill)
+
+        # A match only reports the longest skill starting at a position, so
+        # remember which shorter skills end on a word boundary inside it
+        self._prefixes = {}
+        for normalized in self._originals:
+            self._prefixes[normalized] = [
+                other for other in self._originals
+                if other != normalized and normalized.startswith(other)
+                and not _RIGHT_BOUNDARY_CHARS.match(normalized[len(other)])
+            ]
+
+        trie = {}
+        for normalized in self._originals:
+            node = trie
+            for ch in normalized:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._regex = self._regex_ignorecase = None
+        if self._originals:
+            pattern = _LEFT_BOUNDARY + "(" + _trie_pattern(trie) + ")" + _RIGHT_BOUNDARY
+            # Matching against casefolded text is about twice as fast as re.IGNORECASE;
+            # the latter is only needed when casefolding changes the text length
+            self._regex = re.compile(pattern)
+            self._regex_ignorecase = re.compile(pattern, re.IGNORECASE)
+
+        self.max_cached_jobs = max_cached_jobs
+        self._job_scores = OrderedDict()
+        self._job_scores_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.skills)
+
+    # Returns (skill, start, end) for every occurrence, ordered by start position
+    def find(self, text):
+        if not text or self._regex is None:
+            return []
+        lowered = text.casefold()
+        if len(lowered) == len(text):
+            regex, text = self._regex, lowered
+        else:
+            regex = self._regex_ignorecase
+        found = []
+        pos = 0
+        while True:
+            m = regex.search(text, pos)
+            if m is None:
+                break
+            start, end = m.span()
+            normalized = normalize_skill(m.group(1))
+            # re.IGNORECASE can still match text that folds to no skill
+            # (a dotless "ı" matches "i" but casefolds to itself), skip those
+            for skill in self._originals.get(normalized, ()):
+                found.append((skill, start, end))
+            for prefix in self._prefixes.get(normalized, ()):
+                for skill in self._originals[prefix]:
+                    found.append((skill, start, start + len(prefix)))
+            # Resume right after the match start so skills that begin inside
+            # this match are still found
+            pos = start + 1
+        return found
+
+    # Returns the distinct skills found in text, in order of first occurrence
+    def match(self, text):
+        matched = {}
+        for skill, _, _ in self.find(text):
+            matched.setdefault(skill, None)
+        return list(matched)
+
+    # Returns (match_percentage, matched_skills) for a job description
+    def score(self, text):
+        matched = self.match(text)
+        return int((len(matched) / max(1, len(self.skills))) * 100), matched
+
+    # Same as score(), memoized per job_id so reruns don't rescan descriptions.
+    # The memo is also keyed by the description's content so a posting whose
+    # description changed is scored again.
+    def score_job(self, job):
+        job_id = job.get('job_id')
+        if job_id is None:
+            return self.score(job.get('job_description') or "")
+        # Job records carry their description's key; raw postings are hashed
+        text = None
+        content_key = getattr(job, "description_key", None)
+        if content_key is None:
+            text = job.get('job_description') or ""
+            content_key = description_key(text)
+        memo_key = (job_id, content_key)
+        with self._job_scores_lock:
+            result = self._job_scores.get(memo_key)
+            if result is not None:
+                self._job_scores.move_to_end(memo_key)
+                return result
+        result = self.score(text if text is not None else job.get('job_description') or "")
+        with self._job_scores_lock:
+            self._job_scores[memo_key] = result
+            while len(self._job_scores) > self.max_cached_jobs:
+                self._job_scores.popitem(last=False)
+        return result
+
+
+# Function to get a compiled matcher, reused across reruns and sessions
+@lru_cache(maxsize=256)
+def _compiled_matcher(skills):
+    return SkillMatcher(skills)
+
+
+def get_skill_matcher(skills):
+    return _compiled_matcher(tuple(sorted(str(skill) for skill in skills)))
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from gemini_client import (FakeGeminiModel, GeminiBusyError, GeminiClientManager, get_gemini_client,
+                           set_gemini_backend)
+from resume_parser import parse_resume_with_gemini
+
+
+def make_client(model, **options):
+    client = GeminiClientManager(backend_factory=lambda: None, **options)
+    client.set_backend(model)
+    return client
+
+
+# Swap a fake backend into the process-wide client, restoring it afterwards
+@pytest.fixture
+def shared_backend():
+    client = get_gemini_client()
+    previous = client._backend
+    yield set_gemini_backend
+    client.set_backend(previous)
+
+
+def test_in_flight_requests_are_capped():
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def responder(contents):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        threading.Event().wait(0.02)
+        with lock:
+            running["now"] -= 1
+        return {"ok": contents}
+
+    model = FakeGeminiModel(responder)
+    client = make_client(model, max_in_flight=2, queue_timeout=5.0)
+    threads = [threading.Thread(target=client.generate_content, args=(f"prompt {i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert running["peak"] == 2
+    assert len(model.calls) == 8
+    stats = client.stats()
+    assert (stats["calls"], stats["in_flight"], stats["queued"]) == (8, 0, 0)
+
+
+def test_queue_timeout_rejects_with_busy_error():
+    release = threading.Event()
+    model = FakeGeminiModel(lambda contents: release.wait(5.0) and {})
+    client = make_client(model, max_in_flight=1, queue_timeout=0.05)
+    holder = threading.Thread(target=client.generate_content, args=("slow",))
+    holder.start()
+    while client.stats()["in_flight"] == 0:
+        threading.Event().wait(0.001)
+
+    with pytest.raises(GeminiBusyError):
+        client.generate_content("rejected")
+    release.set()
+    holder.join()
+    stats = client.stats()
+    assert (stats["calls"], stats["rejected"]) == (1, 1)
+
+
+def test_backend_errors_propagate_and_free_the_slot():
+    def responder(contents):
+        if contents == "bad":
+            raise ValueError("quota exceeded")
+        return "plain text"
+
+    client = make_client(FakeGeminiModel(responder), max_in_flight=1, queue_timeout=0.05)
+    with pytest.raises(ValueError, match="quota exceeded"):
+        client.generate_content("bad")
+    assert client.generate_content("good").text == "plain text"
+    stats = client.stats()
+    assert (stats["calls"], stats["errors"], stats["in_flight"]) == (2, 1, 0)
+
+
+def test_resume_parse_uses_the_shared_backend(shared_backend):
+    model = FakeGeminiModel(lambda contents: {"name": "Ada Lovelace"})
+    shared_backend(model)
+    assert parse_resume_with_gemini("Ada Lovelace", mode="prompt")["name"] == "Ada Lovelace"
+    assert "Ada Lovelace" in model.calls[0]["contents"]
+
+
+def test_resume_parse_reports_backend_errors(shared_backend):
+    def responder(contents):
+        raise RuntimeError("backend down")
+
+    shared_backend(FakeGeminiModel(responder))
+    errors = []
+    assert parse_resume_with_gemini("Ada Lovelace", on_error=errors.append, mode="prompt") is None
+    assert errors == ["Error parsing resume: backend down"]
@@ -0,0 +1,59 @@
+from job_filters import FilterState, IncrementalFilter, JobColumns
+
+NOW = 1_700_000_000
+DAY = 24 * 60 * 60
+
+
+def make_jobs():
+    jobs = []
+    for i in range(40):
+        jobs.append({
+            "job_id": f"job-{i}",
+            "job_is_remote": i % 2 == 0,
+            "job_employment_type": ["FULLTIME", "CONTRACTOR", "PARTTIME"][i % 3],
+            "employer_company_type": ["Tech", "Finance", None][i % 3],
+            "job_posted_at_timestamp": NOW - (i % 10) * DAY,
+            "job_min_salary": None if i % 5 == 0 else 40000 + 2000 * i,
+            "job_max_salary": None if i % 5 == 0 else 60000 + 3000 * i,
+        })
+    return jobs
+
+
+def filters(**changes):
+    base = FilterState(remote_only=False, employment_types=(), date_posted_days=0,
+                       min_salary=0, max_salary=1000000, company_types=())
+    return base._replace(**changes)
+
+
+def test_changing_one_filter_recomputes_only_its_mask():
+    columns = JobColumns(make_jobs())
+    incremental = IncrementalFilter(columns)
+    first = filters(remote_only=True, employment_types=("FULLTIME", "CONTRACTOR"), date_posted_days=7)
+    assert incremental.apply(first, now=NOW) == columns.apply(first, now=NOW)
+    assert incremental.stats == {"recomputed": 5, "reused": 0}
+
+    second = first._replace(min_salary=70000)
+    assert incremental.apply(second, now=NOW) == JobColumns(columns.jobs).apply(second, now=NOW)
+    assert incremental.stats == {"recomputed": 6, "reused": 4}
+
+
+def test_unchanged_filters_reuse_the_selection():
+    columns = JobColumns(make_jobs())
+    incremental = IncrementalFilter(columns)
+    state = filters(company_types=("Tech",))
+    selected = incremental.apply(state, now=NOW)
+    assert incremental.apply(state, now=NOW) == selected
+    assert incremental.stats == {"recomputed": 5, "reused": 5}
+
+
+def test_every_filter_matches_a_plain_loop():
+    jobs = make_jobs()
+    state = filters(remote_only=True, date_posted_days=5, min_salary=50000, max_salary=150000)
+    expected = [
+        job for job in jobs
+        if job["job_is_remote"]
+        and (NOW - job["job_posted_at_timestamp"]) / DAY <= 5
+        and not (job["job_min_salary"] is not None and job["job_min_salary"] < 50000)
+        and not (job["job_max_salary"] is not None and job["job_max_salary"] > 150000)
+    ]
+    assert IncrementalFilter(JobColumns(jobs)).apply(state, now=NOW) == expected
@@ -0,0 +1,63 @@
+import os
+import threading
+
+from job_index import JobIndex
+
+
+def make_job(number, title="python developer"):
+    return {"job_id": f"job-{number}", "job_title": f"{title} {number}", "employer_name": "Acme",
+            "job_description": "build services " * (number % 5), "job_city": "Austin"}
+
+
+def ranked_ids(index, query):
+    return [job_id for job_id, _ in index.search(query, "austin", limit=50)]
+
+
+def test_changes_made_while_a_segment_is_written_are_kept(tmp_path):
+    index = JobIndex(str(tmp_path))
+    index.add([make_job(number) for number in range(40)])
+    index.save()
+
+    write_segment = index._write_segment
+
+    # Add and remove postings between the snapshot and the switch
+    def write_segment_with_changes(*args):
+        segment = write_segment(*args)
+        index.remove(["job-3", "job-42"])
+        index.add([make_job(3, "rust engineer"), make_job(50)])
+        return segment
+
+    index.add([make_job(number) for number in range(40, 45)])
+    index._write_segment = write_segment_with_changes
+    index.save()
+
+    expected = JobIndex()
+    expected.add([make_job(number) for number in range(45) if number not in (3, 42)])
+    expected.add([make_job(3, "rust engineer"), make_job(50)])
+    assert sorted(index.job_ids()) == sorted(expected.job_ids())
+    for query in ("python developer", "rust", "developer 42"):
+        assert ranked_ids(index, query) == ranked_ids(expected, query)
+    assert index.stats()["unsaved_changes"] == 4
+
+
+def test_replaced_segments_are_deleted_on_load(tmp_path):
+    index = JobIndex(str(tmp_path))
+    index.add([make_job(number) for number in range(10)])
+    index.save()
+    stale = tmp_path / "segment-0"
+    stale.mkdir()
+    index.add([make_job(10)])
+    index.save()
+    segments = [name for name in os.listdir(tmp_path) if name.startswith("segment-")]
+    assert len(segments) == 1
+    assert sorted(JobIndex(str(tmp_path)).job_ids()) == sorted(index.job_ids())
+
+
+def test_maybe_save_runs_in_the_background(tmp_path):
+    index = JobIndex(str(tmp_path), save_every=5)
+    index.add([make_job(number) for number in range(5)])
+    index.maybe_save()
+    for thread in [thread for thread in threading.enumerate() if thread.name == "job-index-save"]:
+        thread.join()
+    assert index.stats()["unsaved_changes"] == 0
+    assert len(JobIndex(str(tmp_path))) == 5
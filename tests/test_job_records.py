@@ -0,0 +1,78 @@
+import gc
+
+from job_records import DescriptionStore, JobRecord, PostingStore, get_description_store, record_bytes
+from job_store import JobStore
+
+
+def make_posting(number):
+    return {"job_id": f"job-{number}", "job_title": f"Developer {number}", "employer_name": "Acme",
+            "job_description": f"Build services {number}. " * 20}
+
+
+def test_record_evicted_while_a_session_holds_it_stays_shared():
+    size = record_bytes(JobRecord(make_posting(0)))
+    store = PostingStore(max_bytes=2 * size)
+    held = store.get_record(make_posting(0))
+    for number in range(1, 5):
+        store.get_record(make_posting(number))
+    gc.collect()
+
+    stats = store.stats()
+    assert stats["evictions"] == 3 and stats["recent"] == 2
+    # Out of the LRU, but the session's copy is still the one handed out
+    assert store.get_record(make_posting(0)) is held
+    assert store.stats()["created"] == 5
+
+    del held
+    store.get_record(make_posting(5))
+    store.get_record(make_posting(6))
+    gc.collect()
+    assert store.stats()["live"] == 2
+    assert store.stats()["bytes"] == store.stats()["recent_bytes"]
+
+
+def test_unheld_records_are_evicted_over_the_cap():
+    store = PostingStore(max_bytes=3 * record_bytes(JobRecord(make_posting(100))))
+    held = [store.get_record(make_posting(number)) for number in range(6)]
+    del held[2:]
+    gc.collect()
+    for number in range(100, 110):
+        store.get_record(make_posting(number))
+    gc.collect()
+    assert store.stats()["live"] == 5
+    assert store.get_record(make_posting(0)) is held[0]
+    assert store.get_record(make_posting(1)) is held[1]
+
+
+def test_evicted_descriptions_are_reloaded_from_the_job_store():
+    job_store = JobStore(":memory:")
+    postings = [make_posting(number) for number in range(3)]
+    job_store.ingest(postings)
+    descriptions = DescriptionStore(max_bytes=1, job_store=job_store)
+    keys = [descriptions.put(posting["job_description"]) for posting in postings]
+    assert descriptions.stats()["descriptions"] == 1
+    assert descriptions.get(keys[0], "job-0") == postings[0]["job_description"]
+    assert descriptions.stats()["reloaded"] == 1
+
+
+def test_job_store_attached_after_the_first_record_reloads_descriptions():
+    descriptions = DescriptionStore(max_bytes=1)
+    postings = [make_posting(number) for number in range(2)]
+    keys = [descriptions.put(posting["job_description"]) for posting in postings]
+    assert descriptions.get(keys[0], "job-0") is None
+
+    job_store = JobStore(":memory:")
+    job_store.ingest(postings)
+    descriptions.attach_job_store(job_store)
+    assert descriptions.get(keys[0], "job-0") == postings[0]["job_description"]
+
+
+def test_the_shared_description_store_attaches_a_later_job_store():
+    descriptions = get_description_store()
+    previous = descriptions.job_store
+    job_store = JobStore(":memory:")
+    try:
+        assert get_description_store(job_store) is descriptions
+        assert descriptions.job_store is job_store
+    finally:
+        descriptions.attach_job_store(previous)
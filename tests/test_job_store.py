@@ -0,0 +1,22 @@
+from job_store import JobStore, dedupe_key
+
+
+def test_sparse_postings_have_no_dedupe_key():
+    assert dedupe_key({"job_title": "", "employer_name": "", "job_city": ""}) is None
+    assert dedupe_key({"job_title": "Developer"}) is None
+    assert dedupe_key({"job_title": "Developer", "employer_name": "Acme", "job_city": "Austin"}) == "developer|acme|austin"
+
+
+def test_sparse_postings_are_not_merged():
+    store = JobStore(":memory:")
+    job_ids = store.ingest([{"job_id": "a"}, {"job_id": "b", "job_title": ""}, {"job_description": "one"},
+                            {"job_description": "two"}])
+    assert len(set(job_ids)) == 4
+    assert job_ids[:2] == ["a", "b"]
+
+
+def test_same_posting_under_another_job_id_is_merged():
+    store = JobStore(":memory:")
+    job_ids = store.ingest([{"job_id": "a", "job_title": "Developer", "employer_name": "Acme"},
+                            {"job_id": "b", "job_title": "developer", "employer_name": "ACME"}])
+    assert job_ids == ["a", "a"]
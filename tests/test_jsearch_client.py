@@ -0,0 +1,111 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jsearch_client import ConnectionPool, JSearchClient, JSearchError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.append(self.connection)
+        status = server.status
+        body = json.dumps({"status": "OK", "data": [{"job_id": "job-1"}]}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Stub JSearch server on a free local port, keeping connections alive
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = 0
+    httpd.connections = []
+    httpd.status = 200
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **pool_options):
+    pool = ConnectionPool(**pool_options)
+    return JSearchClient(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}", pool=pool), pool
+
+
+def test_keep_alive_connection_is_reused(server):
+    client, pool = make_client(server)
+    assert client.search("python developer")["data"] == [{"job_id": "job-1"}]
+    client.search("python developer", page=2)
+    stats = pool.stats()
+    assert (stats["created"], stats["reused"], stats["idle"]) == (1, 1, 1)
+
+
+def test_stale_reused_connection_is_retried_once(server):
+    client, pool = make_client(server)
+    client.search("python developer")
+    # The server drops the idle kept-alive connection
+    with server.lock:
+        server.connections[0].shutdown(socket.SHUT_RDWR)
+    time.sleep(0.05)
+
+    assert client.search("python developer")["data"] == [{"job_id": "job-1"}]
+    stats = pool.stats()
+    assert (stats["created"], stats["reused"]) == (2, 1)
+    assert server.requests == 2
+
+
+def test_error_status_raises_and_frees_the_slot(server):
+    client, pool = make_client(server, max_per_host=1)
+    server.status = 500
+    with pytest.raises(JSearchError, match="HTTP 500"):
+        client.search("python developer")
+    server.status = 200
+    # The only slot for the host was released despite the error
+    assert client.search("python developer")["data"] == [{"job_id": "job-1"}]
+
+
+def test_in_flight_connections_are_capped_per_host(server):
+    pool = ConnectionPool(max_per_host=2, connect_timeout=0.5, read_timeout=0.5)
+    address = ("http", "127.0.0.1", server.server_port)
+    held = [pool.acquire(*address)[0] for _ in range(2)]
+
+    acquired = threading.Event()
+
+    def acquire_third():
+        conn, _ = pool.acquire(*address)
+        acquired.set()
+        pool.release(conn, *address)
+
+    waiter = threading.Thread(target=acquire_third)
+    waiter.start()
+    assert not acquired.wait(0.2)
+    pool.release(held.pop(), *address)
+    assert acquired.wait(1.0)
+    waiter.join()
+    pool.release(held.pop(), *address)
+
+
+def test_acquire_times_out_when_the_host_is_at_its_limit(server):
+    pool = ConnectionPool(max_per_host=1, connect_timeout=0.05, read_timeout=0.05)
+    address = ("http", "127.0.0.1", server.server_port)
+    conn, _ = pool.acquire(*address)
+    with pytest.raises(JSearchError, match="Timed out"):
+        pool.acquire(*address)
+    pool.release(conn, *address)
@@ -0,0 +1,45 @@
+import json
+import os
+import time
+
+from resume_cache import ResumeParseCache, resume_cache_key
+
+SCHEMA = {"name": "string"}
+
+
+def test_key_depends_on_the_parser():
+    assert resume_cache_key(b"%PDF", SCHEMA, "gemini-structured") != resume_cache_key(b"%PDF", SCHEMA, "gemini-prompt")
+    assert resume_cache_key(b"%PDF", SCHEMA, "gemini-structured") == resume_cache_key(b"%PDF", SCHEMA, "gemini-structured")
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    ResumeParseCache(cache_dir=str(tmp_path)).put("a", {"parsed_data": {"name": "Ada"}})
+    cache = ResumeParseCache(cache_dir=str(tmp_path))
+    assert cache.get("a") == {"parsed_data": {"name": "Ada"}}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_expired_disk_entries_are_dropped(tmp_path):
+    ResumeParseCache(cache_dir=str(tmp_path)).put("a", {"parsed_data": {}})
+    path = tmp_path / "a.json"
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    cache = ResumeParseCache(cache_dir=str(tmp_path), ttl_seconds=60)
+    assert cache.get("a") is None
+    assert not path.exists()
+    assert cache.stats()["misses"] == 1
+
+
+def test_oldest_disk_entries_are_evicted_over_the_size_limit(tmp_path):
+    value = {"parsed_data": {"summary": "x" * 100}}
+    size = len(json.dumps(value))
+    cache = ResumeParseCache(cache_dir=str(tmp_path), max_disk_bytes=2 * size)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, value)
+        stamp = time.time() - 100 + i
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+
+    cache.put("d", value)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["c.json", "d.json"]
+    assert cache.stats()["evictions"] == 2
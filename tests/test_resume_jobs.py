@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+import resume_jobs
+from gemini_client import FakeGeminiModel, get_gemini_client, set_gemini_backend
+from pdf_extract import ExtractedPDF
+from resume_cache import ResumeParseCache
+from resume_jobs import DONE, FAILED, ResumeJobManager
+
+RESUME = "Ada Lovelace\nSkills: Python, SQL"
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    client = get_gemini_client()
+    previous = client._backend
+    monkeypatch.setattr(resume_jobs, "extract_pdf_pages", lambda pdf_bytes: ExtractedPDF([RESUME], 1))
+    monkeypatch.setattr(resume_jobs, "LOCAL_PARSE_MODE", "off")
+    yield ResumeJobManager(workers=1, cache=ResumeParseCache())
+    client.set_backend(previous)
+
+
+def wait(job):
+    while not job.finished:
+        time.sleep(0.001)
+    return job
+
+
+def test_failed_parse_fails_the_job_and_is_not_cached(manager):
+    def responder(contents):
+        raise RuntimeError("backend down")
+
+    set_gemini_backend(FakeGeminiModel(responder))
+    job = wait(manager.submit(b"%PDF-failed"))
+    assert job.status == FAILED and job.parsed_data is None
+    assert manager.cache.get(job.key) is None
+
+
+def test_parsed_resume_is_cached(manager):
+    set_gemini_backend(FakeGeminiModel(lambda contents: {"basic_info": {"name": "Ada Lovelace"}, "skills": ["Python", "SQL"]}))
+    job = wait(manager.submit(b"%PDF-parsed"))
+    assert job.status == DONE and job.parser == "gemini"
+    assert job.parsed_data["basic_info"]["name"] == "Ada Lovelace"
+    assert manager.cache.get(job.key) == {"parsed_data": job.parsed_data}
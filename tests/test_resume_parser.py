@@ -0,0 +1,77 @@
+import pytest
+
+from gemini_client import FakeGeminiModel, get_gemini_client, set_gemini_backend
+from resume_parser import RESUME_SCHEMA, parse_resume_structured, validate_resume
+
+
+@pytest.fixture
+def shared_backend():
+    client = get_gemini_client()
+    previous = client._backend
+    yield set_gemini_backend
+    client.set_backend(previous)
+
+
+def requested_fields(call):
+    return list(call["config"]["response_schema"]["properties"])
+
+
+def test_values_are_coerced_to_the_schema():
+    data = {
+        "basic_info": {"name": " Ada Lovelace ", "phone": 5551234},
+        "skills": "Python, SQL; Docker",
+        "experience": {"job_title": "Engineer", "company": "Analytical Engines"},
+        "years_of_experience": "5+ years",
+        "certifications": None,
+    }
+    fixed, failed = validate_resume(data, list(data))
+    assert failed == []
+    assert fixed["basic_info"] == {"name": "Ada Lovelace", "email": "", "phone": "5551234", "location": ""}
+    assert fixed["skills"] == ["Python", "SQL", "Docker"]
+    assert fixed["experience"] == [{"job_title": "Engineer", "company": "Analytical Engines",
+                                    "duration": "", "description": ""}]
+    assert fixed["years_of_experience"] == 5
+    assert fixed["certifications"] == []
+
+
+def test_invalid_and_missing_fields_are_reported():
+    fixed, failed = validate_resume({"skills": {"bad": object()}, "years_of_experience": "many"},
+                                    ["skills", "years_of_experience", "soft_skills"])
+    assert fixed == {}
+    assert failed == ["skills", "years_of_experience", "soft_skills"]
+
+
+def test_only_failed_fields_are_requested_again(shared_backend):
+    replies = iter([
+        {key: [] for key in RESUME_SCHEMA["schema"]} | {
+            "basic_info": {"name": "Ada Lovelace"},
+            "professional_summary": "Mathematician",
+            "years_of_experience": "lots",
+            "education": "not a list of objects",
+        },
+        {"years_of_experience": 12, "education": [{"degree": "BSc"}]},
+    ])
+    model = FakeGeminiModel(lambda contents: next(replies))
+    shared_backend(model)
+    errors = []
+
+    parsed = parse_resume_structured("Ada Lovelace", on_error=errors.append)
+    assert len(model.calls) == 2
+    assert requested_fields(model.calls[0]) == list(RESUME_SCHEMA["schema"])
+    assert requested_fields(model.calls[1]) == ["education", "years_of_experience"]
+    assert parsed["years_of_experience"] == 12
+    assert parsed["education"] == [{"degree": "BSc", "institution": "", "year": ""}]
+    assert parsed["basic_info"]["name"] == "Ada Lovelace"
+    assert errors == []
+
+
+def test_fields_still_invalid_after_retries_are_left_empty(shared_backend):
+    model = FakeGeminiModel(lambda contents: {"professional_summary": "Mathematician", "years_of_experience": "lots"})
+    shared_backend(model)
+    errors = []
+
+    parsed = parse_resume_structured("Ada Lovelace", on_error=errors.append, max_retries=1)
+    assert len(model.calls) == 2
+    assert parsed["professional_summary"] == "Mathematician"
+    assert parsed["years_of_experience"] is None and parsed["skills"] == []
+    assert len(errors) == 1 and "years_of_experience" in errors[0]
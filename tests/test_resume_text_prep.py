@@ -0,0 +1,50 @@
+from resume_text_prep import CHARS_PER_TOKEN, DROP_ORDER, estimate_tokens, prepare_resume_text, truncate_to_budget
+
+
+def section(header, words, lines=10):
+    return [header] + [f"{header} line {i}: " + " ".join([words] * 8) for i in range(lines)]
+
+
+def make_resume(sections):
+    lines = ["Ada Lovelace", "ada@example.com"]
+    for header in sections:
+        lines.extend(section(header, header.lower()))
+    return "\n".join(lines)
+
+
+KEPT = ["Summary", "Experience", "Education", "Skills"]
+DROPPABLE = ["Projects", "Languages", "Awards", "Volunteering", "Publications", "Interests", "References"]
+
+
+def test_text_within_budget_is_unchanged():
+    text = make_resume(KEPT)
+    assert truncate_to_budget(text, estimate_tokens(text)) == (text, [])
+
+
+def test_sections_are_dropped_in_drop_order():
+    kept_text = make_resume(KEPT + ["Projects", "Languages"])
+    text = make_resume(KEPT + DROPPABLE)
+    truncated, dropped = truncate_to_budget(text, estimate_tokens(kept_text))
+
+    assert dropped == DROP_ORDER[:5]
+    assert truncated == kept_text
+    for header in KEPT + ["Projects", "Languages"]:
+        assert f"\n{header}\n" in truncated
+
+
+def test_kept_sections_are_shortened_to_fit_the_budget():
+    text = make_resume(KEPT + DROPPABLE)
+    budget = estimate_tokens(make_resume(KEPT)) // 2
+    truncated, dropped = truncate_to_budget(text, budget)
+
+    assert dropped == DROP_ORDER
+    assert len(truncated) <= budget * CHARS_PER_TOKEN
+    assert truncated.startswith("Ada Lovelace\n")
+    for header in KEPT:
+        assert f"\n{header}\n{header} line 0" in truncated
+
+
+def test_prepared_text_reports_tokens_and_dropped_sections():
+    prepared = prepare_resume_text([make_resume(KEPT + ["References"])], token_budget=estimate_tokens(make_resume(KEPT)))
+    assert prepared.dropped_sections == ["references"]
+    assert prepared.tokens_after <= prepared.tokens_before
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from search_cache import SearchResultCache, normalize_search
+
+
+def test_equivalent_searches_normalize_to_the_same_key():
+    assert normalize_search("  Python   Developer ", "NYC") == normalize_search("python developer", "new york")
+
+
+def test_concurrent_misses_make_one_upstream_call():
+    cache = SearchResultCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5.0)
+        return {"data": [1, 2, 3]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("key", fetch))) for _ in range(8)]
+    threads[0].start()
+    started.wait(5.0)
+    for thread in threads[1:]:
+        thread.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"data": [1, 2, 3]}] * 8
+    stats = cache.stats()
+    assert (stats["upstream_calls"], stats["coalesced"], stats["saved_calls"]) == (1, 7, 7)
+
+    assert cache.get_or_fetch("key", fetch) == {"data": [1, 2, 3]}
+    assert len(calls) == 1
+    assert cache.stats()["saved_calls"] == 8
+
+
+def test_waiters_see_the_leader_error_and_nothing_is_cached():
+    cache = SearchResultCache()
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("key", fail)
+    assert cache.get("key") is None
+    assert cache.get_or_fetch("key", lambda: {"data": []}) == {"data": []}
+    assert cache.stats()["upstream_errors"] == 1
+
+
+def test_entries_expire_after_the_ttl():
+    cache = SearchResultCache(ttl_seconds=0.05)
+    cache.get_or_fetch("key", lambda: {"data": [1]})
+    assert cache.get("key") == {"data": [1]}
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    value = {"data": "x" * 100}
+    cache = SearchResultCache(max_bytes=250)
+    cache.get_or_fetch("a", lambda: value)
+    cache.get_or_fetch("b", lambda: value)
+    cache.get("a")
+    cache.get_or_fetch("c", lambda: value)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value and cache.get("c") == value
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= 250
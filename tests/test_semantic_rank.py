@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+
+from semantic_rank import HashingEmbedder, SemanticRanker, VectorIndex
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dim=64)
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+def make_job(number):
+    return {"job_id": f"job-{number}", "job_title": f"python developer {number}", "job_description": "build services"}
+
+
+def test_jobs_are_embedded_once_per_job_id():
+    embedder = CountingEmbedder()
+    ranker = SemanticRanker(embedder, VectorIndex(embedder.dim))
+    ranker.add([make_job(number) for number in range(10)])
+    ranker.add([make_job(number) for number in range(5, 15)])
+    assert embedder.embedded == 15
+
+    ranker.similarities({"technical_skills": ["Python"]}, [make_job(number) for number in range(15)])
+    assert embedder.embedded == 16
+
+
+def test_vectors_are_saved_in_the_background(tmp_path):
+    embedder = CountingEmbedder()
+    index = VectorIndex(embedder.dim, path=str(tmp_path), save_every=10)
+    index.add([f"job-{number}" for number in range(12)], embedder.embed([f"job {number}" for number in range(12)]))
+    index.maybe_save()
+    deadline = time.time() + 5
+    while index.stats()["unsaved_changes"] and time.time() < deadline:
+        time.sleep(0.01)
+
+    reloaded = VectorIndex(embedder.dim, path=str(tmp_path))
+    assert reloaded.job_ids() == index.job_ids()
+    assert np.array_equal(np.stack(reloaded.get(["job-0", "job-11"])), np.stack(index.get(["job-0", "job-11"])))
+
+
+def test_changes_made_during_a_save_count_towards_the_next_one(tmp_path, monkeypatch):
+    embedder = CountingEmbedder()
+    index = VectorIndex(embedder.dim, path=str(tmp_path))
+    index.add(["job-0", "job-1"], embedder.embed(["a", "b"]))
+    dump = np.save
+
+    # Add a vector after the snapshot, while the files are being written
+    def save_and_add(*args, **kwargs):
+        index.add(["job-2"], embedder.embed(["c"]))
+        return dump(*args, **kwargs)
+
+    monkeypatch.setattr(np, "save", save_and_add)
+    index.save()
+    monkeypatch.undo()
+    assert index.stats() == {"vectors": 3, "unsaved_changes": 1}
+    assert VectorIndex(embedder.dim, path=str(tmp_path)).job_ids() == ["job-0", "job-1"]
@@ -0,0 +1,26 @@
+from skill_matcher import SkillMatcher
+
+
+def test_matches_on_word_boundaries():
+    matcher = SkillMatcher(["C", "Go", "C++"])
+    assert matcher.match("Cloud, Google and C++") == ["C++"]
+
+
+def test_text_matching_only_under_ignorecase_is_found():
+    # "İ" lowercases to two characters, so the re.IGNORECASE path runs and
+    # "anſible" matches "ansible" even though it doesn't lowercase to it
+    matcher = SkillMatcher(["Kubernetes", "Ansible"])
+    assert matcher.find("İ Kubernetes and anſible") == [("Kubernetes", 2, 12), ("Ansible", 17, 24)]
+
+
+def test_match_folding_to_no_skill_is_skipped():
+    matcher = SkillMatcher(["Linux", "Docker"])
+    assert matcher.match("İ lınux and Docker") == ["Docker"]
+
+
+def test_job_score_is_recomputed_when_the_description_changes():
+    matcher = SkillMatcher(["Python", "Docker"])
+    job = {"job_id": "job-1", "job_description": "Python only"}
+    assert matcher.score_job(job) == (50, ["Python"])
+    assert matcher.score_job(dict(job)) == (50, ["Python"])
+    assert matcher.score_job(dict(job, job_description="Python and Docker")) == (100, ["Python", "Docker"])